@@ -1,8 +1,11 @@
 from google.adk.agents import LlmAgent
 
+from ..callbacks import cache_after_model, cache_before_model
+from ..models import get_agent_model
+
 generator_agent = LlmAgent(
     name="Release_Notes_Generation_Agent",
-model="gemini-2.5-flash-preview-05-20",
+model=get_agent_model(),
     description="AI-powered content generation specialist that creates comprehensive, well-formatted release notes from code diffs and Jira tickets.",
     instruction="""You are an expert technical writer specializing in release note generation. Your primary responsibilities are:
 
@@ -24,4 +27,6 @@ Your output should be professional, accurate, and accessible to both technical a
 - Brief descriptions of user impact
 - Proper Markdown formatting""",
     tools=[],  # This agent generates content directly without external tools
+    before_model_callback=cache_before_model,
+    after_model_callback=cache_after_model,
 )
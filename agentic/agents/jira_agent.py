@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from agentic.tools import get_jira_tickets
+from ..models import get_agent_model
 
 jira_agent = LlmAgent(
     name="Jira_Integration_Agent",
-    model="gemini-2.5-flash-preview-05-20",
+    model=get_agent_model(),
     description="Specialized agent for Jira integration and ticket management. Retrieves project tickets, analyzes issue details, and correlates tickets with code changes.",
     instruction="""You are a Jira integration specialist. Your primary responsibilities are:
 
@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from agentic.tools import save_release_notes_to_file
+from ..models import get_agent_model
 
 output_agent = LlmAgent(
     name="File_Output_Management_Agent",
-model="gemini-2.5-flash-preview-05-20",
+model=get_agent_model(),
     description="File system specialist responsible for saving release notes to appropriate locations with proper naming and organization.",
     instruction="""You are a file management specialist. Your primary responsibilities are:
 
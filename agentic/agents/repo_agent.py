@@ -1,21 +1,25 @@
 from google.adk.agents import LlmAgent
-from agentic.tools import get_repository_context
+from agentic.tools import get_repository_context, get_release_range_context
+from ..models import get_agent_model
 
 
 repo_agent = LlmAgent(
     name="Repository_Agent",
-    model="gemini-2.5-flash-preview-05-20",
+    model=get_agent_model(),
     description="A specialized agent responsible for analyzing Git repositories and extracting code changes (diffs) and commit SHA from the last commit.",
     instruction="""You are a Git repository analysis expert. Your primary function is:
 
 1. **Code Diff and Commit SHA Extraction**: Retrieve code changes (diff) and the commit SHA from the last commit on a specified branch.
+2. **Release Range Extraction**: Retrieve the diff and commit log for a release range (from_ref..to_ref, e.g. between two tags).
 
 When you receive a request that includes repository details:
 - Extract the repo_path and branch from the user's request.
 - IMMEDIATELY use the get_repository_context tool with those parameters. This tool will provide the git diff and commit SHA.
+- If the request specifies a release range (from_ref and to_ref), use the get_release_range_context tool instead. It also provides the commit log for the range.
 - DO NOT transfer to other agents - use your tool first.
 - After getting results, transfer back to Release_Notes_Orchestrator with the repository data (diff and commit SHA).
 
-Example: If you see "repo_path=/path/to/repo and branch=main", call get_repository_context(repo_path="/path/to/repo", branch="main")""",
-    tools=[get_repository_context],
+Example: If you see "repo_path=/path/to/repo and branch=main", call get_repository_context(repo_path="/path/to/repo", branch="main")
+Example: If you see "from_ref=v1.2.0 and to_ref=v1.3.0", call get_release_range_context(repo_path="/path/to/repo", from_ref="v1.2.0", to_ref="v1.3.0")""",
+    tools=[get_repository_context, get_release_range_context],
 )
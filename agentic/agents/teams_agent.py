@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from agentic.tools import send_notes_to_teams  # Fixed import
+from ..models import get_agent_model
 
 teams_agent = LlmAgent(
     name="Teams_Communication_Agent",
-model="gemini-2.5-flash-preview-05-20",
+model=get_agent_model(),
     description="Microsoft Teams integration specialist responsible for sending release notes and notifications to Teams channels via webhooks.",
     instruction="""You are a Microsoft Teams communication specialist. Your primary responsibilities are:
 
@@ -1,8 +1,9 @@
 from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
-from . import agents
+from .models import get_agent_model
 import logging
 import asyncio
 
@@ -42,27 +43,31 @@ When a user requests release notes generation, immediately start by transferring
 - Provide partial results if complete workflow cannot be finished
 """
 
-coordinator = LlmAgent(
-    name="Release_Notes_Orchestrator",
-    model="gemini-2.5-flash-preview-05-20",
-    description="Master coordinator that orchestrates specialized agents to generate comprehensive release notes through intelligent task delegation and workflow management.",
-    instruction=SYSTEM_PROMPT,
-    sub_agents=[
-        agents.repo_agent,
-        agents.jira_agent,
-        agents.generator_agent,
-        agents.output_agent,
-        agents.teams_agent,
-    ],
-    output_key="release_notes_result",
-)
+def build_coordinator() -> LlmAgent:
+    """Build the coordinator and its sub-agents; deferred until the first run."""
+    from . import agents
+
+    return LlmAgent(
+        name="Release_Notes_Orchestrator",
+        model=get_agent_model(),
+        description="Master coordinator that orchestrates specialized agents to generate comprehensive release notes through intelligent task delegation and workflow management.",
+        instruction=SYSTEM_PROMPT,
+        sub_agents=[
+            agents.repo_agent,
+            agents.jira_agent,
+            agents.generator_agent,
+            agents.output_agent,
+            agents.teams_agent,
+        ],
+        output_key="release_notes_result",
+    )
 
 
 class CoordinatorWrapper:
     """Enhanced wrapper for the coordinator with proper Google ADK integration."""
 
     def __init__(self):
-        self.coordinator = coordinator
+        self.coordinator = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # Set up session management
@@ -78,6 +83,8 @@ class CoordinatorWrapper:
     async def _initialize_async(self):
         """Initialize session and runner asynchronously."""
         if not self._initialized:
+            self.coordinator = build_coordinator()
+
             # Create session asynchronously
             await self.session_service.create_session(
                 app_name=self.app_name, user_id=self.user_id, session_id=self.session_id
@@ -92,14 +99,20 @@ class CoordinatorWrapper:
 
             self._initialized = True
 
-    def run(self, user_request: str) -> str:
-        """Run the coordinator with proper Google ADK integration."""
+    def run(self, user_request: str, stream: bool = False) -> str:
+        """
+        Run the coordinator with proper Google ADK integration.
+
+        Args:
+            user_request: The request for the coordinator
+            stream: Print partial model output to the terminal as it is generated
+        """
         try:
             self.logger.info("Starting release notes coordination process")
             self.logger.debug(f"User request: {user_request[:100]}...")
 
             # Run the async coordination
-            result = asyncio.run(self._run_async(user_request))
+            result = asyncio.run(self._run_async(user_request, stream))
 
             self.logger.info("Release notes coordination completed successfully")
             return result
@@ -108,22 +121,43 @@ class CoordinatorWrapper:
             self.logger.error(f"Coordination failed: {str(e)}")
             return f"❌ Coordination Error: {str(e)}. Please check your configuration and try again."
 
-    async def _run_async(self, user_request: str) -> str:
-        """Async method to run the coordinator using Google ADK Runner."""
+    async def _run_async(self, user_request: str, stream: bool = False) -> str:
+        """
+        Async method to run the coordinator using Google ADK Runner.
+        Consumes every event until the run ends, since sub-agents produce their own
+        final responses before the workflow is complete. The last final response is
+        returned; with `stream`, partial text is echoed as it arrives.
+        """
         # Initialize if not already done
         await self._initialize_async()
 
         user_content = types.Content(role="user", parts=[types.Part(text=user_request)])
+        run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if stream else StreamingMode.NONE
+        )
 
         final_response_content = "No response received from coordinator."
+        streamed_author = None
 
         async for event in self.runner.run_async(
-            user_id=self.user_id, session_id=self.session_id, new_message=user_content
+            user_id=self.user_id,
+            session_id=self.session_id,
+            new_message=user_content,
+            run_config=run_config,
         ):
-            if event.is_final_response() and event.content and event.content.parts:
-                final_response_content = event.content.parts[0].text
-                break
-
+            if not (event.content and event.content.parts):
+                continue
+            text = "".join(part.text or "" for part in event.content.parts)
+            if stream and event.partial and text:
+                if event.author != streamed_author:
+                    print(f"\n[{event.author}] ", end="", flush=True)
+                    streamed_author = event.author
+                print(text, end="", flush=True)
+            elif event.is_final_response() and text:
+                final_response_content = text
+
+        if streamed_author is not None:
+            print()
         return final_response_content
 
 
@@ -0,0 +1,84 @@
+# agentic/callbacks.py
+import json
+import os
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from llm_response_cache import ResponseCache
+from .config import config
+
+# State key carrying the cache key from the before- to the after-model callback.
+# The "temp:" prefix keeps it out of the persisted session state.
+_CACHE_KEY_STATE = "temp:llm_response_cache_key"
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def _get_response_cache() -> ResponseCache:
+    """Create the response cache on first use, honouring the configured mode."""
+    global _response_cache
+    if _response_cache is None or _response_cache.mode != config.llm_cache_mode:
+        _response_cache = ResponseCache(
+            os.path.join(config.cache_dir, "llm"), config.llm_cache_mode
+        )
+    return _response_cache
+
+
+def _request_key(llm_request: LlmRequest) -> str:
+    """Hash the model, the full conversation and the generation parameters."""
+    contents = [
+        content.model_dump(mode="json", exclude_none=True)
+        for content in llm_request.contents
+    ]
+    params = (
+        llm_request.config.model_dump(
+            mode="json", exclude_none=True, exclude={"http_options"}
+        )
+        if llm_request.config
+        else {}
+    )
+    return ResponseCache.key(llm_request.model or "", contents, params)
+
+
+def cache_before_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    Serve a stored response for an identical request, skipping the model call.
+    Returning None lets ADK call the model as usual.
+    """
+    if config.llm_cache_mode == "bypass":
+        return None
+    key = _request_key(llm_request)
+    callback_context.state[_CACHE_KEY_STATE] = key
+    cached = _get_response_cache().get(key)
+    if cached is None:
+        return None
+    print(f"💾 Response cache hit for {callback_context.agent_name}")
+    return LlmResponse.model_validate(json.loads(cached))
+
+
+def cache_after_model(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """
+    Store complete text responses. Partial chunks, errors and function calls are
+    not cached, since replaying them would skip the tool side effects.
+    """
+    key = callback_context.state.get(_CACHE_KEY_STATE)
+    if not key or config.llm_cache_mode == "bypass":
+        return None
+    parts = llm_response.content.parts if llm_response.content else None
+    if (
+        llm_response.partial
+        or llm_response.error_code
+        or not parts
+        or any(part.function_call for part in parts)
+    ):
+        return None
+    _get_response_cache().put(
+        key, llm_response.model_dump_json(exclude_none=True)
+    )
+    return None
@@ -2,19 +2,52 @@ import os
 from dotenv import load_dotenv
 from typing import Optional
 
-# Load environment variables from .env file
-load_dotenv()
-
 
 class Config:
-    """Configuration management for the agentic release notes system."""
+    """
+    Configuration management for the agentic release notes system.
+
+    Settings are read on first access rather than at import, so importing the
+    package has no side effects; the .env file is loaded at that point.
+    """
 
-    def __init__(self):
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        self.jira_server_url = os.getenv("JIRA_SERVER_URL")
-        self.jira_user_email = os.getenv("JIRA_USER_EMAIL")
-        self.jira_api_token = os.getenv("JIRA_API_TOKEN")
-        self.teams_webhook_url = os.getenv("TEAMS_WEBHOOK_URL")
+    def __getattr__(self, name: str):
+        # Only called for attributes that are not set yet.
+        if name.startswith("_") or self.__dict__.get("_loaded"):
+            raise AttributeError(name)
+        self._load()
+        return getattr(self, name)
+
+    def _load(self):
+        """Load .env and read every setting, keeping values assigned before loading."""
+        self._loaded = True
+        load_dotenv()
+        values = {
+            "gemini_api_key": os.getenv("GEMINI_API_KEY"),
+            "jira_server_url": os.getenv("JIRA_SERVER_URL"),
+            "jira_user_email": os.getenv("JIRA_USER_EMAIL"),
+            "jira_api_token": os.getenv("JIRA_API_TOKEN"),
+            "teams_webhook_url": os.getenv("TEAMS_WEBHOOK_URL"),
+            "cache_dir": os.getenv("RELEASE_NOTES_CACHE_DIR")
+            or os.path.join(os.path.expanduser("~"), ".cache", "release_notes_agent"),
+            # One of "use", "refresh" or "bypass" (see llm_response_cache.ResponseCache).
+            "llm_cache_mode": os.getenv("RELEASE_NOTES_LLM_CACHE", "use"),
+            # Local Jira issue store (see jira_cache.JiraIssueCache): its mode, and how
+            # many minutes a synced project is served without contacting Jira.
+            "jira_cache_mode": os.getenv("RELEASE_NOTES_JIRA_CACHE", "use"),
+            "jira_cache_max_age_minutes": float(os.getenv("RELEASE_NOTES_JIRA_CACHE_MAX_AGE", "15")),
+            # Model service for all agents: "gemini", "openai" or "fake" (see agentic/models.py).
+            "llm_backend": os.getenv("LLM_BACKEND", "gemini"),
+            "llm_model": os.getenv("LLM_MODEL"),
+            "llm_base_url": os.getenv("LLM_BASE_URL"),
+            "llm_api_key": os.getenv("LLM_API_KEY"),
+            # Quotas shared by all agents' model calls (see llm_scheduler.LlmScheduler).
+            "llm_rpm": float(os.getenv("LLM_RPM", "0")) or None,
+            "llm_tpm": float(os.getenv("LLM_TPM", "0")) or None,
+            "llm_max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        }
+        for key, value in values.items():
+            self.__dict__.setdefault(key, value)
 
     def validate_required_credentials(
         self, require_teams: bool = False
@@ -30,8 +63,10 @@ class Config:
         """
         missing = []
 
-        if not self.gemini_api_key:
+        if self.llm_backend == "gemini" and not self.gemini_api_key:
             missing.append("GEMINI_API_KEY")
+        if self.llm_backend == "openai" and not self.llm_model:
+            missing.append("LLM_MODEL")
         if not self.jira_server_url:
             missing.append("JIRA_SERVER_URL")
         if not self.jira_user_email:
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import subprocess
 import sys
 from .config import config
-from .base_agent import enhanced_coordinator
 
 
 def main():
@@ -40,13 +40,49 @@ def main():
         action="store_true",
         help="Flag to send generated release notes to Microsoft Teams",
     )
+    parser.add_argument(
+        "--from",
+        dest="from_ref",
+        default=None,
+        help="Start of a release range (ref or tag, exclusive) to cover every commit in --from..--to",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_ref",
+        default=None,
+        help="End of a release range (ref or tag, inclusive; default: --branch)",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=["use", "refresh", "bypass"],
+        default=config.llm_cache_mode,
+        help="Generator response cache: 'use' stored responses, 'refresh' them, or 'bypass' the cache (default: use)",
+    )
+    parser.add_argument(
+        "--jira-cache",
+        choices=["use", "refresh", "bypass"],
+        default=config.jira_cache_mode,
+        help="Local Jira issue cache: 'use' it while fresh, 'refresh' to sync on every run, or 'bypass' it (default: use)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print agent output to the terminal while it is being generated",
+    )
     parser.add_argument(
         "--interactive",
         action="store_true",
         help="Run in interactive mode for conversational interface",
     )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Validate configuration and repository refs, then exit without building the agents",
+    )
 
     args = parser.parse_args()
+    config.llm_cache_mode = args.llm_cache
+    config.jira_cache_mode = args.jira_cache
 
     # Validate configuration
     is_valid, missing_vars = config.validate_required_credentials(
@@ -61,21 +97,55 @@ def main():
 
     print("✅ Configuration validated successfully")
 
+    if args.check:
+        problems = check_repository(args)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ Repository validated successfully")
+        return
+
     if args.interactive:
         run_interactive_mode(args)
     else:
         run_single_command(args)
 
 
+def check_repository(args) -> list[str]:
+    """Check that the repository and refs resolve, without loading ADK or any model SDK."""
+    refs = [args.branch] + [ref for ref in (args.from_ref, args.to_ref) if ref]
+    problems = []
+    for ref in refs:
+        resolved = subprocess.run(
+            ["git", "-C", args.repo_path, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            capture_output=True,
+            text=True,
+        )
+        if resolved.returncode != 0:
+            problems.append(f"Ref '{ref}' does not resolve to a commit in '{args.repo_path}'")
+    return problems
+
+
 def run_single_command(args):
     """Run a single release notes generation command."""
     print(f"📁 Repository: {args.repo_path}")
     print(f"🌿 Branch: {args.branch}")
+    if args.from_ref:
+        print(f"🏷️  Release Range: {args.from_ref}..{args.to_ref or args.branch}")
     print(f"🎫 Jira Project: {args.jira_project_key}")
     print(f"📄 Output Directory: {args.output_dir}")
     if args.send_to_teams:
         print("📢 Will send to Teams after generation")
 
+    if args.from_ref:
+        to_ref = args.to_ref or args.branch
+        repo_details = f"- Release Range: from_ref={args.from_ref} to_ref={to_ref}"
+        repo_step = f'Use get_release_range_context tool with repo_path="{args.repo_path}", from_ref="{args.from_ref}" and to_ref="{to_ref}"'
+    else:
+        repo_details = ""
+        repo_step = f'Use get_repository_context tool with repo_path="{args.repo_path}" and branch="{args.branch}"'
+
     # Create the prompt for the orchestrator with ALL needed information
     user_request = f"""
     Please generate comprehensive release notes with the following specifications:
@@ -83,6 +153,7 @@ def run_single_command(args):
     Repository Details:
     - Path: {args.repo_path}
     - Branch: {args.branch}
+    {repo_details}
 
     Jira Integration:
     - Project Key: {args.jira_project_key}
@@ -95,7 +166,7 @@ def run_single_command(args):
     {"- Send to Microsoft Teams with webhook: " + config.teams_webhook_url if args.send_to_teams else ""}
 
     Please coordinate with your specialized agents to:
-    1. Repository Agent: Use get_repository_context tool with repo_path="{args.repo_path}" and branch="{args.branch}"
+    1. Repository Agent: {repo_step}
     2. Jira Agent: Use get_jira_tickets tool with project_key="{args.jira_project_key}", jira_server_url="{config.jira_server_url}", jira_user_email="{config.jira_user_email}", jira_api_token="{config.jira_api_token}"
     3. Generator Agent: Create release notes from the collected data
     4. Output Agent: Save to directory "{args.output_dir}"
@@ -103,8 +174,10 @@ def run_single_command(args):
     """
 
     print("\n🤖 Coordinating with specialized agents...")
+    from .base_agent import enhanced_coordinator
+
     try:
-        result = enhanced_coordinator.run(user_request)
+        result = enhanced_coordinator.run(user_request, stream=args.stream)
         print("\n" + "=" * 50)
         print("✅ RELEASE NOTES GENERATION COMPLETE")
         print("=" * 50)
@@ -125,6 +198,7 @@ def run_interactive_mode(args):
     context = f"""
     Current session context:
     - Repository: {args.repo_path} (branch: {args.branch})
+    {"- Release Range: " + args.from_ref + ".." + (args.to_ref or args.branch) if args.from_ref else ""}
     - Jira Project: {args.jira_project_key}
     - Output Directory: {args.output_dir}
     - Teams Integration: {'Enabled' if args.send_to_teams else 'Disabled'}
@@ -133,6 +207,8 @@ def run_interactive_mode(args):
     print(context)
     print("-" * 60)
 
+    from .base_agent import enhanced_coordinator
+
     while True:
         try:
             user_input = input("\n💬 You: ").strip()
@@ -153,7 +229,7 @@ def run_interactive_mode(args):
             full_request = f"{context}\n\nUser request: {user_input}"
 
             print("\n🤖 Coordinator: Working on your request...")
-            result = enhanced_coordinator.run(full_request)
+            result = enhanced_coordinator.run(full_request, stream=args.stream)
             print(f"\n🤖 Coordinator: {result}")
 
         except KeyboardInterrupt:
@@ -0,0 +1,159 @@
+# agentic/models.py
+import json
+from typing import Any, AsyncGenerator
+
+from google.adk.models import BaseLlm, Gemini, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import ConfigDict
+
+from llm_backends import FakeBackend, OpenAICompatibleBackend
+from llm_scheduler import LlmScheduler
+from .config import config
+
+DEFAULT_AGENT_MODEL = "gemini-2.5-flash-preview-05-20"
+
+
+class BackendLlm(BaseLlm):
+    """
+    ADK model adapter for an llm_backends.LlmBackend.
+
+    The backend interface is text-only: the request (system instruction, messages,
+    tool calls and tool results) is flattened into a single prompt, and responses
+    never contain function calls. Use it for offline runs and load tests, not for
+    workflows that depend on agent transfers or tools.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    backend: Any = None
+
+    @staticmethod
+    def _flatten(llm_request: LlmRequest) -> str:
+        """Render the request as a plain-text transcript."""
+        lines = []
+        system_instruction = (
+            llm_request.config.system_instruction if llm_request.config else None
+        )
+        if isinstance(system_instruction, str):
+            lines.append(f"system: {system_instruction}")
+        elif system_instruction is not None:
+            lines.append(
+                "system: "
+                + "".join(part.text or "" for part in system_instruction.parts or [])
+            )
+        for content in llm_request.contents:
+            for part in content.parts or []:
+                if part.text:
+                    lines.append(f"{content.role}: {part.text}")
+                elif part.function_call:
+                    lines.append(
+                        f"{content.role}: called {part.function_call.name}"
+                        f"({json.dumps(part.function_call.args, default=str)})"
+                    )
+                elif part.function_response:
+                    lines.append(
+                        f"{content.role}: {part.function_response.name} returned "
+                        f"{json.dumps(part.function_response.response, default=str)}"
+                    )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _generation_config(llm_request: LlmRequest) -> dict:
+        if not llm_request.config:
+            return {}
+        return {
+            key: getattr(llm_request.config, key)
+            for key in ("temperature", "top_p", "max_output_tokens", "stop_sequences")
+            if getattr(llm_request.config, key, None) is not None
+        }
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        prompt = self._flatten(llm_request)
+        generation_config = self._generation_config(llm_request)
+
+        if not stream:
+            text = await self.backend.generate_async(prompt, generation_config)
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=text)])
+            )
+            return
+
+        chunks = []
+        async for chunk in self.backend.stream(prompt, generation_config):
+            chunks.append(chunk)
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                partial=True,
+            )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="".join(chunks))])
+        )
+
+
+class ScheduledLlm(BaseLlm):
+    """
+    Routes every request of another ADK model through an LlmScheduler, so all
+    agents share one quota and throttled calls are retried instead of failing
+    the run. Streamed requests are only retried before their first response.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseLlm
+    scheduler: Any = None
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        tokens = LlmScheduler.estimate_tokens(BackendLlm._flatten(llm_request))
+        async for response in self.scheduler.stream(
+            lambda: self.inner.generate_content_async(llm_request, stream), tokens
+        ):
+            yield response
+
+
+def _base_model() -> BaseLlm:
+    """
+    Returns the model selected by LLM_BACKEND / LLM_MODEL.
+
+    - gemini: ADK's native Gemini model.
+    - openai: an OpenAI-compatible server through LiteLLM (keeps function calling),
+      or the text-only BackendLlm adapter if LiteLLM is not installed.
+    - fake: the deterministic FakeBackend through BackendLlm.
+    """
+    if config.llm_backend == "openai":
+        try:
+            from google.adk.models.lite_llm import LiteLlm
+        except ImportError:
+            backend = OpenAICompatibleBackend(
+                config.llm_model, config.llm_base_url, config.llm_api_key
+            )
+            return BackendLlm(model=backend.model_name, backend=backend)
+        return LiteLlm(
+            model=f"openai/{config.llm_model}",
+            api_base=config.llm_base_url or OpenAICompatibleBackend.DEFAULT_BASE_URL,
+            api_key=config.llm_api_key or "none",
+        )
+    if config.llm_backend == "fake":
+        backend = FakeBackend(config.llm_model or "fake-model")
+        return BackendLlm(model=backend.model_name, backend=backend)
+    return Gemini(model=config.llm_model or DEFAULT_AGENT_MODEL)
+
+
+_agent_model = None
+
+
+def get_agent_model() -> BaseLlm:
+    """
+    Returns the model every agent runs on: the selected model behind one scheduler
+    shared by all agents (LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY). Built on first
+    call, once the configuration is final, and reused afterwards.
+    """
+    global _agent_model
+    if _agent_model is None:
+        inner = _base_model()
+        scheduler = LlmScheduler(config.llm_rpm, config.llm_tpm, config.llm_max_concurrency)
+        _agent_model = ScheduledLlm(model=inner.model, inner=inner, scheduler=scheduler)
+    return _agent_model
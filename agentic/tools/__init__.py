@@ -3,13 +3,14 @@ The agentic.tools package provides a collection of tools that can be used by age
 """
 
 from .file_tools import save_release_notes_to_file
-from .git_tools import get_repository_context
+from .git_tools import get_repository_context, get_release_range_context
 from .jira_tools import get_jira_tickets
 from .teams_tools import send_notes_to_teams
 
 __all__ = [
     "save_release_notes_to_file",
     "get_repository_context",
+    "get_release_range_context",
     "get_jira_tickets",
     "send_notes_to_teams",
 ]
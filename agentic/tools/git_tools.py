@@ -2,6 +2,9 @@
 import git
 import os
 
+from commit_log import iter_commits, summarize_commits
+from diff_parser import EMPTY_TREE_SHA, render_filtered_diff
+
 
 # Re-using the core logic from the original repo_manager.py
 # The class structure is kept to easily manage state and dependencies.
@@ -16,41 +19,39 @@ class RepoManager:
         self, repo_path: str, branch_name: str = "main"
     ) -> tuple[str, str, str]:
         """
-        Opens a local Git repository and gets the diff from the last commit and its SHA.
+        Opens a local Git repository and gets the diff from the last commit on a
+        branch and its SHA, reading straight from refs without a checkout.
         """
         if not os.path.isdir(os.path.join(repo_path, ".git")):
             return "", "", f"Error: '{repo_path}' is not a valid Git repository."
         try:
             repo = git.Repo(repo_path)
-            if repo.is_dirty(untracked_files=True):
-                # Handle or log dirty repository state if necessary, for now, we proceed
-                print(f"Warning: Repository at {repo_path} is dirty. Proceeding with diff operation.")
-
-            # Ensure the correct branch is checked out if specified and different from current
-            if repo.head.is_valid() and repo.active_branch.name != branch_name:
-                print(f"Checking out branch '{branch_name}'...")
-                # Ensure there's a local branch corresponding to branch_name
-                if branch_name in repo.heads:
-                    repo.heads[branch_name].checkout()
-                else: # Try to checkout remote branch if local doesn't exist
-                    try:
-                        repo.git.checkout(branch_name)
-                    except git.exc.GitCommandError as e:
-                         return "", "", f"Error checking out branch '{branch_name}': {e}. Ensure it exists locally or remotely."
-
-
-            if not repo.head.is_valid():
-                return "", "", "Error: Repository head is not valid."
-            
-            last_commit = repo.head.commit
+
+            # Resolve the branch straight to a commit instead of checking it out, so
+            # HEAD, the index and the worktree are never touched (no untracked-file
+            # scans either) and concurrent runs against one clone are safe.
+            last_commit = None
+            for ref in (branch_name, f"origin/{branch_name}"):
+                try:
+                    last_commit = repo.commit(ref)
+                    break
+                except (git.exc.BadName, ValueError):
+                    continue
+            if last_commit is None:
+                return "", "", f"Error: Could not resolve branch '{branch_name}'. Ensure it exists locally or on origin."
+
             if not last_commit.parents:
                 # This is the initial commit, no parent to diff against
                 # We can return the state of the tree at this commit as a diff against an empty tree
                 print("Initial commit detected. Diffing against an empty tree.")
-                diff_text = repo.git.diff(git.NULL_TREE, last_commit)
+                diff_text, _ = render_filtered_diff(
+                    repo_path, EMPTY_TREE_SHA, last_commit.hexsha
+                )
             else:
                 second_to_last_commit = last_commit.parents[0] # Diff against the first parent
-                diff_text = repo.git.diff(second_to_last_commit, last_commit)
+                diff_text, _ = render_filtered_diff(
+                    repo_path, second_to_last_commit.hexsha, last_commit.hexsha
+                )
             
             return (diff_text, last_commit.hexsha, "")
         except git.exc.NoSuchPathError:
@@ -60,6 +61,34 @@ class RepoManager:
         except Exception as e:
             return "", "", f"An unexpected error occurred during Git operation: {e}"
 
+    def get_range_diff_and_commit_info(
+        self, repo_path: str, from_ref: str, to_ref: str
+    ) -> tuple[str, str, str, int, str]:
+        """
+        Gets the diff and a streamed, merge-grouped commit log for a release range.
+        """
+        if not os.path.isdir(os.path.join(repo_path, ".git")):
+            return "", "", "", 0, f"Error: '{repo_path}' is not a valid Git repository."
+        try:
+            repo = git.Repo(repo_path)
+            from_commit = repo.commit(from_ref)
+            to_commit = repo.commit(to_ref)
+            commit_log, commit_count = summarize_commits(
+                iter_commits(repo_path, from_commit.hexsha, to_commit.hexsha)
+            )
+            diff_text, _ = render_filtered_diff(
+                repo_path, from_commit.hexsha, to_commit.hexsha
+            )
+            return diff_text, to_commit.hexsha, commit_log, commit_count, ""
+        except (git.exc.BadName, ValueError) as e:
+            return "", "", "", 0, f"Error: Could not resolve range {from_ref}..{to_ref}: {e}"
+        except git.exc.NoSuchPathError:
+            return "", "", "", 0, f"Error: Path '{repo_path}' does not exist or is not a Git repository."
+        except git.exc.InvalidGitRepositoryError:
+            return "", "", "", 0, f"Error: '{repo_path}' is not a valid Git repository."
+        except Exception as e:
+            return "", "", "", 0, f"An unexpected error occurred during Git operation: {e}"
+
 
 # Instantiate the manager to be used by the tool.
 _repo_manager = RepoManager()
@@ -88,3 +117,31 @@ def get_repository_context(repo_path: str, branch: str) -> dict:
         "commit_sha": commit_sha,
         "error": error,
     }
+
+
+def get_release_range_context(repo_path: str, from_ref: str, to_ref: str) -> dict:
+    """
+    Provides the diff and commit log for a release range, e.g. between two tags.
+
+    Args:
+        repo_path: The local file system path to the Git repository.
+        from_ref: The start of the range (exclusive), e.g. the previous release tag.
+        to_ref: The end of the range (inclusive), e.g. the new release tag or a branch.
+
+    Returns:
+        A dictionary containing 'diff_text', 'commit_sha' (end of the range),
+        'commit_log', 'commit_count' and 'error'. The 'error' key will be empty on success.
+    """
+    print(
+        f"Tool 'get_release_range_context' called for repo: {repo_path} range: {from_ref}..{to_ref}"
+    )
+    diff_text, commit_sha, commit_log, commit_count, error = (
+        _repo_manager.get_range_diff_and_commit_info(repo_path, from_ref, to_ref)
+    )
+    return {
+        "diff_text": diff_text,
+        "commit_sha": commit_sha,
+        "commit_log": commit_log,
+        "commit_count": commit_count,
+        "error": error,
+    }
@@ -1,21 +1,90 @@
 # agentic/tools/jira_tools.py
 import os
-from jira import JIRA
+import threading
+import time
+from typing import Optional
+
+from jira_cache import JiraIssueCache
+from jira_integrator import JiraIntegrator, search_issue_pages
+from ..config import config
+
+# Ticket fields returned to the agent.
+TICKET_FIELDS = ("key", "summary", "status", "issue_type")
 
 
 # The core logic from the original JiraIntegrator is preserved.
 class JiraManager:
     """
     Integrates with Jira to fetch issue details.
+
+    Managers are pooled per server and credential (see get_jira_manager), so the
+    authenticated session and its keep-alive connections outlive a tool call.
     """
 
-    def __init__(self, jira_server_url: str, jira_user_email: str, jira_api_token: str):
+    # Idle time after which a pooled client is checked before it is reused.
+    HEALTH_CHECK_AFTER_SECONDS = 300
+    # Responses that mean the session's credentials are no longer accepted.
+    AUTH_FAILURE_STATUS_CODES = {401, 403}
+
+    def __init__(
+        self,
+        jira_server_url: str,
+        jira_user_email: str,
+        jira_api_token: str,
+        issue_cache: Optional[JiraIssueCache] = None,
+    ):
         self.jira_server_url = jira_server_url
         self.jira_user_email = jira_user_email
         self.jira_api_token = jira_api_token
-        self.jira_client = self._authenticate_jira()
+        self.issue_cache = issue_cache
+        self._jira_client = None
+        self._authenticated = False
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def jira_client(self):
+        """
+        Connect on first use, so calls served from the issue cache stay offline.
+        A client idle for HEALTH_CHECK_AFTER_SECONDS is checked and rebuilt if the
+        server no longer accepts it.
+        """
+        with self._lock:
+            idle = time.monotonic() - self._last_used
+            if (
+                self._jira_client is not None
+                and idle > self.HEALTH_CHECK_AFTER_SECONDS
+                and not self._is_healthy()
+            ):
+                self._authenticated = False
+            if not self._authenticated:
+                self._jira_client = self._authenticate_jira()
+                self._authenticated = True
+            self._last_used = time.monotonic()
+            return self._jira_client
+
+    @property
+    def failed(self) -> bool:
+        """Whether the last connection attempt failed."""
+        return self._authenticated and self._jira_client is None
+
+    def reset(self):
+        """Drop the client, so the next use authenticates again."""
+        with self._lock:
+            self._jira_client = None
+            self._authenticated = False
+
+    def _is_healthy(self) -> bool:
+        try:
+            self._jira_client.myself()
+            return True
+        except Exception as e:
+            print(f"Pooled Jira client failed its health check ({e}); reconnecting.")
+            return False
 
     def _authenticate_jira(self):
+        from jira import JIRA
+
         try:
             options = {"server": self.jira_server_url}
             jira = JIRA(options, basic_auth=(self.jira_user_email, self.jira_api_token))
@@ -25,24 +94,46 @@ class JiraManager:
             print(f"Error authenticating with Jira: {e}")
             return None
 
+    def _search(self, jql: str, max_results: Optional[int] = None) -> list[dict]:
+        """Search for the fields the notes use only, with the pages fetched concurrently."""
+        if not self.jira_client:
+            raise ConnectionError("Jira client not initialized.")
+        try:
+            issues, pages = search_issue_pages(self.jira_client, jql, max_results)
+        except Exception as e:
+            if getattr(e, "status_code", None) not in self.AUTH_FAILURE_STATUS_CODES:
+                raise
+            # Expired or rotated session: authenticate again and retry once.
+            print(f"Jira rejected the session ({e}); re-authenticating.")
+            self.reset()
+            if not self.jira_client:
+                raise
+            issues, pages = search_issue_pages(self.jira_client, jql, max_results)
+        print(
+            f"Jira search: {len(issues)} issues in {len(pages)} pages, "
+            f"{sum(page['bytes'] for page in pages) / 1024:.0f} KiB, "
+            f"slowest page {max(page['seconds'] for page in pages):.2f}s"
+        )
+        return [JiraIntegrator.issue_to_dict(issue) for issue in issues]
+
     def get_jira_notes_by_project(
         self, project_key: str, max_results: int = 50
     ) -> list[dict]:
+        if self.issue_cache is not None and self.issue_cache.sync(
+            project_key, self._search
+        ):
+            issues = self.issue_cache.find(project_key, limit=max_results)
+            print(f"Found {len(issues)} cached issues for project {project_key}")
+            return [{field: issue[field] for field in TICKET_FIELDS} for issue in issues]
         if not self.jira_client:
             print("Jira client not initialized.")
             return []
         try:
             jql = f'project = "{project_key}" ORDER BY created DESC'
-            issues = self.jira_client.search_issues(jql, maxResults=max_results)
+            issues = self._search(jql, max_results)
             print(f"Found {len(issues)} issues for project {project_key}")
             jira_issues_data = [
-                {
-                    "key": issue.key,
-                    "summary": issue.fields.summary,
-                    "status": issue.fields.status.name,
-                    "issue_type": issue.fields.issuetype.name,
-                }
-                for issue in issues
+                {field: issue[field] for field in TICKET_FIELDS} for issue in issues
             ]
             return jira_issues_data
         except Exception as e:
@@ -50,13 +141,53 @@ class JiraManager:
             return []
 
 
-# We will initialize this manager in main.py where we have credentials.
-# This makes the tool function pure and testable.
+_issue_cache: Optional[JiraIssueCache] = None
+
+
+def _get_issue_cache() -> JiraIssueCache:
+    """Open the local issue store on first use, shared by every tool call."""
+    global _issue_cache
+    if _issue_cache is None:
+        _issue_cache = JiraIssueCache(
+            os.path.join(config.cache_dir, "jira"),
+            config.jira_cache_mode,
+            config.jira_cache_max_age_minutes * 60,
+        )
+    return _issue_cache
+
+
+# Process-wide JiraManagers by (server URL, user email, API token).
+_managers: dict[tuple[str, str, str], JiraManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_jira_manager(
+    jira_server_url: str, jira_user_email: str, jira_api_token: str
+) -> JiraManager:
+    """
+    Return the pooled manager for a server and credential, creating it on first
+    use. A manager whose last connection attempt failed tries again.
+    """
+    key = (jira_server_url.rstrip("/"), jira_user_email, jira_api_token)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = JiraManager(
+                jira_server_url, jira_user_email, jira_api_token, _get_issue_cache()
+            )
+    if manager.failed:
+        manager.reset()
+    return manager
+
+
+# Managers are pooled per credential, so repeated tool calls (as in interactive
+# mode) reuse one authenticated session instead of reconnecting every time.
 def get_jira_tickets(
     project_key: str, jira_server_url: str, jira_user_email: str, jira_api_token: str
 ) -> list[dict]:
     """
-    Fetches the most recent Jira tickets for a given project key.
+    Fetches the most recent Jira tickets for a given project key. Tickets come from
+    the local issue cache, which only asks Jira for updates once it is stale.
 
     Args:
         project_key: The Jira project key (e.g., 'PROJ', 'TEST').
@@ -69,5 +200,5 @@ def get_jira_tickets(
         with its key, summary, status, and issue type.
     """
     print(f"Tool 'get_jira_tickets' called for project: {project_key}")
-    jira_manager = JiraManager(jira_server_url, jira_user_email, jira_api_token)
+    jira_manager = get_jira_manager(jira_server_url, jira_user_email, jira_api_token)
     return jira_manager.get_jira_notes_by_project(project_key)
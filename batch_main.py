@@ -0,0 +1,459 @@
+import os
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dotenv import load_dotenv
+
+from repo_manager import RepoManager
+from jira_key_index import JiraReferences
+from jira_integrator import JiraIntegrator
+from jira_cache import JiraIssueCache
+from release_note_generator import ReleaseNoteGenerator
+from llm_response_cache import ResponseCache
+from llm_backends import BACKENDS, create_backend
+from llm_scheduler import LlmScheduler
+from output_writer import OutputWriter
+from teams_integrator import TeamsIntegrator
+
+
+def extract_repo(entry: dict, cache_dir: str | None, context_mode: str) -> dict:
+    """
+    Runs the git extraction for one manifest entry. Executed in a worker process,
+    so it only takes and returns picklable values.
+
+    Args:
+        entry (dict): The manifest entry.
+        cache_dir (str | None): Root directory for on-disk caches.
+        context_mode (str): One of RepoManager.CONTEXT_MODES.
+
+    Returns:
+        dict: The diff, commit SHA, codebase content, commit log, the issue keys and
+              dates Jira issues are looked up by (and any error reading them),
+              error and timing.
+    """
+    start = time.perf_counter()
+    repo_manager = RepoManager(cache_dir=cache_dir)
+    to_ref = entry.get("to") or entry.get("branch", "main")
+    commit_log = ""
+    if entry.get("from"):
+        # The range walk also collects the Jira references.
+        references = JiraReferences([entry["jira_project_key"]], to_ref)
+        diff_text, commit_sha, all_codebase_content, commit_log, error = (
+            repo_manager.get_range_diff_and_full_codebase(
+                entry["repo_path"], entry["from"], to_ref, context_mode, references
+            )
+        )
+        references.finish(error)
+        issue_keys, first_date, last_date, jira_error = references.wait()
+    else:
+        diff_text, commit_sha, all_codebase_content, error = (
+            repo_manager.get_last_diff_and_full_codebase(
+                entry["repo_path"], entry.get("branch", "main"), context_mode
+            )
+        )
+        issue_keys, first_date, last_date, jira_error = repo_manager.get_jira_references(
+            entry["repo_path"], to_ref, [entry["jira_project_key"]]
+        )
+    return {
+        "diff_text": diff_text,
+        "commit_sha": commit_sha,
+        "all_codebase_content": all_codebase_content,
+        "commit_log": commit_log,
+        "jira_references": (frozenset(issue_keys), first_date, last_date),
+        "jira_error": jira_error,
+        "error": error,
+        "git_seconds": time.perf_counter() - start,
+    }
+
+
+class BatchRunner:
+    """
+    Generates release notes for many repositories concurrently.
+    Git extraction runs in a process pool; Jira and LLM clients are shared across
+    repositories, identical Jira lookups are made only once, and the number of
+    in-flight LLM calls is capped so a large batch does not exhaust the quota.
+    """
+
+    def __init__(
+        self,
+        jira_integrator: JiraIntegrator,
+        release_note_generator: ReleaseNoteGenerator,
+        output_dir: str,
+        max_git_workers: int,
+        max_llm_concurrency: int,
+        context_mode: str = "full",
+        cache_dir: str | None = None,
+        teams_integrator: TeamsIntegrator | None = None,
+    ):
+        """
+        Initializes the BatchRunner.
+
+        Args:
+            jira_integrator (JiraIntegrator): Shared Jira client.
+            release_note_generator (ReleaseNoteGenerator): Shared LLM client.
+            output_dir (str): Base directory; each repository gets a subdirectory.
+            max_git_workers (int): Number of git extraction processes.
+            max_llm_concurrency (int): Maximum number of concurrent LLM calls.
+            context_mode (str): One of RepoManager.CONTEXT_MODES.
+            cache_dir (str | None): Root directory for on-disk caches.
+            teams_integrator (TeamsIntegrator | None): Sends notes to Teams if set.
+        """
+        self.jira_integrator = jira_integrator
+        self.release_note_generator = release_note_generator
+        self.output_writer = OutputWriter()
+        self.output_dir = output_dir
+        self.max_git_workers = max_git_workers
+        self.max_llm_concurrency = max_llm_concurrency
+        self.context_mode = context_mode
+        self.cache_dir = cache_dir
+        self.teams_integrator = teams_integrator
+        self._llm_slots = threading.BoundedSemaphore(max_llm_concurrency)
+        self._jira_lock = threading.Lock()
+        self._jira_futures = {}
+
+    def _get_jira_data(
+        self, project_key: str, jira_references: tuple[frozenset[str], str, str]
+    ) -> list[dict]:
+        """
+        Fetches the Jira issues referenced by a repository's commits, once per
+        distinct lookup, even when several repositories need the same one.
+        """
+        lookup = (project_key, *jira_references)
+        with self._jira_lock:
+            future = self._jira_futures.get(lookup)
+            owner = future is None
+            if owner:
+                future = self._jira_futures[lookup] = Future()
+        if owner:
+            try:
+                future.set_result(
+                    self.jira_integrator.get_jira_notes_for_range(project_key, *jira_references)
+                )
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def _finish_repo(self, entry: dict, extracted: dict) -> dict:
+        """
+        Runs the Jira, generation, write and Teams stages for one repository.
+        """
+        name = entry["name"]
+        result = {"name": name, "status": "failed", "git_seconds": extracted["git_seconds"]}
+        if extracted["error"]:
+            result["error"] = extracted["error"]
+            return result
+        result["commit_sha"] = extracted["commit_sha"]
+
+        if extracted["jira_error"]:
+            # Falling back to the project's latest issues would feed the model
+            # tickets unrelated to this release.
+            print(f"[{name}] Skipping Jira: {extracted['jira_error']}")
+            jira_data = []
+        else:
+            jira_data = self._get_jira_data(entry["jira_project_key"], extracted["jira_references"])
+
+        with self._llm_slots:
+            start = time.perf_counter()
+            print(f"[{name}] Generating release notes...")
+            generated_notes = self.release_note_generator.generate_release_notes(
+                extracted["diff_text"],
+                jira_data,
+                extracted["commit_sha"],
+                extracted["all_codebase_content"],
+                extracted["commit_log"],
+            )
+            result["llm_seconds"] = time.perf_counter() - start
+
+        if "Error: Could not generate release notes" in generated_notes:
+            result["error"] = generated_notes
+            return result
+
+        saved_filepath = self.output_writer.save_release_notes_to_file(
+            generated_notes, os.path.join(self.output_dir, name)
+        )
+        if not saved_filepath:
+            result["error"] = "Could not save release notes."
+            return result
+        result["output_file"] = saved_filepath
+
+        if self.teams_integrator:
+            result["sent_to_teams"] = self.teams_integrator.send_release_notes(
+                generated_notes, extracted["commit_sha"]
+            )
+
+        result["status"] = "ok"
+        return result
+
+    def run(self, entries: list[dict]) -> list[dict]:
+        """
+        Processes every manifest entry and returns one result per repository.
+        Downstream stages for a repository start as soon as its git extraction
+        finishes, so total time approaches that of the slowest repository.
+
+        Args:
+            entries (list[dict]): Manifest entries.
+
+        Returns:
+            list[dict]: Per-repository results, in manifest order.
+        """
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.max_git_workers) as git_pool, ThreadPoolExecutor(
+            max_workers=max(len(entries), 1)
+        ) as stage_pool:
+            git_futures = {
+                git_pool.submit(extract_repo, entry, self.cache_dir, self.context_mode): entry
+                for entry in entries
+            }
+            stage_futures = {}
+            for future in as_completed(git_futures):
+                entry = git_futures[future]
+                try:
+                    extracted = future.result()
+                except Exception as e:
+                    results[entry["name"]] = {
+                        "name": entry["name"],
+                        "status": "failed",
+                        "error": f"Git extraction crashed: {e}",
+                    }
+                    continue
+                print(f"[{entry['name']}] Git extraction done in {extracted['git_seconds']:.1f}s.")
+                stage_futures[stage_pool.submit(self._finish_repo, entry, extracted)] = entry
+
+            for future in as_completed(stage_futures):
+                entry = stage_futures[future]
+                try:
+                    results[entry["name"]] = future.result()
+                except Exception as e:
+                    results[entry["name"]] = {
+                        "name": entry["name"],
+                        "status": "failed",
+                        "error": f"Unexpected error: {e}",
+                    }
+
+        return [results[entry["name"]] for entry in entries]
+
+
+def load_manifest(manifest_path: str) -> list[dict]:
+    """
+    Loads and validates a batch manifest.
+    The manifest is a JSON file with a "repos" list; each entry needs "repo_path"
+    and "jira_project_key", and may set "name", "branch", "from" and "to".
+
+    Args:
+        manifest_path (str): Path to the manifest file.
+
+    Returns:
+        list[dict]: The manifest entries, each with a unique "name".
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    entries = manifest["repos"] if isinstance(manifest, dict) else manifest
+    seen = set()
+    for entry in entries:
+        missing = [key for key in ("repo_path", "jira_project_key") if not entry.get(key)]
+        if missing:
+            raise ValueError(f"Manifest entry {entry} is missing {', '.join(missing)}.")
+        name = entry.get("name") or os.path.basename(os.path.normpath(entry["repo_path"]))
+        if name in seen:
+            raise ValueError(f"Duplicate repository name '{name}' in manifest.")
+        seen.add(name)
+        entry["name"] = name
+    return entries
+
+
+def main():
+    """
+    Batch entry point: generates release notes for every repository in a manifest.
+    """
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description="Generate release notes for many repositories concurrently from a manifest."
+    )
+    parser.add_argument(
+        "--manifest",
+        required=True,
+        help='JSON manifest: {"repos": [{"name", "repo_path", "branch", "jira_project_key", "from", "to"}]}.',
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="generated_release_notes",
+        help="Base directory for release notes; each repository gets a subdirectory.",
+    )
+    parser.add_argument(
+        "--max-git-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes used for git extraction (default: CPU count).",
+    )
+    parser.add_argument(
+        "--max-llm-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of LLM calls in flight at once (default: 4).",
+    )
+    parser.add_argument(
+        "--context-mode",
+        choices=RepoManager.CONTEXT_MODES,
+        default="full",
+        help="Codebase context to send (default: full).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for on-disk caches (default: $RELEASE_NOTES_CACHE_DIR or ~/.cache/release_notes_agent).",
+    )
+    parser.add_argument(
+        "--send-to-teams",
+        action="store_true",
+        help="Send each repository's release notes to a Microsoft Teams channel.",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=ResponseCache.CACHE_MODES,
+        default="use",
+        help="Model response cache: 'use' stored responses, 'refresh' them with a new call, or 'bypass' the cache (default: use).",
+    )
+    parser.add_argument(
+        "--jira-cache",
+        choices=JiraIssueCache.CACHE_MODES,
+        default="use",
+        help="Local Jira issue cache: 'use' it while fresh, 'refresh' to sync on every run, or 'bypass' it (default: use).",
+    )
+    parser.add_argument(
+        "--jira-cache-max-age",
+        type=float,
+        default=JiraIssueCache.DEFAULT_MAX_AGE_SECONDS / 60,
+        help=f"Minutes a synced Jira project is served from the cache without contacting Jira (default: {JiraIssueCache.DEFAULT_MAX_AGE_SECONDS // 60}).",
+    )
+    parser.add_argument(
+        "--llm-backend",
+        choices=BACKENDS,
+        default=os.getenv("LLM_BACKEND", "gemini"),
+        help="Model service: 'gemini', a local OpenAI-compatible 'openai' server, or a deterministic 'fake' for offline runs (default: $LLM_BACKEND or gemini).",
+    )
+    parser.add_argument(
+        "--llm-model",
+        default=os.getenv("LLM_MODEL"),
+        help="Model name for the backend (default: $LLM_MODEL or the backend's default).",
+    )
+    parser.add_argument(
+        "--llm-base-url",
+        default=os.getenv("LLM_BASE_URL"),
+        help="API root of the OpenAI-compatible server (default: $LLM_BASE_URL or http://localhost:8000/v1).",
+    )
+    parser.add_argument(
+        "--llm-rpm",
+        type=float,
+        default=float(os.getenv("LLM_RPM", "0")),
+        help="Model requests per minute allowed by the quota; 0 for no limit (default: $LLM_RPM or 0).",
+    )
+    parser.add_argument(
+        "--llm-tpm",
+        type=float,
+        default=float(os.getenv("LLM_TPM", "0")),
+        help="Model prompt tokens per minute allowed by the quota; 0 for no limit (default: $LLM_TPM or 0).",
+    )
+    args = parser.parse_args()
+
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+    jira_server_url = os.getenv("JIRA_SERVER_URL")
+    jira_user_email = os.getenv("JIRA_USER_EMAIL")
+    jira_api_token = os.getenv("JIRA_API_TOKEN")
+    teams_webhook_url = os.getenv("TEAMS_WEBHOOK_URL")
+
+    if args.llm_backend == "gemini" and not gemini_api_key:
+        print("Error: GEMINI_API_KEY environment variable not set.")
+        return
+    if not all([jira_server_url, jira_user_email, jira_api_token]):
+        print(
+            "Error: JIRA_SERVER_URL, JIRA_USER_EMAIL, or JIRA_API_TOKEN environment variables not set."
+        )
+        return
+    if args.send_to_teams and not teams_webhook_url:
+        print(
+            "Error: --send-to-teams flag is set, but TEAMS_WEBHOOK_URL environment variable is not."
+        )
+        return
+
+    try:
+        entries = load_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Could not load manifest '{args.manifest}': {e}")
+        return
+    try:
+        backend = create_backend(args.llm_backend, args.llm_model, args.llm_base_url)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    print(f"Starting batch release note generation for {len(entries)} repositories...")
+    start = time.perf_counter()
+    cache_dir = args.cache_dir or os.getenv("RELEASE_NOTES_CACHE_DIR") or RepoManager.DEFAULT_CACHE_DIR
+    runner = BatchRunner(
+        # One issue cache for the batch: each project is synced at most once per run.
+        JiraIntegrator(
+            jira_server_url,
+            jira_api_token,
+            jira_user_email,
+            JiraIssueCache(
+                os.path.join(cache_dir, "jira"), args.jira_cache, args.jira_cache_max_age * 60
+            ),
+        ),
+        ReleaseNoteGenerator(
+            ResponseCache(os.path.join(cache_dir, "llm"), args.llm_cache),
+            backend=backend,
+            # One scheduler for the whole batch, so every repository draws on
+            # the same quota and throttling anywhere slows everyone down.
+            scheduler=LlmScheduler(
+                args.llm_rpm or None, args.llm_tpm or None, args.max_llm_concurrency
+            ),
+        ),
+        args.output_dir,
+        max_git_workers=args.max_git_workers,
+        max_llm_concurrency=args.max_llm_concurrency,
+        context_mode=args.context_mode,
+        cache_dir=args.cache_dir,
+        teams_integrator=TeamsIntegrator(teams_webhook_url) if args.send_to_teams else None,
+    )
+    results = runner.run(entries)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    summary_path = os.path.join(args.output_dir, "batch_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "elapsed_seconds": elapsed,
+                "llm_scheduler": runner.release_note_generator.scheduler.stats,
+                "jira_cache": runner.jira_integrator.issue_cache.stats,
+                "jira_search_pages": runner.jira_integrator.search_pages,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    print(runner.release_note_generator.scheduler.format_stats())
+    print(runner.jira_integrator.format_search_stats())
+    print(runner.jira_integrator.issue_cache.format_stats())
+    print("\n--- Batch Summary ---")
+    for result in results:
+        detail = result.get("output_file") or result.get("error", "")
+        print(f"{result['status'].upper():<7} {result['name']:<30} {detail}")
+    failed = sum(result["status"] != "ok" for result in results)
+    print(
+        f"\n{len(results) - failed} succeeded, {failed} failed in {elapsed:.1f}s. Summary written to {summary_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
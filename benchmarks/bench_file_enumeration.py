@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmarks codebase collection on a synthetic repository.
+
+Compares the original os.walk-based collector (which descends into .git and
+node_modules before skipping them and reads files one at a time) against the
+FileEnumerator engine and the full RepoManager path (listing, snapshot cache,
+dependency graph and packing), cold and with a warm snapshot cache. RepoManager
+runs once with its caps lifted, so it collects the whole tree like the legacy
+collector, and once with its default caps and a few changed files, as in a real
+run. The OS page cache is warmed first so every collector starts from the same
+state; "cold" and "warm" refer to the snapshot cache only.
+
+Usage (from the repository root):
+    python benchmarks/bench_file_enumeration.py --files 100000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_enumerator import FileEnumerator  # noqa: E402
+from repo_manager import RepoManager  # noqa: E402
+
+LEGACY_SKIPPED_EXTENSIONS = [
+    ".exe", ".dll", ".zip", ".tar.gz", ".bin", ".jpg", ".jpeg", ".png", ".gif",
+    ".bmp", ".pdf", ".docx", ".xlsx", ".pptx", ".sqlite", ".db", ".pyc", ".class",
+]
+
+
+def build_synthetic_repo(root: str, file_count: int) -> str:
+    """
+    Creates a git repository with `file_count` tracked source files spread over
+    nested packages, plus an untracked node_modules tree and a few binaries.
+    """
+    files_per_dir = 100
+    for i in range(file_count):
+        package_dir = os.path.join(root, "src", f"pkg{i // (files_per_dir * 10)}", f"mod{i // files_per_dir}")
+        os.makedirs(package_dir, exist_ok=True)
+        # Each module imports its predecessor, forming chains of files_per_dir.
+        imports = "import os\n" if i % files_per_dir == 0 else f"import os\nimport file{i - 1}\n"
+        with open(os.path.join(package_dir, f"file{i}.py"), "w") as f:
+            f.write(f"{imports}\n\ndef function_{i}(value):\n    return value * {i}\n")
+
+    for i in range(file_count // 100):
+        with open(os.path.join(root, "src", f"asset{i}.png"), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + b"\0" * 256)
+
+    node_modules = os.path.join(root, "node_modules", "dep")
+    os.makedirs(node_modules, exist_ok=True)
+    for i in range(file_count // 10):
+        with open(os.path.join(node_modules, f"index{i}.js"), "w") as f:
+            f.write("module.exports = {};\n")
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("node_modules/\n")
+
+    git = [
+        "git", "-C", root, "-c", "user.name=bench", "-c", "user.email=bench@example.com",
+        "-c", "gc.auto=0",
+    ]
+    subprocess.run(git + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "-A"], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "synthetic"], check=True)
+    subprocess.run(git + ["gc", "-q"], check=True)  # Packed, like a real clone.
+    return subprocess.run(
+        git + ["rev-parse", "HEAD"], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def legacy_collect(repo_path: str) -> dict:
+    """
+    The original RepoManager collector, without the total length cap.
+    """
+    contents = {}
+    for root, _, files in os.walk(repo_path):
+        if ".git" in root:
+            continue
+        for file in files:
+            full_file_path = os.path.join(root, file)
+            relative_file_path = os.path.relpath(full_file_path, repo_path)
+            if (
+                any(ext in file.lower() for ext in LEGACY_SKIPPED_EXTENSIONS)
+                or "node_modules" in relative_file_path
+                or "venv" in relative_file_path
+                or "__pycache__" in relative_file_path
+            ):
+                continue
+            with open(full_file_path, "r", encoding="utf-8", errors="ignore") as f:
+                contents[relative_file_path] = f.read()
+    return contents
+
+
+def engine_entries(repo_path: str, commit_sha: str) -> list:
+    with FileEnumerator(repo_path) as enumerator, enumerator.borrow_reader() as reader:
+        return enumerator.list_files(reader, commit_sha)
+
+
+def engine_collect(repo_path: str, commit_sha: str) -> dict:
+    """
+    FileEnumerator listing plus parallel blob reads, without any caching.
+    """
+    with FileEnumerator(repo_path) as enumerator:
+        with enumerator.borrow_reader() as reader:
+            entries = enumerator.list_files(reader, commit_sha)
+        blobs = enumerator.read_blobs(list(dict.fromkeys(entry.sha for entry in entries)))
+    return {
+        entry.path: blobs[entry.sha].decode("utf-8", errors="ignore")
+        for entry in entries
+        if not FileEnumerator.is_binary(blobs[entry.sha])
+    }
+
+
+def timed(label: str, func, *args) -> float:
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed:8.2f}s  ({len(result)} files)")
+    return elapsed
+
+
+def repo_manager_collect(
+    cache_dir: str, repo_path: str, commit_sha: str, changed_files: list[str], capped: bool
+) -> dict:
+    """
+    Collects through a new RepoManager, as a separate run of the tool would.
+    """
+    repo_manager = RepoManager(cache_dir=cache_dir)
+    if not capped:
+        repo_manager.MAX_TOTAL_CODE_CONTEXT_LENGTH = sys.maxsize
+        repo_manager.snapshot_cache.max_bytes = sys.maxsize
+    with contextlib.redirect_stdout(io.StringIO()):
+        return repo_manager._get_all_text_file_contents(repo_path, commit_sha, changed_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100000, help="Number of source files.")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic repository.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_enum_")
+    repo_path = os.path.join(workdir, "repo")
+    os.makedirs(repo_path)
+    try:
+        print(f"Building synthetic repository with {args.files} files in {repo_path}...")
+        commit_sha = build_synthetic_repo(repo_path, args.files)
+        changed_files = [
+            entry.path
+            for entry in engine_entries(repo_path, commit_sha)
+            if entry.path.endswith("9.py")
+        ][:5]
+
+        # Untimed passes, so no collector pays for filling the OS page cache.
+        legacy_collect(repo_path)
+        engine_collect(repo_path, commit_sha)
+
+        results = {}
+        results["legacy"] = timed("legacy os.walk collector", legacy_collect, repo_path)
+        results["engine"] = timed(
+            "FileEnumerator (no cache)", engine_collect, repo_path, commit_sha
+        )
+        for capped in (False, True):
+            cache_dir = os.path.join(workdir, "cache-capped" if capped else "cache")
+            caps = "default caps" if capped else "caps lifted"
+            for state in ("cold", "warm"):
+                results[(capped, state)] = timed(
+                    f"RepoManager ({caps}, {state} cache)",
+                    repo_manager_collect,
+                    cache_dir,
+                    repo_path,
+                    commit_sha,
+                    changed_files if capped else [],
+                    capped,
+                )
+
+        legacy = results["legacy"]
+        print("\nSpeedup vs legacy:")
+        print(f"  FileEnumerator (no cache):                {legacy / results['engine']:5.1f}x")
+        print(f"  RepoManager, whole tree, cold cache:      {legacy / results[(False, 'cold')]:5.1f}x")
+        print(f"  RepoManager, whole tree, warm cache:      {legacy / results[(False, 'warm')]:5.1f}x")
+        print(f"  RepoManager, default caps, cold cache:    {legacy / results[(True, 'cold')]:5.1f}x")
+        print(f"  RepoManager, default caps, warm cache:    {legacy / results[(True, 'warm')]:5.1f}x")
+    finally:
+        if args.keep:
+            print(f"Synthetic repository kept at {repo_path}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
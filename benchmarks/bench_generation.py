@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmarks release note generation offline against the deterministic FakeBackend.
+
+Builds a synthetic multi-file diff and measures end-to-end latency of single and
+map-reduce generation, and time to first chunk of streamed generation, with a
+model whose time to first token, prompt processing rate and output throughput
+are fixed. No API key or
+network access is needed, so results are reproducible across runs and machines.
+
+Usage (from the repository root):
+    python benchmarks/bench_generation.py --files 200 --latency 0.5 --tokens-per-second 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_backends import FakeBackend  # noqa: E402
+from release_note_generator import ReleaseNoteGenerator  # noqa: E402
+
+
+def build_synthetic_diff(file_count: int, lines_per_file: int) -> tuple[str, dict]:
+    """
+    Returns a unified diff touching `file_count` files and the matching codebase content.
+    """
+    diff_parts = []
+    codebase = {}
+    for i in range(file_count):
+        path = f"src/pkg{i // 50}/module{i}.py"
+        added = [f"+    value_{j} = compute_{i}({j})" for j in range(lines_per_file)]
+        diff_parts.append(
+            f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n"
+            f"@@ -1,2 +1,{lines_per_file + 2} @@\n def handler_{i}(request):\n"
+            + "\n".join(added)
+            + "\n     return request\n"
+        )
+        codebase[path] = f"def handler_{i}(request):\n    return request\n"
+    return "".join(diff_parts), codebase
+
+
+def timed(label: str, func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.2f}s")
+    return elapsed
+
+
+async def time_stream(generator: ReleaseNoteGenerator, *args) -> tuple[float, float]:
+    """
+    Returns (time to first chunk, total time) of a streamed generation.
+    """
+    start = time.perf_counter()
+    first_chunk = None
+    async for _ in generator.stream_release_notes(*args):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+    return first_chunk or 0.0, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="Number of files in the diff.")
+    parser.add_argument("--lines-per-file", type=int, default=40, help="Added lines per file.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake time to first token, in seconds.")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="Fake output throughput.")
+    parser.add_argument(
+        "--prompt-tokens-per-second", type=float, default=20000, help="Fake prompt processing rate."
+    )
+    parser.add_argument("--response-tokens", type=int, default=200, help="Fake response length.")
+    parser.add_argument("--map-concurrency", type=int, default=8, help="Concurrent map calls.")
+    args = parser.parse_args()
+
+    diff_text, codebase = build_synthetic_diff(args.files, args.lines_per_file)
+    jira_data = [
+        {"key": f"BENCH-{i}", "summary": f"Change {i}", "status": "Done", "type": "Story"}
+        for i in range(20)
+    ]
+    commit_sha = "0" * 40
+    backend = FakeBackend(
+        latency_seconds=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        prompt_tokens_per_second=args.prompt_tokens_per_second,
+    )
+    # No response cache, so every run pays for its model calls.
+    generator = ReleaseNoteGenerator(backend=backend)
+    print(
+        f"Diff: {len(diff_text)} characters in {args.files} files, "
+        f"{len(generator._split_diff(diff_text))} map-reduce chunks.\n"
+    )
+
+    single = timed(
+        "single prompt",
+        generator.generate_release_notes,
+        diff_text,
+        jira_data,
+        commit_sha,
+        codebase,
+    )
+    calls_before = backend.calls
+    map_reduce = timed(
+        f"map-reduce (concurrency {args.map_concurrency})",
+        generator.generate_release_notes_map_reduce,
+        diff_text,
+        jira_data,
+        commit_sha,
+        codebase,
+        "",
+        args.map_concurrency,
+    )
+    map_reduce_calls = backend.calls - calls_before
+    first_chunk, streamed = asyncio.run(
+        time_stream(generator, diff_text, jira_data, commit_sha, codebase)
+    )
+    print(f"{'streamed (total)':<40} {streamed:8.2f}s")
+    print(f"{'streamed (time to first chunk)':<40} {first_chunk:8.2f}s")
+
+    print(f"\nMap-reduce model calls: {map_reduce_calls}")
+    print(f"Map-reduce vs single:   {single / map_reduce:5.2f}x")
+    print(f"First chunk vs single:  {single / max(first_chunk, 1e-9):5.1f}x sooner")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Measures CLI import time and guards it against regressions.
+
+Imports each entry point in a fresh interpreter with `python -X importtime`,
+reports its cumulative import time and slowest dependencies, and fails if an
+entry point exceeds its budget or loads an SDK that should only be imported
+when it is used (the Gemini SDK, ADK, jira, pymsteams).
+
+Usage (from the repository root):
+    python benchmarks/bench_import_time.py --budget-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ("main", "batch_main", "agentic.main")
+# Loaded on first use only; importing an entry point must not pull these in.
+DEFERRED_MODULES = ("google.generativeai", "google.genai", "google.adk", "jira", "pymsteams")
+
+
+def import_times(module: str) -> list[tuple[str, int, int, int]]:
+    """
+    Imports `module` in a fresh interpreter and parses the -X importtime report.
+
+    Returns:
+        list[tuple[str, int, int, int]]: (module, nesting level, self µs, cumulative µs)
+                                         for every module imported, in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((name.strip(), level, int(self_us), int(cumulative_us)))
+    return times
+
+
+def subtree(times: list[tuple[str, int, int, int]], module: str) -> list[tuple[str, int, int, int]]:
+    """
+    Returns the modules imported on behalf of `module`, leaving out what the
+    interpreter imports at startup. Children are reported before their parent.
+    """
+    end = max(i for i, (name, level, _, _) in enumerate(times) if name == module and level == 0)
+    start = end
+    while start > 0 and times[start - 1][1] > 0:
+        start -= 1
+    return times[start:end]
+
+
+def deferred_package(name: str) -> str | None:
+    return next(
+        (module for module in DEFERRED_MODULES if name == module or name.startswith(module + ".")),
+        None,
+    )
+
+
+def measure(module: str, repeat: int) -> tuple[int, list[tuple[str, int, int, int]]]:
+    """
+    Returns the best cumulative import time of `module` over `repeat` runs, in µs,
+    and the modules it imported in that run.
+    """
+    best = None
+    for _ in range(repeat):
+        times = import_times(module)
+        total = next(cumulative for name, level, _, cumulative in reversed(times) if name == module and level == 0)
+        if best is None or total < best[0]:
+            best = (total, subtree(times, module))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Import time budget per entry point.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point; the fastest counts.")
+    parser.add_argument("--top", type=int, default=5, help="Slowest dependencies listed per entry point.")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Entry points to import.")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        try:
+            total, times = measure(module, args.repeat)
+        except RuntimeError as e:
+            print(f"{module:<14} skipped: {e}")
+            continue
+        print(f"{module:<14} {total / 1000:8.1f} ms")
+        dependencies = sorted(
+            (entry for entry in times if entry[1] == 1), key=lambda entry: entry[3], reverse=True
+        )
+        for name, _, _, cumulative in dependencies[: args.top]:
+            print(f"    {name:<30} {cumulative / 1000:8.1f} ms")
+        if total / 1000 > args.budget_ms:
+            failures.append(f"{module} took {total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        deferred = sorted({deferred_package(name) for name, _, _, _ in times} - {None})
+        if deferred:
+            failures.append(f"{module} imports {', '.join(deferred)} at load time")
+
+    if failures:
+        print("\nImport time regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"\nAll entry points import within {args.budget_ms:.0f} ms without deferred SDKs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import subprocess
+from typing import Iterator, NamedTuple
+
+
+class CommitRecord(NamedTuple):
+    """
+    A single commit from `git log`, with its per-file line counts.
+    `group` is the SHA of the first-parent (mainline) commit that brought this
+    commit into the range: the commit itself for mainline commits, or the merge
+    commit for commits that arrived on a merged branch. `committed` is the
+    committer date and `refs` the ref names decorating the commit (`%D`).
+    """
+
+    sha: str
+    parents: list[str]
+    author: str
+    date: str
+    subject: str
+    body: str
+    numstat: list[tuple[int, int, str]]
+    group: str
+    committed: str = ""
+    refs: str = ""
+
+    @property
+    def is_mainline(self) -> bool:
+        return self.group == self.sha
+
+    @property
+    def is_merge(self) -> bool:
+        return len(self.parents) > 1
+
+
+# Field and record separators that cannot appear in commit metadata.
+_FIELD_SEP = "\x1f"
+_RECORD_SEP = "\x1e"
+# The body comes last: it is the only field that may span several lines.
+_LOG_FIELDS = ["%H", "%P", "%an", "%aI", "%cI", "%D", "%s", "%b"]
+_LOG_FORMAT = _RECORD_SEP + _FIELD_SEP.join(_LOG_FIELDS) + _FIELD_SEP
+
+
+def iter_commits(
+    repo_path: str, from_ref: str, to_ref: str, paths: list[str] | None = None
+) -> Iterator[CommitRecord]:
+    """
+    Streams the commits in `from_ref..to_ref` from a single `git log` process,
+    newest first in topological order, so merged branches are listed right after
+    the merge commit that brought them in. Only one commit is held in memory at a
+    time, plus the frontier of not-yet-seen parents used for merge grouping.
+
+    Args:
+        repo_path (str): The local file system path to the Git repository.
+        from_ref (str): The exclusive start of the range (ref, tag or SHA).
+        to_ref (str): The inclusive end of the range (ref, tag or SHA).
+        paths (list[str] | None): Only list commits touching these path prefixes.
+                                  Such lookups use the commit-graph's changed-path
+                                  Bloom filters when the repository has them.
+
+    Yields:
+        CommitRecord: One record per commit in the range.
+    """
+    to_sha = subprocess.run(
+        ["git", "-C", repo_path, "rev-parse", "--verify", f"{to_ref}^{{commit}}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    command = [
+        "git",
+        "-C",
+        repo_path,
+        "log",
+        "--topo-order",
+        "--numstat",
+        "--no-renames",
+        f"--format={_LOG_FORMAT}",
+        f"{from_ref}..{to_sha}",
+    ]
+    if paths:
+        command += ["--", *paths]
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    # SHA -> owning mainline SHA, for parents that have not been seen yet.
+    pending_owner = {}
+    expected_mainline = to_sha
+    header = None
+    numstat = []
+
+    def finish() -> CommitRecord:
+        fields = header.split(_FIELD_SEP)
+        sha, parents = fields[0], fields[1].split()
+        nonlocal expected_mainline
+        if sha == expected_mainline:
+            group = sha
+            expected_mainline = parents[0] if parents else None
+            pending_owner.pop(sha, None)
+        else:
+            group = pending_owner.pop(sha, sha)
+        for index, parent in enumerate(parents):
+            if group == sha and index == 0:
+                continue  # The first parent continues the mainline.
+            pending_owner.setdefault(parent, group)
+        return CommitRecord(
+            sha=sha,
+            parents=parents,
+            author=fields[2],
+            date=fields[3],
+            subject=fields[6],
+            body=fields[7].strip(),
+            numstat=numstat,
+            group=group,
+            committed=fields[4],
+            refs=fields[5],
+        )
+
+    try:
+        for line in proc.stdout:
+            if line.startswith(_RECORD_SEP):
+                if header is not None:
+                    yield finish()
+                header, numstat = line[1:], []
+                # The body may span several lines; read until the closing separator.
+                while header.count(_FIELD_SEP) < len(_LOG_FIELDS):
+                    header += next(proc.stdout)
+                header = header.rstrip("\n")
+            elif line.strip() and header is not None:
+                added, deleted, path = line.rstrip("\n").split("\t", 2)
+                numstat.append(
+                    (
+                        int(added) if added.isdigit() else 0,
+                        int(deleted) if deleted.isdigit() else 0,
+                        path,
+                    )
+                )
+        if header is not None:
+            yield finish()
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        if proc.wait() != 0 and stderr:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr)
+
+
+def summarize_commits(
+    commits: Iterator[CommitRecord], max_listed: int = 300
+) -> tuple[str, int]:
+    """
+    Renders a commit log for the prompt, nesting merged-branch commits under the
+    merge that brought them in. At most `max_listed` commits are listed; the rest
+    are only counted, so memory and prompt size stay bounded as the range grows.
+
+    Args:
+        commits (Iterator[CommitRecord]): Commits as produced by iter_commits().
+        max_listed (int): Maximum number of commits to list individually.
+
+    Returns:
+        tuple[str, int]: The rendered log and the total number of commits seen.
+    """
+    lines = []
+    total = 0
+    omitted_files = 0
+    for commit in commits:
+        total += 1
+        if total > max_listed:
+            omitted_files += len(commit.numstat)
+            continue
+        added = sum(a for a, _, _ in commit.numstat)
+        deleted = sum(d for _, d, _ in commit.numstat)
+        indent = "" if commit.is_mainline else "    "
+        kind = " [merge]" if commit.is_merge else ""
+        lines.append(
+            f"{indent}- {commit.sha[:7]}{kind} {commit.subject} "
+            f"({len(commit.numstat)} files, +{added}/-{deleted}, {commit.author})"
+        )
+    if total > max_listed:
+        lines.append(
+            f"- ... and {total - max_listed} more commits touching {omitted_files} more files"
+        )
+    return "\n".join(lines), total
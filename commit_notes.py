@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import re
+
+from disk_cache import DiskCache
+
+# Categories of per-commit note items, in the order they are merged and listed.
+NOTE_CATEGORIES = ("features", "fixes", "improvements")
+
+# Jira issue keys such as PROJ-123.
+JIRA_KEY_RE = re.compile(r"\b[A-Z][A-Z0-9_]+-\d+\b")
+
+
+class CommitNotesCache:
+    """
+    Structured release-note items for individual commits, persisted on disk and
+    keyed by model, commit SHA and the rest of the commit's prompt (its ticket rows
+    and prompt version, passed as `context`). Notes are reused only for the same
+    input, so re-cutting a release, or cutting the next one, only generates notes
+    for commits that have not been seen before, while a commit first seen without
+    its Jira tickets is regenerated once they are available.
+    """
+
+    # Bump when the item format or the per-commit prompt changes.
+    NOTES_VERSION = "1"
+    MAX_COMMIT_NOTES_CACHE_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+    def __init__(self, cache_dir: str, mode: str = "use"):
+        """
+        Initializes the CommitNotesCache.
+
+        Args:
+            cache_dir (str): Directory where per-commit notes are stored.
+            mode (str): "use", "refresh" or "bypass", as for ResponseCache.
+        """
+        self.mode = mode
+        self.cache = DiskCache(cache_dir, self.MAX_COMMIT_NOTES_CACHE_BYTES)
+
+    def _key(self, model_name: str, commit_sha: str, context: str) -> str:
+        return hashlib.sha256(
+            f"commit-notes:{self.NOTES_VERSION}:{model_name}:{commit_sha}\0{context}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, model_name: str, commit_sha: str, context: str = "") -> dict | None:
+        """
+        Returns the stored notes of a commit, or None on a miss or when reads are disabled.
+
+        Args:
+            model_name (str): The model the notes were generated with.
+            commit_sha (str): The commit.
+            context (str): Everything else the notes were generated from (ticket rows,
+                           prompt version); notes generated from other input miss.
+        """
+        if self.mode != "use":
+            return None
+        data = self.cache.get(self._key(model_name, commit_sha, context))
+        return json.loads(data) if data is not None else None
+
+    def put(self, model_name: str, commit_sha: str, notes: dict, context: str = ""):
+        """
+        Stores the notes of a commit unless the cache is bypassed.
+        """
+        if self.mode == "bypass":
+            return
+        self.cache.put(
+            self._key(model_name, commit_sha, context), json.dumps(notes).encode("utf-8")
+        )
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+def parse_commit_notes(text: str, key_matcher: re.Pattern | None = None) -> dict:
+    """
+    Parses a model response into per-commit note items. JSON is expected (with or
+    without a code fence); a response that is not valid JSON is kept as plain
+    bullet points under "improvements" rather than lost.
+
+    Args:
+        text (str): The model response.
+        key_matcher (re.Pattern | None): Matcher of the valid ticket keys (see
+                                         jira_key_index.compile_key_matcher).
+                                         Defaults to the generic JIRA_KEY_RE.
+
+    Returns:
+        dict: Each of NOTE_CATEGORIES mapped to a list of {"text", "tickets"} items.
+    """
+    key_matcher = key_matcher or JIRA_KEY_RE
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        data = json.loads(cleaned)
+    except ValueError:
+        data = None
+
+    notes = {category: [] for category in NOTE_CATEGORIES}
+    if not isinstance(data, dict):
+        for line in text.splitlines():
+            line = line.strip().lstrip("-*").strip()
+            if line and not line.startswith(("#", "```")):
+                notes["improvements"].append(
+                    {"text": line, "tickets": sorted({match.group().upper() for match in key_matcher.finditer(line)})}
+                )
+        return notes
+
+    for category in NOTE_CATEGORIES:
+        for item in data.get(category) or []:
+            if isinstance(item, str):
+                item = {"text": item}
+            if not isinstance(item, dict) or not str(item.get("text", "")).strip():
+                continue
+            tickets = [
+                str(key).upper() for key in item.get("tickets") or [] if key_matcher.fullmatch(str(key))
+            ]
+            notes[category].append({"text": str(item["text"]).strip(), "tickets": tickets})
+    return notes
+
+
+def merge_commit_notes(commit_notes: list[tuple[str, dict]]) -> dict:
+    """
+    Merges per-commit items into release-level items. Items that reference the
+    same Jira issue become one item (a feature and its follow-up fixes), wherever
+    they came from; items without issues are deduplicated by their text.
+
+    Args:
+        commit_notes (list[tuple[str, dict]]): (commit SHA, notes) pairs, oldest first.
+
+    Returns:
+        dict: Each of NOTE_CATEGORIES mapped to merged items with "text", "details"
+              (further distinct texts), "tickets" and "commits". An item is filed
+              under the category where it first appeared.
+    """
+    merged = {category: [] for category in NOTE_CATEGORIES}
+    by_ticket = {}
+    by_text = {}
+    for commit_sha, notes in commit_notes:
+        for category in NOTE_CATEGORIES:
+            for item in notes.get(category, []):
+                text_key = " ".join(item["text"].lower().split())
+                target = next(
+                    (by_ticket[key] for key in item["tickets"] if key in by_ticket),
+                    by_text.get(text_key) if not item["tickets"] else None,
+                )
+                if target is None:
+                    target = {"text": item["text"], "details": [], "tickets": [], "commits": []}
+                    merged[category].append(target)
+                elif item["text"] != target["text"] and item["text"] not in target["details"]:
+                    target["details"].append(item["text"])
+                for key in item["tickets"]:
+                    if key not in target["tickets"]:
+                        target["tickets"].append(key)
+                    by_ticket[key] = target
+                if commit_sha[:7] not in target["commits"]:
+                    target["commits"].append(commit_sha[:7])
+                by_text.setdefault(text_key, target)
+    return merged
+
+
+def render_merged_notes(merged: dict) -> str:
+    """
+    Renders merged items compactly, one line per item, for the polish prompt.
+    """
+    lines = []
+    for category in NOTE_CATEGORIES:
+        if not merged[category]:
+            continue
+        lines.append(f"[{category}]")
+        for item in merged[category]:
+            refs = ", ".join(item["tickets"] + item["commits"])
+            details = f" | also: {'; '.join(item['details'])}" if item["details"] else ""
+            lines.append(f"- {item['text']} ({refs}){details}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Example usage (for testing this module independently)
+    first = parse_commit_notes(
+        '{"features": [{"text": "Add CSV export", "tickets": ["PROJ-1"]}], '
+        '"fixes": [], "improvements": [{"text": "Update dependencies", "tickets": []}]}'
+    )
+    second = parse_commit_notes(
+        '```json\n{"fixes": [{"text": "Fix CSV export encoding", "tickets": ["PROJ-1"]}], '
+        '"improvements": [{"text": "Update dependencies"}]}\n```'
+    )
+    print(render_merged_notes(merge_commit_notes([("a" * 40, first), ("b" * 40, second)])))
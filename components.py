@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import subprocess
+from typing import NamedTuple
+
+
+class Component(NamedTuple):
+    """
+    A monorepo component: a set of path prefixes owned by one Jira component.
+    """
+
+    name: str
+    paths: tuple[str, ...]
+    jira_component: str
+
+    def owns(self, path: str) -> bool:
+        return any(
+            path == prefix.rstrip("/") or path.startswith(prefix.rstrip("/") + "/")
+            for prefix in self.paths
+        )
+
+
+def load_components(components_path: str) -> list[Component]:
+    """
+    Loads component definitions from a JSON file of the form
+    {"components": [{"name": "billing", "paths": ["services/billing/"], "jira_component": "Billing"}]}.
+    "jira_component" defaults to the component name.
+
+    Args:
+        components_path (str): Path to the JSON file.
+
+    Returns:
+        list[Component]: The component definitions, in file order.
+    """
+    with open(components_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    components = []
+    seen = set()
+    for item in data["components"] if isinstance(data, dict) else data:
+        name = item.get("name")
+        paths = item.get("paths") or []
+        if not name or not paths:
+            raise ValueError(f"Component definition {item} needs a name and at least one path.")
+        if name in seen:
+            raise ValueError(f"Duplicate component name '{name}'.")
+        seen.add(name)
+        components.append(
+            Component(
+                name=name,
+                paths=tuple(path[2:] if path.startswith("./") else path for path in paths),
+                jira_component=item.get("jira_component") or name,
+            )
+        )
+    return components
+
+
+# Commit-graph chunks that hold the changed-path Bloom filters.
+BLOOM_CHUNK_IDS = (b"BIDX", b"BDAT")
+
+
+def _graph_has_bloom_filters(path: str) -> bool:
+    """
+    Reads the chunk table of a commit-graph file and reports whether it carries
+    Bloom filter chunks. `git gc` and `fetch.writeCommitGraph` write graphs
+    without them, so a graph's mere existence says nothing about Bloom filters.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(8)
+            if len(header) != 8 or header[:4] != b"CGPH":
+                return False
+            # Table of contents: one 12-byte (ID, offset) entry per chunk plus a terminator.
+            table = f.read(12 * (header[6] + 1))
+    except OSError:
+        return False
+    chunk_ids = {table[i : i + 4] for i in range(0, len(table), 12)}
+    return all(chunk_id in chunk_ids for chunk_id in BLOOM_CHUNK_IDS)
+
+
+def _has_bloom_filters(info_dir: str) -> bool:
+    """
+    Whether the commit-graph in `info_dir` (a single file or a split chain) has
+    Bloom filters in every layer.
+    """
+    single = os.path.join(info_dir, "commit-graph")
+    if os.path.isfile(single):
+        return _graph_has_bloom_filters(single)
+    chain_dir = os.path.join(info_dir, "commit-graphs")
+    try:
+        with open(os.path.join(chain_dir, "commit-graph-chain")) as f:
+            layers = f.read().split()
+    except OSError:
+        return False
+    return bool(layers) and all(
+        _graph_has_bloom_filters(os.path.join(chain_dir, f"graph-{layer}.graph")) for layer in layers
+    )
+
+
+def check_commit_graph(repo_path: str, write: bool = False) -> bool:
+    """
+    Reports whether the repository has a commit-graph with changed-path Bloom
+    filters. With them, path-scoped `git log` calls skip most commits without
+    opening their trees, which keeps one history lookup per component cheap even
+    on large monorepos. The repository is only read: a missing graph is reported
+    with a hint, and written only when `write` is set (the user opted in).
+
+    Args:
+        repo_path (str): The local file system path to the Git repository.
+        write (bool): Write the commit-graph if it is missing or lacks Bloom filters.
+
+    Returns:
+        bool: True if Bloom filters are available for path-scoped lookups.
+    """
+    # Ask git for the object directory: `.git` is a file in worktrees, and bare
+    # repositories have none.
+    result = subprocess.run(
+        ["git", "-C", repo_path, "rev-parse", "--git-path", "objects/info"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(f"Warning: Could not locate the object directory of {repo_path}: {result.stderr.strip()}")
+        return False
+    info_dir = os.path.join(repo_path, result.stdout.strip())
+    if _has_bloom_filters(info_dir):
+        return True
+
+    command = ["git", "-C", repo_path, "commit-graph", "write", "--reachable", "--changed-paths"]
+    if os.path.isdir(os.path.join(info_dir, "commit-graphs")):
+        # Collapse an existing split chain, so no layer is left without filters.
+        command.append("--split=replace")
+    if not write:
+        print(
+            f"Hint: {repo_path} has no commit-graph with changed-path Bloom filters, so "
+            f"per-component history lookups are slower. Write one with "
+            f"`git {' '.join(command[3:])}` in the repository, or pass --write-commit-graph."
+        )
+        return False
+
+    print("Writing commit-graph with changed-path Bloom filters...")
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0 or not _has_bloom_filters(info_dir):
+        error = result.stderr.strip() or "no Bloom filters were written"
+        print(f"Warning: Could not write commit-graph, path-scoped lookups will be slower: {error}")
+        return False
+    return True
+
+
+def changed_components(
+    repo_path: str, from_ref: str | None, to_ref: str, components: list[Component]
+) -> list[Component]:
+    """
+    Returns the components with at least one commit in `from_ref..to_ref`, using a
+    path-scoped `git log -1` per component (answered from Bloom filters when present).
+
+    Args:
+        repo_path (str): The local file system path to the Git repository.
+        from_ref (str | None): The exclusive start of the range, or None when
+                               `to_ref` is a root commit.
+        to_ref (str): The inclusive end of the range.
+        components (list[Component]): The component definitions.
+
+    Returns:
+        list[Component]: The changed components, in definition order.
+    """
+    revision_range = f"{from_ref}..{to_ref}" if from_ref else to_ref
+    changed = []
+    for component in components:
+        result = subprocess.run(
+            ["git", "-C", repo_path, "log", "-1", "--format=%H", revision_range, "--", *component.paths],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        if result.stdout.strip():
+            changed.append(component)
+    return changed
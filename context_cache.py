@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import AsyncIterator
+
+from llm_backends import LlmBackend
+
+
+class ContextCacheBackend:
+    """
+    Base class for services that hold a prompt prefix server-side, so later calls
+    only send (and pay full price for) the variable suffix. Each one wraps the
+    LlmBackend the prompt is generated with.
+    """
+
+    name = "base"
+    # Whether handles outlive the process, so the handle index is kept on disk.
+    persistent = True
+
+    def __init__(self, backend: LlmBackend):
+        """
+        Args:
+            backend (LlmBackend): The backend that generates from cached prefixes.
+        """
+        self.backend = backend
+
+    def create(self, model_name: str, content: str, ttl_seconds: int) -> str:
+        """
+        Stores `content` as a cached prefix and returns its handle name.
+        """
+        raise NotImplementedError
+
+    def delete(self, handle: str):
+        """
+        Releases a cached prefix. Must not fail if it has already expired.
+        """
+        raise NotImplementedError
+
+    def generate(self, handle: str, model_name: str, suffix: str, generation_config: dict) -> str:
+        """
+        Generates a response for the cached prefix followed by `suffix`.
+        """
+        raise NotImplementedError
+
+    def stream(
+        self, handle: str, model_name: str, suffix: str, generation_config: dict
+    ) -> AsyncIterator[str]:
+        """
+        Streams the response for the cached prefix followed by `suffix` in text chunks.
+        """
+        raise NotImplementedError
+
+
+class GeminiContextCacheBackend(ContextCacheBackend):
+    """
+    Explicit context caching with the Gemini API (`genai.caching.CachedContent`),
+    for a GeminiBackend (which has configured the SDK).
+    """
+
+    name = "gemini"
+
+    def create(self, model_name: str, content: str, ttl_seconds: int) -> str:
+        from google.generativeai import caching
+
+        cached_content = caching.CachedContent.create(
+            model=f"models/{model_name}",
+            display_name="release-notes-codebase",
+            contents=[content],
+            ttl=datetime.timedelta(seconds=ttl_seconds),
+        )
+        return cached_content.name
+
+    def delete(self, handle: str):
+        from google.generativeai import caching
+
+        try:
+            caching.CachedContent.get(handle).delete()
+        except Exception:
+            pass
+
+    def generate(self, handle: str, model_name: str, suffix: str, generation_config: dict) -> str:
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        model = genai.GenerativeModel.from_cached_content(
+            caching.CachedContent.get(handle), generation_config=generation_config
+        )
+        return model.generate_content(suffix).text
+
+    async def stream(
+        self, handle: str, model_name: str, suffix: str, generation_config: dict
+    ) -> AsyncIterator[str]:
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        model = genai.GenerativeModel.from_cached_content(
+            caching.CachedContent.get(handle), generation_config=generation_config
+        )
+        response = await model.generate_content_async(suffix, stream=True)
+        async for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+
+
+class LocalContextCacheBackend(ContextCacheBackend):
+    """
+    In-process context caching for backends without an explicit caching API (the
+    OpenAI-compatible and fake backends). Prefixes are kept in memory and sent in
+    front of each suffix, so every call shares a byte-identical prefix that
+    services with automatic prefix caching can match.
+    """
+
+    name = "local"
+    persistent = False
+
+    def __init__(self, backend: LlmBackend):
+        super().__init__(backend)
+        self.contents = {}
+        self.created = 0
+
+    def create(self, model_name: str, content: str, ttl_seconds: int) -> str:
+        self.created += 1
+        handle = f"cachedContents/local-{self.created}"
+        self.contents[handle] = content
+        return handle
+
+    def delete(self, handle: str):
+        self.contents.pop(handle, None)
+
+    def generate(self, handle: str, model_name: str, suffix: str, generation_config: dict) -> str:
+        return self.backend.generate(self.contents[handle] + suffix, generation_config)
+
+    async def stream(
+        self, handle: str, model_name: str, suffix: str, generation_config: dict
+    ) -> AsyncIterator[str]:
+        async for chunk in self.backend.stream(self.contents[handle] + suffix, generation_config):
+            yield chunk
+
+
+def create_context_cache_backend(backend: LlmBackend) -> ContextCacheBackend:
+    """
+    Picks the context-caching service for a backend: Gemini's explicit caching for
+    the gemini backend, in-process prefixes for every other one.
+
+    Args:
+        backend (LlmBackend): The backend, as returned by llm_backends.create_backend.
+
+    Returns:
+        ContextCacheBackend: The context-caching service wrapping `backend`.
+    """
+    if backend.name == GeminiContextCacheBackend.name:
+        return GeminiContextCacheBackend(backend)
+    return LocalContextCacheBackend(backend)
+
+
+class ContextCache:
+    """
+    Creates, reuses and expires cached-content handles for stable prompt prefixes.
+    Handles are indexed by a hash of the model name and prefix, on disk for
+    persistent backends, so separate runs over an unchanged codebase reuse the
+    same handle until it expires.
+    A handle is only created the second time a prefix is seen: a prefix that is
+    never sent again (e.g. a context packed around one diff) would only pay for
+    storage.
+    """
+
+    # Prefixes below this size are sent inline; the Gemini API rejects cached
+    # contents under 32,768 tokens (about 4 characters per token).
+    MIN_PREFIX_CHARS = 32768 * 4
+    DEFAULT_TTL_SECONDS = 3600
+    # A handle this close to expiry is replaced rather than reused mid-request.
+    EXPIRY_MARGIN_SECONDS = 60
+    # How long a prefix seen once is remembered while waiting to be seen again.
+    SEEN_TTL_SECONDS = 7 * 24 * 3600
+
+    def __init__(
+        self,
+        backend: ContextCacheBackend,
+        cache_dir: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initializes the ContextCache.
+
+        Args:
+            backend (ContextCacheBackend): The service holding the cached prefixes.
+            cache_dir (str): Directory for the handle index.
+            ttl_seconds (int): Lifetime of newly created handles.
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.index_path = os.path.join(cache_dir, f"context_cache_{backend.name}.json")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Handles of a non-persistent backend die with the process, so its index
+        # is never written to disk.
+        self._memory_index = {}
+
+    def _load_index(self) -> dict:
+        if not self.backend.persistent:
+            return dict(self._memory_index)
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index: dict):
+        if not self.backend.persistent:
+            self._memory_index = index
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.index_path), prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: Could not write context cache index: {e}")
+
+    def get_or_create(self, model_name: str, prefix: str) -> str | None:
+        """
+        Returns a live handle for the prefix, creating one if the prefix has been
+        seen before. Expired handles are dropped from the index (and released)
+        along the way.
+
+        Args:
+            model_name (str): The model the prefix will be used with.
+            prefix (str): The stable prompt prefix.
+
+        Returns:
+            str | None: The handle name, or None if the prefix is too small to cache,
+                        is seen for the first time, or the backend could not create
+                        a handle.
+        """
+        if len(prefix) < self.MIN_PREFIX_CHARS:
+            return None
+        key = hashlib.sha256(f"{model_name}\0{prefix}".encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            index = self._load_index()
+            for stale_key, entry in list(index.items()):
+                if entry["expires_at"] - self.EXPIRY_MARGIN_SECONDS <= now:
+                    if entry["handle"]:
+                        self.backend.delete(entry["handle"])
+                    del index[stale_key]
+
+            if key not in index:
+                # First sighting: remember the prefix (without a handle) and send it inline.
+                index[key] = {"handle": None, "expires_at": now + self.SEEN_TTL_SECONDS}
+                self._save_index(index)
+                return None
+            if index[key]["handle"]:
+                self.hits += 1
+                self._save_index(index)
+                return index[key]["handle"]
+
+            self.misses += 1
+            try:
+                handle = self.backend.create(model_name, prefix, self.ttl_seconds)
+            except Exception as e:
+                print(f"Warning: Could not create cached content, sending the prompt inline: {e}")
+                self._save_index(index)
+                return None
+            index[key] = {"handle": handle, "expires_at": now + self.ttl_seconds}
+            self._save_index(index)
+            print(f"Created cached content {handle} for {len(prefix)} prefix characters.")
+            return handle
+
+    def invalidate(self, handle: str):
+        """
+        Forgets a handle that the service no longer recognizes.
+        """
+        with self._lock:
+            index = self._load_index()
+            for key, entry in list(index.items()):
+                if entry["handle"] == handle:
+                    del index[key]
+            self._save_index(index)
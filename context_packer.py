@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+
+import ast
+import hashlib
+import json
+import os
+import re
+from typing import Callable
+
+from disk_cache import DiskCache
+from git_object_reader import TreeEntry
+
+
+class ImportResolver:
+    """
+    Base class for language-specific import resolvers.
+    A resolver extracts raw import specs from a file's content (cached per blob, so
+    it must only depend on the content) and resolves those specs to repository
+    paths (which may depend on the importing file's location).
+    Subclass this and pass an instance to DependencyGraph to support another language.
+    """
+
+    name = "base"
+    extensions: tuple[str, ...] = ()
+
+    def handles(self, path: str) -> bool:
+        return path.lower().endswith(self.extensions)
+
+    def extract_imports(self, content: str) -> list:
+        """
+        Returns JSON-serializable import specs found in a file's content.
+        """
+        raise NotImplementedError
+
+    def resolve(self, path: str, specs: list, all_paths: set[str]) -> set[str]:
+        """
+        Resolves import specs of the file at `path` to paths in `all_paths`.
+        """
+        raise NotImplementedError
+
+
+class PythonImportResolver(ImportResolver):
+    """
+    Resolves `import x.y` and `from .x import y` statements using `ast`.
+    Modules are matched by dotted path suffix, so both flat and src/ layouts work.
+    """
+
+    name = "python"
+    extensions = (".py",)
+
+    def __init__(self):
+        self._index_for = None
+        self._module_index = {}
+
+    def extract_imports(self, content: str) -> list:
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return []
+
+        specs = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    specs.append([0, alias.name, []])
+            elif isinstance(node, ast.ImportFrom):
+                specs.append(
+                    [node.level, node.module or "", [alias.name for alias in node.names]]
+                )
+        return specs
+
+    @staticmethod
+    def _module_parts(path: str) -> list[str]:
+        parts = path[: -len(".py")].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        return parts
+
+    def _build_index(self, all_paths: set[str]):
+        if self._index_for is all_paths:
+            return
+        self._module_index = {}
+        for path in sorted(all_paths):
+            if not self.handles(path):
+                continue
+            parts = self._module_parts(path)
+            for i in range(len(parts)):
+                self._module_index.setdefault(".".join(parts[i:]), []).append(path)
+        self._index_for = all_paths
+
+    def _lookup(self, module: str) -> str | None:
+        candidates = self._module_index.get(module)
+        if not candidates:
+            return None
+        return min(candidates, key=len)
+
+    def resolve(self, path: str, specs: list, all_paths: set[str]) -> set[str]:
+        self._build_index(all_paths)
+        package_parts = self._module_parts(path)
+        if not path.endswith("__init__.py"):
+            package_parts = package_parts[:-1]
+
+        resolved = set()
+        for level, module, names in specs:
+            if level:
+                base = package_parts[: len(package_parts) - (level - 1)]
+                module = ".".join(base + ([module] if module else []))
+            candidates = [f"{module}.{name}" for name in names if name != "*"]
+            candidates.append(module)
+            for candidate in candidates:
+                target = candidate and self._lookup(candidate)
+                if target and target != path:
+                    resolved.add(target)
+        return resolved
+
+
+class RelativeImportResolver(ImportResolver):
+    """
+    Resolves relative ES module imports and CommonJS requires (`./x`, `../y`).
+    Bare package imports are external dependencies and are ignored.
+    """
+
+    name = "js-relative"
+    extensions = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+    IMPORT_RE = re.compile(
+        r"""(?:from\s*|require\(\s*|import\(\s*|import\s+)['"](\.{1,2}/[^'"]+)['"]"""
+    )
+    SUFFIXES = ("", ".ts", ".tsx", ".js", ".jsx", ".mjs", "/index.ts", "/index.js")
+
+    def extract_imports(self, content: str) -> list:
+        return sorted(set(self.IMPORT_RE.findall(content)))
+
+    def resolve(self, path: str, specs: list, all_paths: set[str]) -> set[str]:
+        resolved = set()
+        for spec in specs:
+            base = os.path.normpath(os.path.join(os.path.dirname(path), spec))
+            for suffix in self.SUFFIXES:
+                if base + suffix in all_paths:
+                    resolved.add(base + suffix)
+                    break
+        return resolved
+
+
+class DependencyGraph:
+    """
+    A file-level import graph of a commit's tree, explored on demand.
+    Only files reachable from the changed files through their imports are parsed,
+    one BFS level at a time, and exploration stops as soon as the files reached
+    fill the caller's budget, so a large tree costs a few parses rather than one
+    per file. Raw imports are cached per blob SHA, so a file is parsed once however
+    many commits or components share it.
+    """
+
+    MAX_GRAPH_CACHE_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+    def __init__(self, cache_dir: str, resolvers: list[ImportResolver] | None = None):
+        """
+        Initializes the DependencyGraph.
+
+        Args:
+            cache_dir (str): Directory for the import cache.
+            resolvers (list[ImportResolver] | None): Language resolvers to use.
+                                                     Defaults to Python and relative JS/TS.
+        """
+        self.resolvers = resolvers or [PythonImportResolver(), RelativeImportResolver()]
+        self.cache = DiskCache(cache_dir, self.MAX_GRAPH_CACHE_BYTES)
+        self.entries = {}
+        self.imports = {}  # path -> imported paths, for the files explored so far
+        self._all_paths = set()
+        self._read_blobs = None
+
+    @staticmethod
+    def _key(*parts: str) -> str:
+        return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+    def _resolver_for(self, path: str) -> ImportResolver | None:
+        for resolver in self.resolvers:
+            if resolver.handles(path):
+                return resolver
+        return None
+
+    def load_tree(
+        self,
+        entries: list[TreeEntry],
+        read_blobs: Callable[[list[str]], dict[str, bytes]],
+    ):
+        """
+        Sets the files of the commit to explore. Nothing is read or parsed until
+        distances() needs it.
+
+        Args:
+            entries (list[TreeEntry]): The files in the commit's tree.
+            read_blobs (Callable): Returns blob contents for a list of SHAs.
+        """
+        self.entries = {entry.path: entry for entry in entries}
+        self.imports = {}
+        self._all_paths = set(self.entries)
+        self._read_blobs = read_blobs
+
+    def _explore(self, paths: list[str]) -> tuple[int, int]:
+        """
+        Resolves the imports of the given files, from the cache or by parsing them
+        in one batch.
+
+        Returns:
+            tuple[int, int]: The number of files parsed and loaded from the cache.
+        """
+        keys = {}
+        for path in paths:
+            if path in self.imports:
+                continue
+            resolver = self._resolver_for(path)
+            if resolver is None:
+                self.imports[path] = set()
+                continue
+            keys[path] = (resolver, self._key("imports", resolver.name, self.entries[path].sha))
+        cached = self.cache.get_many(key for _, key in keys.values())
+
+        specs_by_path = {}
+        to_parse = []
+        for path, (_, key) in keys.items():
+            if key in cached:
+                specs_by_path[path] = json.loads(cached[key])
+            else:
+                to_parse.append(path)
+        if to_parse:
+            blobs = self._read_blobs(
+                list(dict.fromkeys(self.entries[path].sha for path in to_parse))
+            )
+            parsed = {}
+            for path in to_parse:
+                resolver, key = keys[path]
+                data = blobs.get(self.entries[path].sha)
+                if data is None:
+                    specs_by_path[path] = []
+                    continue
+                if key not in parsed:
+                    parsed[key] = resolver.extract_imports(data.decode("utf-8", errors="ignore"))
+                specs_by_path[path] = parsed[key]
+            self.cache.put_many(
+                (key, json.dumps(specs).encode()) for key, specs in parsed.items()
+            )
+
+        for path, specs in specs_by_path.items():
+            resolver = keys[path][0]
+            self.imports[path] = resolver.resolve(path, specs, self._all_paths)
+        return len(to_parse), len(specs_by_path) - len(to_parse)
+
+    def distances(
+        self,
+        changed_paths: set[str],
+        lengths: dict[str, int] | None = None,
+        budget: int | None = None,
+    ) -> dict[str, int]:
+        """
+        Returns the import distance from the changed files of every file reached by
+        following imports outward, level by level.
+
+        Args:
+            changed_paths (set[str]): Paths touched by the diff (distance 0).
+            lengths (dict[str, int] | None): Rendered length by path, to measure the budget.
+            budget (int | None): Stop exploring once the files reached add up to
+                                 this many characters. None explores everything reachable.
+
+        Returns:
+            dict[str, int]: Distance by path. Files not reached are omitted.
+        """
+        lengths = lengths or {}
+        distance = {path: 0 for path in changed_paths}
+        frontier = sorted(path for path in changed_paths if path in self.entries)
+        filled = sum(lengths.get(path, 0) for path in frontier)
+        parsed = cached = 0
+        level = 0
+        while frontier and (budget is None or filled < budget):
+            level_parsed, level_cached = self._explore(frontier)
+            parsed += level_parsed
+            cached += level_cached
+            level += 1
+            next_frontier = []
+            for path in frontier:
+                for target in sorted(self.imports[path]):
+                    if target not in distance:
+                        distance[target] = level
+                        next_frontier.append(target)
+                        filled += lengths.get(target, 0)
+            frontier = next_frontier
+        if parsed or cached:
+            print(
+                f"Dependency graph: reached {len(distance)} files in {level} levels, "
+                f"parsed {parsed} files, reused cached imports for {cached}."
+            )
+        return distance
+
+
+class PackedContext(dict):
+    """
+    File paths mapped to their content, most relevant first. `ranked` is set when
+    the selection depends on the diff (files were ranked out, truncated or outlined
+    to fit the budget), so the content must not be cached as a prompt prefix.
+    """
+
+    def __init__(self, *args, ranked: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ranked = ranked
+
+
+class ContextPacker:
+    """
+    Selects which files go into the codebase context: files touched by the diff
+    first, then their imports and importers by increasing graph distance, then
+    everything else, packed greedily into the character budget.
+    """
+
+    def __init__(self, graph: DependencyGraph):
+        self.graph = graph
+
+    def rank(
+        self,
+        entries: list[TreeEntry],
+        changed_paths: set[str],
+        lengths: dict[str, int] | None = None,
+        budget: int | None = None,
+    ) -> list[TreeEntry]:
+        """
+        Orders entries by graph distance from the changed files. Ties keep tree order.
+        With a budget, files beyond the point where the budget is filled are left
+        unexplored and ranked last.
+        """
+        distance = self.graph.distances(changed_paths, lengths, budget)
+        unreachable = float("inf")
+        return sorted(entries, key=lambda entry: distance.get(entry.path, unreachable))
+
+    def pack(
+        self,
+        entries: list[TreeEntry],
+        lengths: dict[str, int],
+        changed_paths: set[str],
+        budget: int,
+    ) -> list[TreeEntry]:
+        """
+        Greedily fills the budget from the ranking. Files that do not fit are skipped
+        in favour of smaller lower-ranked ones, except changed files, which are kept
+        (and later truncated) even when they exceed the remaining budget.
+        When all entries fit, they are returned in tree order without consulting
+        the graph at all.
+
+        Args:
+            entries (list[TreeEntry]): Candidate files.
+            lengths (dict[str, int]): Rendered length (or blob size, as an upper bound) by path.
+            changed_paths (set[str]): Paths touched by the diff.
+            budget (int): Total character budget.
+
+        Returns:
+            list[TreeEntry]: The selected files, in rank order.
+        """
+        if sum(lengths.get(entry.path, 0) for entry in entries) <= budget:
+            return list(entries)
+
+        selected = []
+        remaining = budget
+        for entry in self.rank(entries, changed_paths, lengths, budget):
+            if remaining <= 0:
+                break
+            size = lengths.get(entry.path, 0)
+            if size <= remaining or entry.path in changed_paths:
+                selected.append(entry)
+                remaining -= size
+        return selected
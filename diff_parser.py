@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+import subprocess
+from typing import Iterator
+
+from file_enumerator import FileEnumerator
+
+# The well-known SHA of git's empty tree, for diffing a root commit.
+EMPTY_TREE_SHA = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+class Hunk:
+    """
+    A single `@@ ... @@` hunk of a file diff.
+    """
+
+    def __init__(self, header: str):
+        self.header = header
+        self.lines = []
+
+
+class FileDiff:
+    """
+    The diff of a single file. When a file is excluded or exceeds its cap, its
+    hunks are dropped and only the +/- line counts are kept, like `--numstat`.
+    """
+
+    def __init__(self, git_header: str):
+        self.git_header = git_header
+        self.path = ""
+        self.meta_lines = []  # index, mode, rename and ---/+++ lines
+        self.hunks = []
+        self.added = 0
+        self.deleted = 0
+        self.is_binary = False
+        self.summary_reason = ""
+        self._length = len(git_header)
+
+    @property
+    def summarized(self) -> bool:
+        return bool(self.summary_reason)
+
+    def summarize(self, reason: str):
+        """
+        Drops the hunk bodies, keeping only the line counts.
+        """
+        if not self.summary_reason:
+            self.summary_reason = reason
+            self.hunks = []
+
+    def render(self) -> str:
+        """
+        Renders the file back to unified diff text, or to a numstat-style summary.
+        """
+        if self.summarized:
+            counts = "-\t-" if self.is_binary else f"{self.added}\t{self.deleted}"
+            return f"{self.git_header}\n# {counts}\t{self.path} ({self.summary_reason}; hunks omitted)\n"
+        parts = [self.git_header, *self.meta_lines]
+        for hunk in self.hunks:
+            parts.append(hunk.header)
+            parts.extend(hunk.lines)
+        return "\n".join(parts) + "\n"
+
+
+class DiffRules:
+    """
+    Exclusion rules applied while parsing a diff.
+    Files matching an exclusion glob, containing a generated-file marker, or larger
+    than the per-file cap are replaced by a numstat-style summary.
+    """
+
+    DEFAULT_EXCLUDE_PATTERNS = [
+        # Lockfiles
+        "package-lock.json",
+        "npm-shrinkwrap.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "poetry.lock",
+        "Pipfile.lock",
+        "uv.lock",
+        "Cargo.lock",
+        "Gemfile.lock",
+        "composer.lock",
+        "go.sum",
+        # Minified bundles and source maps
+        "*.min.js",
+        "*.min.css",
+        "*.map",
+        "dist/",
+        # Generated protobuf/gRPC code
+        "*_pb2.py",
+        "*_pb2_grpc.py",
+        "*.pb.go",
+        "*.pb.ts",
+        "*_pb.js",
+        # Snapshot fixtures
+        "__snapshots__/",
+        "*.snap",
+    ]
+    GENERATED_MARKERS = [
+        "@generated",
+        "DO NOT EDIT",
+        "Code generated by",
+        "autogenerated",
+        "auto-generated",
+    ]
+    # Only the first lines of a file's diff are checked for generated markers.
+    MARKER_SCAN_LINES = 20
+
+    def __init__(
+        self,
+        exclude_patterns: list[str] | None = None,
+        max_file_chars: int = 20000,
+        max_total_chars: int = 200000,
+    ):
+        """
+        Initializes the DiffRules.
+
+        Args:
+            exclude_patterns (list[str] | None): Glob patterns of files to summarize.
+                                                 Defaults to DEFAULT_EXCLUDE_PATTERNS.
+            max_file_chars (int): Files with a larger diff are summarized.
+            max_total_chars (int): Once the rendered diff reaches this size, the
+                                   remaining files are summarized.
+        """
+        self.exclude_re = FileEnumerator.compile_patterns(
+            self.DEFAULT_EXCLUDE_PATTERNS if exclude_patterns is None else exclude_patterns
+        )
+        self.max_file_chars = max_file_chars
+        self.max_total_chars = max_total_chars
+
+    def is_excluded(self, path: str) -> bool:
+        return bool(self.exclude_re and self.exclude_re.search(path))
+
+    def has_generated_marker(self, line: str) -> bool:
+        return any(marker in line for marker in self.GENERATED_MARKERS)
+
+
+def _strip_prefix(path: str) -> str:
+    # git appends a tab to ---/+++ paths containing spaces, and quotes unusual ones.
+    path = path.rstrip("\t")
+    if len(path) > 1 and path[0] == path[-1] == '"':
+        path = path[1:-1]
+    return path[2:] if path[:2] in ("a/", "b/") else path
+
+
+def iter_file_diffs(
+    repo_path: str,
+    from_ref: str,
+    to_ref: str,
+    rules: DiffRules | None = None,
+    paths: list[str] | None = None,
+) -> Iterator[FileDiff]:
+    """
+    Streams `git diff from_ref to_ref` line by line and yields one FileDiff per file.
+    The raw diff is never held in memory: a file's hunks are buffered only up to
+    its cap, after which just the line counts are kept.
+
+    Args:
+        repo_path (str): The local file system path to the Git repository.
+        from_ref (str): The old side of the diff (commit, tag or tree SHA).
+        to_ref (str): The new side of the diff.
+        rules (DiffRules | None): Exclusion rules. Defaults to DiffRules().
+        paths (list[str] | None): Limit the diff to these path prefixes.
+
+    Yields:
+        FileDiff: One object per changed file, in diff order.
+    """
+    rules = rules or DiffRules()
+    command = ["git", "-C", repo_path, "diff", "--no-color", "--no-ext-diff", "-M", from_ref, to_ref]
+    if paths:
+        command += ["--", *paths]
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    total_length = 0
+    current = None
+    in_hunks = False
+    scanned_lines = 0
+
+    def finish(file_diff: FileDiff) -> FileDiff:
+        nonlocal total_length
+        if not file_diff.path:
+            # Mode-only or binary changes carry no ---/+++ lines.
+            halves = file_diff.git_header[len("diff --git ") :].split(" b/", 1)
+            file_diff.path = halves[-1]
+        if not file_diff.summarized and total_length + file_diff._length > rules.max_total_chars:
+            file_diff.summarize("total diff budget reached")
+        if not file_diff.summarized:
+            total_length += file_diff._length
+        return file_diff
+
+    try:
+        for raw_line in proc.stdout:
+            line = raw_line.rstrip("\n")
+            if line.startswith("diff --git "):
+                if current is not None:
+                    yield finish(current)
+                current = FileDiff(line)
+                in_hunks = False
+                scanned_lines = 0
+                continue
+            if current is None:
+                continue
+
+            if line.startswith("@@"):
+                in_hunks = True
+                if not current.summarized:
+                    current.hunks.append(Hunk(line))
+                    current._length += len(line) + 1
+                continue
+
+            if not in_hunks:
+                # File header lines before the first hunk.
+                if line.startswith("+++ "):
+                    new_path = _strip_prefix(line[4:])
+                    if new_path != "/dev/null":
+                        current.path = new_path
+                elif line.startswith("--- "):
+                    old_path = _strip_prefix(line[4:])
+                    if old_path != "/dev/null" and not current.path:
+                        current.path = old_path
+                elif line.startswith("rename to "):
+                    current.path = line[len("rename to ") :]
+                elif line.startswith("Binary files "):
+                    current.is_binary = True
+                    current.summarize("binary file")
+                if current.path and rules.is_excluded(current.path):
+                    current.summarize("excluded by rule")
+                if not current.summarized:
+                    current.meta_lines.append(line)
+                    current._length += len(line) + 1
+                continue
+
+            if line.startswith("+"):
+                current.added += 1
+            elif line.startswith("-"):
+                current.deleted += 1
+            if scanned_lines < rules.MARKER_SCAN_LINES:
+                scanned_lines += 1
+                if rules.has_generated_marker(line):
+                    current.summarize("generated file")
+            if current.summarized:
+                continue
+            current.hunks[-1].lines.append(line)
+            current._length += len(line) + 1
+            if current._length > rules.max_file_chars:
+                current.summarize(f"diff larger than {rules.max_file_chars} characters")
+
+        if current is not None:
+            yield finish(current)
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        if proc.wait() != 0 and stderr:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr)
+
+
+def render_filtered_diff(
+    repo_path: str,
+    from_ref: str,
+    to_ref: str,
+    rules: DiffRules | None = None,
+    paths: list[str] | None = None,
+) -> tuple[str, list[str]]:
+    """
+    Renders the filtered diff for a prompt and lists the changed paths.
+
+    Args:
+        repo_path (str): The local file system path to the Git repository.
+        from_ref (str): The old side of the diff.
+        to_ref (str): The new side of the diff.
+        rules (DiffRules | None): Exclusion rules. Defaults to DiffRules().
+        paths (list[str] | None): Limit the diff to these path prefixes.
+
+    Returns:
+        tuple[str, list[str]]: The rendered diff text and the changed file paths.
+    """
+    parts = []
+    changed_files = []
+    summarized = 0
+    for file_diff in iter_file_diffs(repo_path, from_ref, to_ref, rules, paths):
+        parts.append(file_diff.render())
+        changed_files.append(file_diff.path)
+        summarized += file_diff.summarized
+    if summarized:
+        print(f"Diff: {len(changed_files)} files changed, {summarized} summarized by diff rules.")
+    return "".join(parts), changed_files
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+
+class DiskCache:
+    """
+    An on-disk key/value store with a total size cap and least-recently-used
+    eviction. Keys are strings (typically hex digests such as git blob SHAs).
+    All entries live in one SQLite file, <cache_dir>/cache.sqlite3, so a snapshot
+    of tens of thousands of blobs is stored in a single transaction and read back
+    in batched queries instead of one file open per entry. Access times are kept in
+    memory and written back in batches, so a hit costs no write of its own.
+    Several processes may share a cache directory, and one instance may be shared
+    by threads.
+    """
+
+    FILE_NAME = "cache.sqlite3"
+    # Buffered access times are written back once this many have accumulated, before
+    # eviction and on every stats call.
+    TOUCH_FLUSH_THRESHOLD = 1000
+    # Access times are only rewritten once they are this stale, so a run that reads
+    # back what the previous run just stored writes nothing.
+    TOUCH_RESOLUTION_SECONDS = 60
+    # Keys per lookup query; stays below SQLite's limit on query parameters.
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Initializes the DiskCache and opens (or creates) its database.
+
+        Args:
+            cache_dir (str): Directory where the cache database is stored.
+            max_bytes (int): Maximum total size of all entries before eviction kicks in.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = 0
+        self._total_bytes = 0
+        self._touched = {}  # key -> last access time, not yet written back
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._remove_legacy_entries()
+            self._db = sqlite3.connect(
+                os.path.join(cache_dir, self.FILE_NAME), timeout=30, check_same_thread=False
+            )
+            self._db.executescript(
+                """
+                PRAGMA journal_mode = WAL;
+                PRAGMA synchronous = NORMAL;
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL,
+                    data BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+                """
+            )
+            self._load_totals()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Could not open cache in '{cache_dir}': {e}")
+            self._db = None
+
+    def _remove_legacy_entries(self):
+        """
+        Removes entries of the earlier one-file-per-entry layout (<key[:2]>/<key>),
+        which this cache no longer reads.
+        """
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and re.fullmatch(r"[0-9a-f]{2}", entry.name):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _load_totals(self):
+        self._entries, self._total_bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns the cached bytes for a key and marks it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            bytes | None: The cached data, or None on a miss.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, bytes]:
+        """
+        Returns the cached bytes of every key found, marking them as recently used.
+
+        Args:
+            keys (Iterable[str]): The cache keys.
+
+        Returns:
+            dict[str, bytes]: The entries found, by key. Missing keys are omitted.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            if self._db is not None:
+                try:
+                    for start in range(0, len(keys), self.LOOKUP_BATCH_SIZE):
+                        batch = keys[start : start + self.LOOKUP_BATCH_SIZE]
+                        rows = self._db.execute(
+                            f"SELECT key, data, accessed FROM entries WHERE key IN ({', '.join('?' * len(batch))})",
+                            batch,
+                        )
+                        now = time.time()
+                        for key, data, accessed in rows:
+                            found[key] = data
+                            if now - accessed >= self.TOUCH_RESOLUTION_SECONDS:
+                                self._touched[key] = now
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not read from cache in '{self.cache_dir}': {e}")
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            if len(self._touched) >= self.TOUCH_FLUSH_THRESHOLD:
+                self._flush()
+        return found
+
+    def put(self, key: str, data: bytes):
+        """
+        Stores bytes under a key, evicting least-recently-used entries if the
+        size cap is exceeded.
+
+        Args:
+            key (str): The cache key.
+            data (bytes): The data to store.
+        """
+        self.put_many([(key, data)])
+
+    def put_many(self, items: Iterable[tuple[str, bytes]]):
+        """
+        Stores several entries in one transaction, then evicts least-recently-used
+        entries if the size cap is exceeded. Entries larger than the cap are skipped.
+
+        Args:
+            items (Iterable[tuple[str, bytes]]): (key, data) pairs.
+        """
+        now = time.time()
+        rows = [(key, len(data), now, data) for key, data in items if len(data) <= self.max_bytes]
+        if not rows:
+            return
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                replaced = self._sizes_of([row[0] for row in rows])
+                with self._db:
+                    self._db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+                self._entries += len(rows) - len(replaced)
+                self._total_bytes += sum(row[1] for row in rows) - sum(replaced.values())
+                if self._total_bytes > self.max_bytes:
+                    # Other processes may have added or evicted entries meanwhile.
+                    self._load_totals()
+                    self._flush()
+                    self._evict()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not write {len(rows)} cache entries in '{self.cache_dir}': {e}")
+
+    def _sizes_of(self, keys: list[str]) -> dict[str, int]:
+        """
+        Returns the sizes of the stored entries among `keys`. The caller holds self._lock.
+        """
+        sizes = {}
+        for start in range(0, len(keys), self.LOOKUP_BATCH_SIZE):
+            batch = keys[start : start + self.LOOKUP_BATCH_SIZE]
+            sizes.update(
+                self._db.execute(
+                    f"SELECT key, size FROM entries WHERE key IN ({', '.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        return sizes
+
+    def _flush(self):
+        """
+        Writes buffered access times back. The caller holds self._lock.
+        """
+        if not self._touched or self._db is None:
+            return
+        touched, self._touched = self._touched, {}
+        try:
+            with self._db:
+                self._db.executemany(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    [(accessed, key) for key, accessed in touched.items()],
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Could not record cache accesses in '{self.cache_dir}': {e}")
+
+    def _evict(self):
+        """
+        Removes least-recently-used entries until the total size fits the cap.
+        The caller holds self._lock.
+        """
+        while self._total_bytes > self.max_bytes and self._entries:
+            rows = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT ?",
+                (self.LOOKUP_BATCH_SIZE,),
+            ).fetchall()
+            evicted = []
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                self._total_bytes -= size
+                self._entries -= 1
+            with self._db:
+                self._db.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters and current usage of the cache.
+        """
+        with self._lock:
+            self._flush()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": self._entries,
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
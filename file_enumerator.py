@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+
+from git_object_reader import GitObjectReader, TreeEntry
+
+
+class FileEnumerator:
+    """
+    Enumerates and reads the files of a commit for use as codebase context.
+    File lists come from git itself, so only tracked files are considered and
+    .gitignore'd build output, virtualenvs and dependency folders never show up.
+    On top of that, a single precompiled matcher drops unwanted paths, binaries are
+    detected by sniffing content for NUL bytes, and blob reads are spread over a
+    bounded pool of cat-file readers while keeping output order deterministic.
+    Readers are kept alive and reused across chunks and calls until close().
+    """
+
+    # Glob patterns for files that are never useful as context. A trailing "/"
+    # matches a directory name at any depth; other patterns match the file name.
+    DEFAULT_IGNORE_PATTERNS = [
+        "*.exe",
+        "*.dll",
+        "*.so",
+        "*.zip",
+        "*.tar.gz",
+        "*.bin",
+        "*.jpg",
+        "*.jpeg",
+        "*.png",
+        "*.gif",
+        "*.bmp",
+        "*.pdf",
+        "*.docx",
+        "*.xlsx",
+        "*.pptx",
+        "*.sqlite",
+        "*.db",
+        "*.pyc",
+        "*.class",
+        "node_modules/",
+        "venv/",
+        ".venv/",
+        "__pycache__/",
+    ]
+
+    # Same heuristic git uses: a NUL byte in the first 8000 bytes means binary.
+    BINARY_SNIFF_BYTES = 8000
+
+    # Below this many blobs per worker, spawning another reader costs more than it saves.
+    MIN_BLOBS_PER_WORKER = 256
+
+    def __init__(
+        self,
+        repo_path: str,
+        ignore_patterns: list[str] | None = None,
+        max_workers: int | None = None,
+    ):
+        """
+        Initializes the FileEnumerator.
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+            ignore_patterns (list[str] | None): Glob patterns to exclude. Defaults to
+                                                DEFAULT_IGNORE_PATTERNS.
+            max_workers (int | None): Number of concurrent blob readers. Defaults to
+                                      min(8, CPU count).
+        """
+        self.repo_path = repo_path
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        patterns = self.DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns
+        # Most patterns are "*.ext" suffixes or plain file and directory names; those
+        # are matched with string operations (directories once per directory), and
+        # only the remaining patterns go through a regular expression.
+        self._ignored_suffixes = []
+        self._ignored_names = set()
+        self._ignored_dir_names = set()
+        complex_patterns = []
+        for pattern in patterns:
+            is_dir = pattern.endswith("/")
+            glob = pattern.rstrip("/").lower()
+            if "/" in glob or "?" in glob or "*" in (glob if is_dir else glob[1:]):
+                complex_patterns.append(pattern)
+            elif is_dir:
+                self._ignored_dir_names.add(glob)
+            elif glob.startswith("*"):
+                self._ignored_suffixes.append(glob[1:])
+            else:
+                self._ignored_names.add(glob)
+        self._ignored_suffixes = tuple(self._ignored_suffixes)
+        self._ignore_re = self.compile_patterns(complex_patterns)
+        self._ignored_dirs = {}
+        self._readers = []  # Every open reader.
+        self._idle_readers = []  # Open readers not lent out right now.
+        self._readers_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Terminates the cat-file processes of all pooled readers.
+        """
+        with self._readers_lock:
+            readers, self._readers, self._idle_readers = self._readers, [], []
+        for reader in readers:
+            reader.close()
+
+    @contextmanager
+    def borrow_reader(self) -> Iterator[GitObjectReader]:
+        """
+        Lends out a pooled reader, starting a new one only if all are busy.
+        A reader that fails mid-use is closed rather than returned to the pool,
+        since its pipes may be left in an unknown state.
+        """
+        with self._readers_lock:
+            if self._idle_readers:
+                reader = self._idle_readers.pop()
+            else:
+                reader = GitObjectReader(self.repo_path)
+                self._readers.append(reader)
+        try:
+            yield reader
+        except BaseException:
+            with self._readers_lock:
+                if reader in self._readers:
+                    self._readers.remove(reader)
+            reader.close()
+            raise
+        with self._readers_lock:
+            if reader in self._readers:
+                self._idle_readers.append(reader)
+
+    @staticmethod
+    def compile_patterns(patterns: list[str]) -> re.Pattern | None:
+        """
+        Compiles glob patterns into one regular expression so each path is
+        matched in a single pass.
+        """
+        alternatives = []
+        for pattern in patterns:
+            is_dir = pattern.endswith("/")
+            glob = re.escape(pattern.rstrip("/"))
+            glob = glob.replace(r"\*", "[^/]*").replace(r"\?", "[^/]")
+            if is_dir:
+                alternatives.append(f"(?:^|/){glob}/")
+            else:
+                alternatives.append(f"(?:^|/){glob}$")
+        if not alternatives:
+            return None
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def is_ignored(self, relative_file_path: str) -> bool:
+        """
+        Returns True if the path matches any of the ignore patterns.
+        """
+        directory, _, name = relative_file_path.rpartition("/")
+        name = name.lower()
+        if name.endswith(self._ignored_suffixes) or name in self._ignored_names:
+            return True
+        if directory and self._ignored_dir_names:
+            ignored = self._ignored_dirs.get(directory)
+            if ignored is None:
+                ignored = not self._ignored_dir_names.isdisjoint(directory.lower().split("/"))
+                self._ignored_dirs[directory] = ignored
+            if ignored:
+                return True
+        return bool(self._ignore_re and self._ignore_re.search(relative_file_path))
+
+    @classmethod
+    def is_binary(cls, data: bytes) -> bool:
+        """
+        Returns True if the content looks binary (contains a NUL byte near the start).
+        """
+        return b"\0" in data[: cls.BINARY_SNIFF_BYTES]
+
+    def list_files(self, reader: GitObjectReader, treeish: str) -> list[TreeEntry]:
+        """
+        Lists the tracked files of a tree-ish, minus ignored paths.
+
+        Args:
+            reader (GitObjectReader): Reader for the repository.
+            treeish (str): A commit SHA, ref or tree SHA.
+
+        Returns:
+            list[TreeEntry]: The remaining files, in git's path order.
+        """
+        return [
+            entry for entry in reader.list_tree(treeish) if not self.is_ignored(entry.path)
+        ]
+
+    def _read_chunk(self, shas: list[str]) -> list[tuple[str, bytes]]:
+        with self.borrow_reader() as reader:
+            return list(reader.iter_blobs(shas))
+
+    def read_blobs(self, shas: list[str]) -> dict[str, bytes]:
+        """
+        Reads blobs in parallel. The SHAs are split into contiguous chunks, each
+        streamed by a pooled cat-file reader, and results are merged in request
+        order so the output never depends on thread scheduling.
+
+        Args:
+            shas (list[str]): Blob SHAs to read.
+
+        Returns:
+            dict[str, bytes]: A mapping of SHA to raw content, in request order.
+        """
+        if not shas:
+            return {}
+
+        workers = max(1, min(self.max_workers, len(shas) // self.MIN_BLOBS_PER_WORKER))
+        chunk_size = -(-len(shas) // workers)
+        chunks = [shas[i : i + chunk_size] for i in range(0, len(shas), chunk_size)]
+
+        blobs = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for results in executor.map(self._read_chunk, chunks):
+                blobs.update(results)
+        return blobs
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+import subprocess
+import threading
+from typing import Iterator, NamedTuple
+
+
+class TreeEntry(NamedTuple):
+    """
+    A single file in a commit's tree, as reported by `git ls-tree -r -l`.
+    `size` is the blob size in bytes (None when unknown).
+    """
+
+    mode: str
+    sha: str
+    path: str
+    size: int | None = None
+
+
+class GitObjectReader:
+    """
+    Reads objects straight from a repository's object database through long-lived
+    `git cat-file --batch` and `git cat-file --batch-check` processes.
+    Content always matches the requested commit exactly, regardless of the
+    state of the working tree, and each object costs a pipe round trip instead
+    of a process spawn or a filesystem walk.
+    """
+
+    SYMLINK_MODE = "120000"
+    SUBMODULE_MODE = "160000"
+
+    def __init__(self, repo_path: str):
+        """
+        Initializes the GitObjectReader. Processes are started lazily on first use.
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+        """
+        self.repo_path = repo_path
+        self._batch = None
+        self._batch_check = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _start(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "-C", self.repo_path, "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def close(self):
+        """
+        Terminates the cat-file processes.
+        """
+        for proc in (self._batch, self._batch_check):
+            if proc and proc.poll() is None:
+                proc.stdin.close()
+                proc.wait()
+        self._batch = None
+        self._batch_check = None
+
+    def list_tree(self, treeish: str) -> list[TreeEntry]:
+        """
+        Lists every regular file in a tree-ish, recursively, with its blob size.
+        Symlinks and submodules are left out since they have no file content.
+
+        Args:
+            treeish (str): A commit SHA, ref or tree SHA.
+
+        Returns:
+            list[TreeEntry]: The files in the tree, in git's path order.
+        """
+        output = subprocess.run(
+            ["git", "-C", self.repo_path, "ls-tree", "-r", "-l", "-z", treeish],
+            check=True,
+            capture_output=True,
+        ).stdout
+
+        entries = []
+        for record in output.split(b"\0"):
+            if not record:
+                continue
+            meta, path = record.split(b"\t", 1)
+            mode, obj_type, sha, size = meta.decode().split()
+            if obj_type != "blob" or mode == self.SYMLINK_MODE:
+                continue
+            entries.append(
+                TreeEntry(mode, sha, path.decode("utf-8", "surrogateescape"), int(size))
+            )
+        return entries
+
+    def _feed(self, proc: subprocess.Popen, shas: list[str]):
+        """
+        Writes object requests from a separate thread so that large requests
+        never deadlock against the process's output buffer.
+        """
+
+        def writer():
+            try:
+                for sha in shas:
+                    proc.stdin.write(sha.encode() + b"\n")
+                proc.stdin.flush()
+            except BrokenPipeError:
+                pass
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        return thread
+
+    def get_sizes(self, shas: list[str]) -> dict[str, int]:
+        """
+        Returns the size of each object without reading its content.
+
+        Args:
+            shas (list[str]): Object SHAs to look up.
+
+        Returns:
+            dict[str, int]: A mapping of SHA to size in bytes. Missing objects are omitted.
+        """
+        sizes = {}
+        if not shas:
+            return sizes
+
+        with self._lock:
+            if self._batch_check is None:
+                self._batch_check = self._start("--batch-check")
+            proc = self._batch_check
+            writer = self._feed(proc, shas)
+            for _ in shas:
+                header = proc.stdout.readline().decode().split()
+                if len(header) == 3:
+                    sizes[header[0]] = int(header[2])
+            writer.join()
+        return sizes
+
+    def iter_blobs(self, shas: list[str]) -> Iterator[tuple[str, bytes]]:
+        """
+        Streams object contents through the batch process, in request order.
+        Requests are pipelined, so the whole list costs a single round trip.
+
+        Args:
+            shas (list[str]): Object SHAs to read.
+
+        Yields:
+            tuple[str, bytes]: The SHA and raw content of each object found.
+        """
+        if not shas:
+            return
+
+        with self._lock:
+            if self._batch is None:
+                self._batch = self._start("--batch")
+            proc = self._batch
+            writer = self._feed(proc, shas)
+            remaining = len(shas)
+            try:
+                while remaining:
+                    remaining -= 1
+                    header = proc.stdout.readline().decode().split()
+                    if len(header) != 3:
+                        # "<sha> missing" has no content block.
+                        continue
+                    sha, size = header[0], int(header[2])
+                    data = proc.stdout.read(size)
+                    proc.stdout.read(1)  # Trailing newline after the content.
+                    yield sha, data
+            finally:
+                # Drain unread responses if the caller stopped early, so the
+                # next request starts on a clean header line.
+                while remaining:
+                    remaining -= 1
+                    header = proc.stdout.readline().decode().split()
+                    if len(header) == 3:
+                        proc.stdout.read(int(header[2]) + 1)
+                writer.join()
+
+    def read_blob(self, sha: str) -> bytes | None:
+        """
+        Reads a single object's content.
+
+        Args:
+            sha (str): The object SHA.
+
+        Returns:
+            bytes | None: The raw content, or None if the object does not exist.
+        """
+        for _, data in self.iter_blobs([sha]):
+            return data
+        return None
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+import datetime
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+
+class JiraIssueCache:
+    """
+    A local SQLite store of Jira issues, kept current per project with incremental
+    `updated >= ...` queries. A project synced within the last `max_age_seconds` is
+    served without touching the network at all; an older copy only fetches the
+    issues updated since its last sync. Issues are indexed by key, and by status,
+    resolution date and creation date within their project.
+    """
+
+    # "use" serves fresh copies, "refresh" syncs once per run, "bypass" neither
+    # reads nor writes (same modes as ResponseCache).
+    CACHE_MODES = ("use", "refresh", "bypass")
+    DEFAULT_MAX_AGE_SECONDS = 15 * 60
+    # The first sync of a project covers issues updated in this many days; older
+    # issues are fetched by key when a release refers to them.
+    INITIAL_SYNC_DAYS = 365
+    # Re-read this much before the last sync, so clock skew between this machine
+    # and Jira cannot drop an update.
+    SYNC_OVERLAP_MINUTES = 5
+    # Bump when the stored issue format changes; older stores are rebuilt.
+    SCHEMA_VERSION = 1
+
+    def __init__(
+        self,
+        cache_dir: str,
+        mode: str = "use",
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        """
+        Initializes the JiraIssueCache.
+
+        Args:
+            cache_dir (str): Directory of the SQLite database.
+            mode (str): One of CACHE_MODES (default: 'use').
+            max_age_seconds (float): How long a synced project is served without
+                                     asking Jira for updates.
+        """
+        if mode not in self.CACHE_MODES:
+            raise ValueError(f"Unknown Jira cache mode '{mode}'.")
+        self.mode = mode
+        self.max_age_seconds = max_age_seconds
+        self.stats = {"served": 0, "synced": 0, "issues_updated": 0, "sync_failures": 0}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        # Projects synced by this instance; "refresh" syncs each of them once.
+        self._synced_now = set()
+        self._db = None
+        if mode == "bypass":
+            return
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Shared by the threads of a batch run; every use holds self._lock.
+            self._db = sqlite3.connect(
+                os.path.join(cache_dir, "issues.sqlite3"), check_same_thread=False
+            )
+            self._create_schema()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Could not open the Jira issue cache in '{cache_dir}': {e}")
+            self._db = None
+
+    def _create_schema(self):
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._db.executescript(
+                "DROP TABLE IF EXISTS issues; DROP TABLE IF EXISTS sync_state;"
+            )
+        self._db.executescript(
+            f"""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS issues (
+                key TEXT PRIMARY KEY,
+                project TEXT NOT NULL,
+                status TEXT,
+                resolved TEXT,
+                created TEXT,
+                updated TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS issues_status ON issues (project, status);
+            CREATE INDEX IF NOT EXISTS issues_resolved ON issues (project, resolved);
+            CREATE INDEX IF NOT EXISTS issues_created ON issues (project, created);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                project TEXT PRIMARY KEY,
+                synced_at REAL NOT NULL
+            );
+            PRAGMA user_version = {self.SCHEMA_VERSION};
+            """
+        )
+
+    @staticmethod
+    def _utc(value: str | None) -> str | None:
+        """
+        Normalizes a Jira timestamp (e.g. 2024-05-01T10:00:00.000+0200) to UTC ISO
+        8601, so stored dates compare correctly as text.
+        """
+        if not value:
+            return None
+        try:
+            parsed = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed.astimezone(datetime.timezone.utc).isoformat(timespec="seconds")
+
+    def _synced_at(self, project_key: str) -> float | None:
+        row = self._db.execute(
+            "SELECT synced_at FROM sync_state WHERE project = ?", (project_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _is_fresh(self, project_key: str, synced_at: float | None, now: float) -> bool:
+        return project_key in self._synced_now or (
+            self.mode == "use" and synced_at is not None and now - synced_at < self.max_age_seconds
+        )
+
+    def is_fresh(self, project_key: str) -> bool:
+        """
+        Whether the project's copy can be served as is, without syncing it.
+        """
+        if self._db is None:
+            return False
+        with self._lock:
+            synced_at = self._synced_at(project_key)
+        return self._is_fresh(project_key, synced_at, time.time())
+
+    def put(self, issues: list[dict]):
+        """
+        Stores or replaces issues (as returned by JiraIntegrator.issue_to_dict).
+        """
+        if self._db is None or not issues:
+            return
+        rows = [
+            (
+                issue["key"],
+                issue["key"].rsplit("-", 1)[0],
+                issue.get("status"),
+                self._utc(issue.get("resolved")),
+                self._utc(issue.get("created")),
+                self._utc(issue.get("updated")),
+                json.dumps(issue),
+            )
+            for issue in issues
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def sync(self, project_key: str, search: Callable[[str], list[dict]]) -> bool:
+        """
+        Brings a project up to date unless its copy is still fresh. Only issues
+        updated since the last sync are fetched; if Jira cannot be reached, the
+        stale copy is kept and served.
+
+        Args:
+            project_key (str): The project to sync.
+            search (Callable[[str], list[dict]]): Runs a JQL query and returns every
+                                                  matching issue as a dict.
+
+        Returns:
+            bool: True if the cache holds a synced copy of the project to serve
+                  from; False if it must not be used (bypassed, never synced).
+        """
+        if self._db is None:
+            return False
+        # One sync at a time; concurrent callers wait and then see a fresh copy.
+        with self._sync_lock:
+            with self._lock:
+                synced_at = self._synced_at(project_key)
+            now = time.time()
+            if self._is_fresh(project_key, synced_at, now):
+                self.stats["served"] += 1
+                return True
+
+            if synced_at is None:
+                since = f"-{self.INITIAL_SYNC_DAYS}d"
+            else:
+                minutes = math.ceil((now - synced_at) / 60) + self.SYNC_OVERLAP_MINUTES
+                since = f"-{minutes}m"
+            # A relative date avoids the time zone of the Jira user's profile.
+            jql = f'project = "{project_key}" AND updated >= "{since}" ORDER BY updated ASC'
+            try:
+                issues = search(jql)
+            except Exception as e:
+                self.stats["sync_failures"] += 1
+                print(f"Warning: Could not sync Jira issues of {project_key}: {e}")
+                return synced_at is not None
+
+            self.put(issues)
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (project_key, now)
+                )
+            self._synced_now.add(project_key)
+            self.stats["synced"] += 1
+            self.stats["issues_updated"] += len(issues)
+        print(f"Synced {len(issues)} updated Jira issues of {project_key} into the local cache.")
+        return True
+
+    def get(self, issue_keys: set[str]) -> dict:
+        """
+        Returns the stored issues among `issue_keys`, by key.
+        """
+        if self._db is None or not issue_keys:
+            return {}
+        keys = list(issue_keys)
+        found = {}
+        with self._lock:
+            # Stay below SQLite's limit on query parameters.
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, data FROM issues WHERE key IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                found.update((key, json.loads(data)) for key, data in rows)
+        return found
+
+    def find(
+        self,
+        project_key: str,
+        status: str | None = None,
+        resolved_from: str | None = None,
+        resolved_before: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Queries the stored issues of a project.
+
+        Args:
+            project_key (str): The project.
+            status (str | None): Only issues in this status.
+            resolved_from (str | None): Only issues resolved on or after this date (YYYY-MM-DD, UTC).
+            resolved_before (str | None): Only issues resolved before this date (YYYY-MM-DD, UTC).
+            limit (int | None): Maximum number of issues.
+
+        Returns:
+            list[dict]: Most recently resolved first when filtering by resolution
+                        date, otherwise most recently created first.
+        """
+        if self._db is None:
+            return []
+        clauses = ["project = ?"]
+        params = [project_key]
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if resolved_from is not None:
+            clauses.append("resolved >= ?")
+            params.append(resolved_from)
+        if resolved_before is not None:
+            clauses.append("resolved < ?")
+            params.append(resolved_before)
+        order = "resolved" if resolved_from or resolved_before else "created"
+        query = f"SELECT data FROM issues WHERE {' AND '.join(clauses)} ORDER BY {order} DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def format_stats(self) -> str:
+        return (
+            f"Jira cache: {self.stats['served']} served fresh, {self.stats['synced']} synced "
+            f"({self.stats['issues_updated']} issues updated), {self.stats['sync_failures']} sync failures."
+        )
+
+
+if __name__ == "__main__":
+    # Example usage (for testing this module independently)
+    import tempfile
+
+    def mock_search(jql: str) -> list[dict]:
+        print(f"JQL: {jql}")
+        return [
+            {
+                "key": f"PROJ-{i}",
+                "summary": f"Issue {i}",
+                "status": "Done" if i % 2 else "In Progress",
+                "resolved": f"2024-05-0{i}T10:00:00.000+0200" if i % 2 else None,
+                "created": f"2024-04-0{i}T10:00:00.000+0000",
+                "updated": f"2024-05-0{i}T10:00:00.000+0000",
+            }
+            for i in range(1, 6)
+        ]
+
+    cache = JiraIssueCache(tempfile.mkdtemp(prefix="jira_cache_"))
+    cache.sync("PROJ", mock_search)
+    cache.sync("PROJ", mock_search)  # Fresh: served without a query.
+    print(sorted(cache.get({"PROJ-1", "PROJ-9"})))
+    print([issue["key"] for issue in cache.find("PROJ", resolved_from="2024-05-02", resolved_before="2024-05-06")])
+    print([issue["key"] for issue in cache.find("PROJ", status="In Progress")])
+    print(cache.format_stats())
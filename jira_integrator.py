@@ -1,8 +1,92 @@
 #!/usr/bin/env python3
 
+import datetime
+import json
 import os
-import re
-from jira import JIRA
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from jira_cache import JiraIssueCache
+from jira_key_index import compile_key_matcher, iter_jira_keys
+
+# The only issue fields the notes use. Everything else (custom fields, rendered
+# bodies, comments, attachments) stays on the server.
+ISSUE_FIELDS = [
+    "summary",
+    "status",
+    "issuetype",
+    "description",
+    "assignee",
+    "reporter",
+    "priority",
+    "resolution",
+    "components",
+    "created",
+    "updated",
+    "resolutiondate",
+]
+# Issues per search page; Jira Cloud serves at most 100.
+SEARCH_PAGE_SIZE = 100
+# Pages requested at once once the first page has reported the total.
+MAX_PARALLEL_PAGES = 4
+
+
+def search_issue_pages(
+    jira_client, jql: str, max_results: int | None = None, max_workers: int = MAX_PARALLEL_PAGES
+) -> tuple[list[dict], list[dict]]:
+    """
+    Runs a JQL search for ISSUE_FIELDS only. The first page reports the total
+    number of matches; the remaining pages are then requested concurrently.
+
+    Args:
+        jira_client (jira.JIRA): An authenticated client.
+        jql (str): The query.
+        max_results (int | None): Maximum number of issues; None for all matches.
+        max_workers (int): Pages requested at once after the first.
+
+    Returns:
+        tuple[list[dict], list[dict]]: The issues as returned by the REST API, in
+            result order, and one metrics entry per page with its "start_at",
+            "issues", "bytes" (size of the JSON payload) and "seconds".
+    """
+
+    def fetch(start_at: int, count: int) -> tuple[dict, dict]:
+        started = time.perf_counter()
+        page = jira_client.search_issues(
+            jql, startAt=start_at, maxResults=count, fields=ISSUE_FIELDS, json_result=True
+        )
+        return page, {
+            "start_at": start_at,
+            "issues": len(page.get("issues", [])),
+            "bytes": len(json.dumps(page)),
+            "seconds": time.perf_counter() - started,
+        }
+
+    first, first_metrics = fetch(0, min(SEARCH_PAGE_SIZE, max_results or SEARCH_PAGE_SIZE))
+    issues = list(first.get("issues", []))
+    pages = [first_metrics]
+    total = first.get("total", len(issues))
+    wanted = min(total, max_results) if max_results else total
+    # The server may serve fewer issues per page than were asked for.
+    step = len(issues)
+    if step and wanted > step:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for page, metrics in pool.map(
+                lambda start_at: fetch(start_at, min(step, wanted - start_at)),
+                range(step, wanted, step),
+            ):
+                issues.extend(page.get("issues", []))
+                pages.append(metrics)
+
+    # An issue updated while the pages are read can show up on two of them.
+    seen = set()
+    unique = []
+    for issue in issues:
+        if issue["key"] not in seen:
+            seen.add(issue["key"])
+            unique.append(issue)
+    return unique[:wanted], pages
 
 
 class JiraIntegrator:
@@ -10,7 +94,21 @@ class JiraIntegrator:
     Integrates with Jira to fetch issue details.
     """
 
-    def __init__(self, jira_server_url: str, jira_api_token: str, jira_user_email: str):
+    # Issue keys per `key in (...)` query; Jira caps the length of a JQL query.
+    MAX_KEYS_PER_QUERY = 100
+    # Slack around the commit dates of a range when no issue keys were found:
+    # issues are often resolved a little before the last commit lands (time zones)
+    # or some days after (review, QA).
+    RESOLVED_WINDOW_DAYS_BEFORE = 1
+    RESOLVED_WINDOW_DAYS_AFTER = 7
+
+    def __init__(
+        self,
+        jira_server_url: str,
+        jira_api_token: str,
+        jira_user_email: str,
+        issue_cache: JiraIssueCache | None = None,
+    ):
         """
         Initializes the JiraIntegrator with Jira server URL and API token.
 
@@ -18,16 +116,39 @@ class JiraIntegrator:
             jira_server_url (str): The URL of your Jira instance.
             jira_api_token (str): The API token for Jira authentication.
             jira_user_email (str): The email of the user associated with the API token.
+            issue_cache (JiraIssueCache | None): Local issue store to serve and sync
+                                                 projects from (optional).
         """
         self.jira_server_url = jira_server_url
         self.jira_api_token = jira_api_token
         self.jira_user_email = jira_user_email
-        self.jira_client = self._authenticate_jira()
+        self.issue_cache = issue_cache
+        # Metrics of every search page requested (see search_issue_pages).
+        self.search_pages = []
+        self._metrics_lock = threading.Lock()
+        self._jira_client = None
+        self._authenticated = False
+        self._client_lock = threading.Lock()
+
+    @property
+    def jira_client(self):
+        """
+        The Jira client, connected on first use: runs served entirely from the
+        issue cache never contact the server.
+        """
+        with self._client_lock:
+            if not self._authenticated:
+                self._jira_client = self._authenticate_jira()
+                self._authenticated = True
+        return self._jira_client
 
     def _authenticate_jira(self):
         """
         Authenticates with Jira using the provided API token.
         """
+        # Imported here so runs that never reach Jira do not pay for the client library.
+        from jira import JIRA
+
         try:
             options = {"server": self.jira_server_url}
             # Use basic_auth with email and API token
@@ -38,22 +159,96 @@ class JiraIntegrator:
             print(f"Error authenticating with Jira: {e}")
             return None
 
-    def _extract_jira_keys(self, text: str) -> set[str]:
+    @staticmethod
+    def issue_to_dict(issue: dict) -> dict:
         """
-        Extracts potential Jira issue keys from a given text (e.g., commit messages).
-        Matches patterns like 'PROJ-123', 'ABC-456'.
+        Converts a Jira issue, as returned by the REST API (or `Issue.raw`), into
+        the dictionary handed to the generator.
+        """
+        fields = issue["fields"]
+        return {
+            "key": issue["key"],
+            "summary": fields.get("summary"),
+            "status": fields["status"]["name"],
+            "issue_type": fields["issuetype"]["name"],
+            "description": (
+                fields["description"]
+                if fields.get("description")
+                else "No description provided."
+            ),
+            "assignee": (
+                fields["assignee"]["displayName"]
+                if fields.get("assignee")
+                else "Unassigned"
+            ),
+            "reporter": (
+                fields["reporter"]["displayName"]
+                if fields.get("reporter")
+                else "Unknown"
+            ),
+            "priority": (
+                fields["priority"]["name"]
+                if fields.get("priority")
+                else "None"
+            ),
+            "resolution": (
+                fields["resolution"]["name"]
+                if fields.get("resolution")
+                else "Unresolved"
+            ),
+            "components": [
+                component["name"]
+                for component in (fields.get("components") or [])
+            ],
+            "created": fields.get("created"),
+            "updated": fields.get("updated"),
+            "resolved": fields.get("resolutiondate"),
+        }
 
-        Args:
-            text (str): The text to search for Jira keys.
+    def _search(self, jql: str, max_results: int | None = None) -> list[dict]:
+        """
+        Returns the issues matching `jql` (all of them if `max_results` is None),
+        fetching only ISSUE_FIELDS and the pages concurrently.
+        """
+        if not self.jira_client:
+            raise ConnectionError("Jira client not initialized.")
+        started = time.perf_counter()
+        issues, pages = search_issue_pages(self.jira_client, jql, max_results)
+        with self._metrics_lock:
+            self.search_pages.extend(pages)
+        print(
+            f"Jira search: {len(issues)} issues in {len(pages)} pages, "
+            f"{sum(page['bytes'] for page in pages) / 1024:.0f} KiB, {time.perf_counter() - started:.2f}s "
+            f"(slowest page {max(page['seconds'] for page in pages):.2f}s)."
+        )
+        return [self.issue_to_dict(issue) for issue in issues]
+
+    def format_search_stats(self) -> str:
+        with self._metrics_lock:
+            pages = list(self.search_pages)
+        if not pages:
+            return "Jira searches: none."
+        return (
+            f"Jira searches: {len(pages)} pages, {sum(page['issues'] for page in pages)} issues, "
+            f"{sum(page['bytes'] for page in pages) / 1024:.0f} KiB, "
+            f"{sum(page['seconds'] for page in pages):.2f}s of page latency "
+            f"(slowest {max(page['seconds'] for page in pages):.2f}s)."
+        )
+
+    def _sync(self, project_key: str) -> bool:
+        """
+        Brings the cached copy of a project up to date if it is stale.
 
         Returns:
-            set[str]: A set of unique Jira issue keys found.
+            bool: True if the project can be served from the issue cache.
         """
-        # Regex to find common Jira key patterns (e.g., PROJ-123, DEV-456)
-        # Assumes project keys are 2+ uppercase letters, followed by a hyphen and numbers.
-        jira_key_pattern = r"\b[A-Z]{2,}-\d+\b"
-        matches = re.findall(jira_key_pattern, text)
-        return set(matches)
+        return self.issue_cache is not None and self.issue_cache.sync(project_key, self._search)
+
+    @staticmethod
+    def _key_order(key: str) -> tuple[str, int]:
+        # Numeric order within each project, so PROJ-9 comes before PROJ-10.
+        project, number = key.rsplit("-", 1)
+        return project, int(number)
 
     def get_jira_notes_by_project(
         self, project_key: str, max_results: int = 50
@@ -68,6 +263,11 @@ class JiraIntegrator:
         Returns:
             list[dict]: A list of Jira issue details
         """
+        if self._sync(project_key):
+            jira_issues_data = self.issue_cache.find(project_key, limit=max_results)
+            print(f"Found {len(jira_issues_data)} cached issues for project {project_key}")
+            return jira_issues_data
+
         if not self.jira_client:
             print("Jira client not initialized. Cannot fetch issues.")
             return []
@@ -75,51 +275,150 @@ class JiraIntegrator:
         try:
             # Search for all issues in the project
             jql = f'project = "{project_key}" ORDER BY created DESC'
-            issues = self.jira_client.search_issues(jql, maxResults=max_results)
-            print(f"Found {len(issues)} issues for project {project_key}")
-
-            jira_issues_data = []
-            for issue in issues:
-                jira_issues_data.append(
-                    {
-                        "key": issue.key,
-                        "summary": issue.fields.summary,
-                        "status": issue.fields.status.name,
-                        "issue_type": issue.fields.issuetype.name,
-                        "description": (
-                            issue.fields.description
-                            if issue.fields.description
-                            else "No description provided."
-                        ),
-                        "assignee": (
-                            issue.fields.assignee.displayName
-                            if issue.fields.assignee
-                            else "Unassigned"
-                        ),
-                        "reporter": (
-                            issue.fields.reporter.displayName
-                            if issue.fields.reporter
-                            else "Unknown"
-                        ),
-                        "priority": (
-                            issue.fields.priority.name
-                            if issue.fields.priority
-                            else "None"
-                        ),
-                        "resolution": (
-                            issue.fields.resolution.name
-                            if issue.fields.resolution
-                            else "Unresolved"
-                        ),
-                        "created": issue.fields.created,
-                        "updated": issue.fields.updated,
-                    }
-                )
+            jira_issues_data = self._search(jql, max_results)
+            print(f"Found {len(jira_issues_data)} issues for project {project_key}")
             return jira_issues_data
         except Exception as e:
             print(f"Error fetching issues for project {project_key}: {e}")
             return []
 
+    def _fetch_by_keys(self, keys: list[str]) -> list[dict]:
+        """
+        Fetches issues from the server with batched `key in (...)` queries.
+        If a batch is rejected (for example, because one of its keys was deleted
+        or is not visible to this user), its issues are fetched one by one so the
+        others are not lost.
+        """
+        if not self.jira_client:
+            print("Jira client not initialized. Cannot fetch issues.")
+            return []
+
+        jira_issues_data = []
+        for start in range(0, len(keys), self.MAX_KEYS_PER_QUERY):
+            batch = keys[start : start + self.MAX_KEYS_PER_QUERY]
+            try:
+                jira_issues_data.extend(self._search(f"key in ({', '.join(batch)})"))
+            except Exception as e:
+                print(f"Warning: Batch query for {len(batch)} issues failed ({e}); fetching them one by one.")
+                for key in batch:
+                    try:
+                        issue = self.jira_client.issue(key, fields=",".join(ISSUE_FIELDS))
+                        jira_issues_data.append(self.issue_to_dict(issue.raw))
+                    except Exception as issue_error:
+                        print(f"Warning: Could not fetch issue {key}: {issue_error}")
+        return jira_issues_data
+
+    def get_jira_notes_by_keys(self, issue_keys: set[str]) -> list[dict]:
+        """
+        Fetches specific Jira issues. Issues of projects that the issue cache holds
+        a current copy of are served from it; the rest are fetched from the server
+        with targeted `key in (...)` queries and added to the cache. A stale or
+        missing project is not synced for this: a full sync pulls a year of the
+        project's issues to answer a lookup of a handful.
+
+        Args:
+            issue_keys (set[str]): The issue keys to fetch.
+
+        Returns:
+            list[dict]: Details of the issues found, ordered by key.
+        """
+        cached = {}
+        if self.issue_cache is not None:
+            projects = {key.rsplit("-", 1)[0] for key in issue_keys}
+            fresh = {project for project in projects if self.issue_cache.is_fresh(project)}
+            cached = {
+                key: issue
+                for key, issue in self.issue_cache.get(issue_keys).items()
+                if key.rsplit("-", 1)[0] in fresh
+            }
+        missing = sorted(issue_keys - cached.keys(), key=self._key_order)
+        fetched = self._fetch_by_keys(missing) if missing else []
+        if self.issue_cache is not None:
+            self.issue_cache.put(fetched)
+
+        jira_issues_data = sorted(
+            [*cached.values(), *fetched], key=lambda issue: self._key_order(issue["key"])
+        )
+        print(
+            f"Found {len(jira_issues_data)} of {len(issue_keys)} referenced issues "
+            f"({len(cached)} from the local cache)."
+        )
+        return jira_issues_data
+
+    def get_jira_notes_by_resolution_window(
+        self, project_key: str, first_date: str, last_date: str, max_results: int = 100
+    ) -> list[dict]:
+        """
+        Fetches the issues of a project resolved while a range's commits were made,
+        widened by RESOLVED_WINDOW_DAYS_BEFORE and RESOLVED_WINDOW_DAYS_AFTER.
+
+        Args:
+            project_key (str): The project key to fetch issues for.
+            first_date (str): Date of the oldest commit of the range (ISO 8601).
+            last_date (str): Date of the newest commit of the range (ISO 8601).
+            max_results (int): Maximum number of issues to return.
+
+        Returns:
+            list[dict]: A list of Jira issue details.
+        """
+        start = datetime.datetime.fromisoformat(first_date).date() - datetime.timedelta(
+            days=self.RESOLVED_WINDOW_DAYS_BEFORE
+        )
+        # `resolved < day` excludes that day, hence the extra day.
+        end = datetime.datetime.fromisoformat(last_date).date() + datetime.timedelta(
+            days=self.RESOLVED_WINDOW_DAYS_AFTER + 1
+        )
+        if self._sync(project_key):
+            issues = self.issue_cache.find(
+                project_key, resolved_from=str(start), resolved_before=str(end), limit=max_results
+            )
+            print(f"Found {len(issues)} cached issues of project {project_key} resolved between {start} and {end}.")
+            return issues
+
+        if not self.jira_client:
+            print("Jira client not initialized. Cannot fetch issues.")
+            return []
+
+        try:
+            jql = (
+                f'project = "{project_key}" AND resolved >= "{start:%Y-%m-%d}" '
+                f'AND resolved < "{end:%Y-%m-%d}" ORDER BY resolved DESC'
+            )
+            issues = self._search(jql, max_results)
+            print(f"Found {len(issues)} issues of project {project_key} resolved between {start} and {end}.")
+            return issues
+        except Exception as e:
+            print(f"Error fetching resolved issues for project {project_key}: {e}")
+            return []
+
+    def get_jira_notes_for_range(
+        self, project_key: str, issue_keys: set[str], first_date: str = "", last_date: str = ""
+    ) -> list[dict]:
+        """
+        Fetches the issues relevant to a commit range: the issues referenced by its
+        commits, or, if none are, those resolved around the range's commit dates.
+        Without commit dates it falls back to the project's latest issues.
+
+        Args:
+            project_key (str): The project key to fetch issues for.
+            issue_keys (set[str]): Issue keys referenced by the range's commits and
+                                   refs (see RepoManager.get_jira_references).
+            first_date (str): Date of the oldest commit of the range (ISO 8601).
+            last_date (str): Date of the newest commit of the range (ISO 8601).
+
+        Returns:
+            list[dict]: A list of Jira issue details.
+        """
+        issue_keys = {key for key in issue_keys if key.startswith(f"{project_key.upper()}-")}
+        if issue_keys:
+            print(f"Fetching {len(issue_keys)} Jira issues referenced by the commits...")
+            return self.get_jira_notes_by_keys(issue_keys)
+        if first_date and last_date:
+            print("No Jira issue keys in the commits; fetching issues resolved during the range...")
+            return self.get_jira_notes_by_resolution_window(project_key, first_date, last_date)
+        print(f"No Jira issue keys or commit dates; fetching the latest issues of project {project_key}...")
+        return self.get_jira_notes_by_project(project_key)
+
 
 if __name__ == "__main__":
     # Example usage (for testing this module independently)
@@ -154,9 +453,10 @@ if __name__ == "__main__":
              pass
         """
 
-        # This will attempt to fetch PROJ-123. Ensure it exists in your Jira instance
+        # This will attempt to fetch SCRUM-1. Ensure it exists in your Jira instance
         # and your token has permission to view it.
-        jira_data = integrator.get_jira_notes_for_diff(mock_diff_text)
+        issue_keys = set(iter_jira_keys(mock_diff_text.splitlines(), compile_key_matcher(["SCRUM"])))
+        jira_data = integrator.get_jira_notes_for_range("SCRUM", issue_keys)
         if jira_data:
             print("\n--- Fetched Jira Data ---")
             for issue in jira_data:
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import subprocess
+import threading
+from typing import Iterable, Iterator
+
+from commit_log import CommitRecord
+
+
+def compile_key_matcher(project_keys: Iterable[str]) -> re.Pattern:
+    """
+    Compiles one matcher for the issue keys of the given projects only, so
+    look-alikes such as 'UTF-8' or 'SHA-256' never match. Branch names are often
+    lowercase (feature/proj-123-...), so keys match case-insensitively.
+
+    Args:
+        project_keys (Iterable[str]): Jira project keys, e.g. ["PROJ", "OPS"].
+
+    Returns:
+        re.Pattern: A pattern whose matches are issue keys (to be uppercased).
+    """
+    # Longest first, so a project key that prefixes another cannot shadow it.
+    keys = sorted({key.strip().upper() for key in project_keys if key.strip()}, key=len, reverse=True)
+    if not keys:
+        raise ValueError("At least one Jira project key is required.")
+    return re.compile(
+        rf"(?<![A-Za-z0-9])(?:{'|'.join(map(re.escape, keys))})-\d+\b", re.IGNORECASE
+    )
+
+
+def iter_jira_keys(lines: Iterable[str], matcher: re.Pattern) -> Iterator[str]:
+    """
+    Yields the issue keys found in a stream of lines, uppercased, in order of
+    appearance (with repeats).
+    """
+    for line in lines:
+        for match in matcher.finditer(line):
+            yield match.group().upper()
+
+
+class JiraReferences:
+    """
+    The Jira issue keys a release range refers to and the committer-date span of
+    its commits, gathered from the commit records the git stage streams anyway, so
+    the range's history is walked once for both the notes and the Jira lookup.
+    Keys come from subjects and bodies (merge subjects carry the names of merged
+    branches), from the ref names decorating the commits, and from the name of the
+    range's end. The Jira stage waits for them while the git stage moves on to the
+    diff and codebase.
+    """
+
+    def __init__(self, project_keys: Iterable[str], to_ref: str):
+        """
+        Initializes the JiraReferences.
+
+        Args:
+            project_keys (Iterable[str]): The Jira projects whose keys are recognized.
+            to_ref (str): The inclusive end of the range, as given by the user.
+        """
+        self.matcher = compile_key_matcher(project_keys)
+        self.keys = set(iter_jira_keys([to_ref], self.matcher))
+        self.error = ""
+        self._first = None
+        self._last = None
+        self._ready = threading.Event()
+
+    def observe(self, commits: Iterable[CommitRecord]) -> Iterator[CommitRecord]:
+        """
+        Passes commits through unchanged, collecting their keys and dates on the way.
+        """
+        for commit in commits:
+            self.keys.update(
+                iter_jira_keys([commit.subject, commit.body, commit.refs], self.matcher)
+            )
+            committed = (datetime.datetime.fromisoformat(commit.committed), commit.committed)
+            if self._first is None or committed[0] < self._first[0]:
+                self._first = committed
+            if self._last is None or committed[0] > self._last[0]:
+                self._last = committed
+            yield commit
+
+    def finish(self, error: str = ""):
+        """
+        Marks the references as complete, or as unusable if `error` is given.
+        Only the first call counts, so a caller can finish unconditionally once the
+        git stage is over.
+        """
+        if not self._ready.is_set():
+            self.error = error
+            self._ready.set()
+
+    def wait(self) -> tuple[set[str], str, str, str]:
+        """
+        Blocks until finish() has been called.
+
+        Returns:
+            tuple[set[str], str, str, str]: The issue keys, the committer dates of the
+                                            oldest and newest commit (ISO 8601), and an
+                                            error message (empty if no error), as
+                                            RepoManager.get_jira_references returns them.
+        """
+        self._ready.wait()
+        if self.error:
+            return set(), "", "", self.error
+        if self._first is None:
+            return self.keys, "", "", ""
+        return self.keys, self._first[1], self._last[1], ""
+
+
+class JiraKeyIndex:
+    """
+    A persistent inverted index from Jira issue keys to the commits whose messages
+    mention them, for one repository and set of projects. The index records the
+    tips it has scanned up to, so an update only streams the commits added since
+    (`git log <tip> --not <indexed tips>`), one line at a time; indexing a long
+    history once costs a single `git log` pass and flat memory.
+    """
+
+    # Bump when the index format or the scanned text changes; older indexes are rebuilt.
+    SCHEMA_VERSION = 1
+    # (key, commit) rows written per transaction while scanning.
+    INSERT_BATCH_SIZE = 5000
+    # Commit SHAs per lookup query; stays below SQLite's limit on query parameters.
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, cache_dir: str, repo_path: str, project_keys: Iterable[str]):
+        """
+        Initializes the JiraKeyIndex.
+
+        Args:
+            cache_dir (str): Directory holding the indexes of all repositories.
+            repo_path (str): The local file system path to the Git repository.
+            project_keys (Iterable[str]): The projects whose keys are indexed.
+        """
+        self.repo_path = repo_path
+        self.project_keys = sorted({key.strip().upper() for key in project_keys if key.strip()})
+        self.matcher = compile_key_matcher(self.project_keys)
+        self.stats = {"commits_scanned": 0, "references_added": 0}
+        # One file per repository and project set: a different allowlist would
+        # have indexed different keys.
+        name = hashlib.sha256(
+            f"{os.path.realpath(repo_path)}\0{','.join(self.project_keys)}".encode("utf-8")
+        ).hexdigest()[:32]
+        self._db = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(cache_dir, f"{name}.sqlite3"))
+            self._create_schema()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Could not open the Jira key index in '{cache_dir}': {e}")
+            self._db = None
+
+    def _create_schema(self):
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._db.executescript("DROP TABLE IF EXISTS refs; DROP TABLE IF EXISTS tips;")
+        self._db.executescript(
+            f"""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS refs (
+                key TEXT NOT NULL,
+                sha TEXT NOT NULL,
+                PRIMARY KEY (key, sha)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS refs_sha ON refs (sha);
+            CREATE TABLE IF NOT EXISTS tips (sha TEXT PRIMARY KEY);
+            PRAGMA user_version = {self.SCHEMA_VERSION};
+            """
+        )
+
+    def _git(self, *args: str, stdin: str | None = None) -> str:
+        return subprocess.run(
+            ["git", "-C", self.repo_path, *args],
+            input=stdin,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    def _indexed_tips(self) -> list[str]:
+        """
+        Returns the indexed tips still present in the repository; tips lost to a
+        force push and garbage collection are dropped (their commits are rescanned
+        if still reachable).
+        """
+        tips = [sha for (sha,) in self._db.execute("SELECT sha FROM tips")]
+        if not tips:
+            return []
+        output = self._git("cat-file", "--batch-check=%(objectname) %(objecttype)", stdin="\n".join(tips) + "\n")
+        return [line.split()[0] for line in output.splitlines() if line.endswith(" commit")]
+
+    def _insert(self, rows: list[tuple[str, str]]):
+        with self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO refs VALUES (?, ?)", rows)
+            self.stats["references_added"] += self._db.total_changes - before
+
+    def update(self, to_ref: str) -> bool:
+        """
+        Indexes the commit messages reachable from `to_ref` that are not indexed yet.
+
+        Args:
+            to_ref (str): The ref, tag or SHA to index up to.
+
+        Returns:
+            bool: True if the index covers `to_ref`.
+        """
+        if self._db is None:
+            return False
+        try:
+            to_sha = self._git("rev-parse", "--verify", f"{to_ref}^{{commit}}").strip()
+            tips = self._indexed_tips()
+            if to_sha in tips:
+                return True
+            proc = subprocess.Popen(
+                ["git", "-C", self.repo_path, "log", "--format=%x1e%H%n%B", to_sha, "--not", *tips, "--"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+            sha = None
+            rows = []
+            with proc.stdout:
+                for line in proc.stdout:
+                    if line.startswith("\x1e"):
+                        sha = line[1:].strip()
+                        self.stats["commits_scanned"] += 1
+                        continue
+                    for match in self.matcher.finditer(line):
+                        rows.append((match.group().upper(), sha))
+                    if len(rows) >= self.INSERT_BATCH_SIZE:
+                        self._insert(rows)
+                        rows = []
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, "git log")
+            self._insert(rows)
+            # Keep only the tips that are not ancestors of another one.
+            independent = self._git("merge-base", "--independent", to_sha, *tips).split()
+            with self._db:
+                self._db.execute("DELETE FROM tips")
+                self._db.executemany("INSERT INTO tips VALUES (?)", [(tip,) for tip in independent])
+            return True
+        except (OSError, subprocess.CalledProcessError, sqlite3.Error) as e:
+            print(f"Warning: Could not update the Jira key index of {self.repo_path}: {e}")
+            return False
+
+    def keys_for_commits(self, commit_shas: Iterable[str]) -> set[str]:
+        """
+        Returns the issue keys mentioned by the given commits, reading them in
+        batches so a long range is never held in memory at once.
+        """
+        keys = set()
+        batch = []
+        for sha in commit_shas:
+            if self._db is None:
+                continue  # Still drain the stream; callers may read it for more.
+            batch.append(sha)
+            if len(batch) >= self.LOOKUP_BATCH_SIZE:
+                keys |= self._lookup(batch)
+                batch = []
+        if batch:
+            keys |= self._lookup(batch)
+        return keys
+
+    def _lookup(self, commit_shas: list[str]) -> set[str]:
+        rows = self._db.execute(
+            f"SELECT DISTINCT key FROM refs WHERE sha IN ({', '.join('?' * len(commit_shas))})",
+            commit_shas,
+        )
+        return {key for (key,) in rows}
+
+    def commits_for(self, issue_key: str) -> list[str]:
+        """
+        Returns the SHAs of the indexed commits that mention an issue.
+        """
+        if self._db is None:
+            return []
+        rows = self._db.execute("SELECT sha FROM refs WHERE key = ?", (issue_key.upper(),))
+        return [sha for (sha,) in rows]
+
+    def format_stats(self) -> str:
+        return (
+            f"Jira key index: {self.stats['commits_scanned']} new commits scanned, "
+            f"{self.stats['references_added']} issue references added."
+        )
+
+
+if __name__ == "__main__":
+    # Example usage (for testing this module independently)
+    import sys
+    import tempfile
+
+    repo = sys.argv[1] if len(sys.argv) > 1 else "."
+    projects = sys.argv[2].split(",") if len(sys.argv) > 2 else ["PROJ"]
+    print(list(iter_jira_keys(["Fix PROJ-1 (UTF-8, SHA-256)", "Merge feature/proj-22-export"], compile_key_matcher(projects))))
+    index = JiraKeyIndex(tempfile.mkdtemp(prefix="jira_keys_"), repo, projects)
+    index.update("HEAD")
+    print(index.format_stats())
+    index.update("HEAD")  # Already indexed: nothing is scanned.
+    print(index.format_stats())
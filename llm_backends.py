@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator
+
+
+class LlmBackend:
+    """
+    Base class for the language model services used to generate release notes.
+    Subclasses implement generate() and count_tokens(); the async, streaming and
+    batch variants default to running generate() in a worker thread, and should be
+    overridden where the service offers a native equivalent.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate(self, prompt: str, generation_config: dict | None = None) -> str:
+        """
+        Returns the model's complete response to a prompt.
+
+        Args:
+            prompt (str): The prompt.
+            generation_config (dict | None): Parameters such as temperature,
+                                             top_p and max_output_tokens.
+
+        Returns:
+            str: The response text.
+        """
+        raise NotImplementedError
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Returns the number of tokens `text` takes up for this model.
+        """
+        raise NotImplementedError
+
+    async def generate_async(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> str:
+        return await asyncio.to_thread(self.generate, prompt, generation_config)
+
+    async def stream(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Yields the response in text chunks as they are produced.
+        """
+        yield await self.generate_async(prompt, generation_config)
+
+    def batch(
+        self,
+        prompts: list[str],
+        generation_config: dict | None = None,
+        max_concurrency: int = 4,
+    ) -> list[str]:
+        """
+        Generates responses for several prompts concurrently.
+
+        Returns:
+            list[str]: The responses, in prompt order.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(prompts)))) as executor:
+            return list(executor.map(lambda prompt: self.generate(prompt, generation_config), prompts))
+
+
+class GeminiBackend(LlmBackend):
+    """
+    The Google Generative AI (Gemini) API.
+    """
+
+    name = "gemini"
+    DEFAULT_MODEL = "gemini-1.5-flash"
+
+    def __init__(self, model_name: str | None = None, api_key: str | None = None):
+        """
+        Initializes the GeminiBackend.
+
+        Args:
+            model_name (str | None): Model to use (default: DEFAULT_MODEL).
+            api_key (str | None): API key. Defaults to the GEMINI_API_KEY environment variable.
+        """
+        super().__init__(model_name or self.DEFAULT_MODEL)
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "GEMINI_API_KEY environment variable not set. Please provide your Google AI API key."
+            )
+        # Imported here so runs with other backends never load the SDK.
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(self.model_name)
+
+    def generate(self, prompt: str, generation_config: dict | None = None) -> str:
+        return self.model.generate_content(prompt, generation_config=generation_config).text
+
+    async def generate_async(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> str:
+        response = await self.model.generate_content_async(
+            prompt, generation_config=generation_config
+        )
+        return response.text
+
+    async def stream(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(
+            prompt, generation_config=generation_config, stream=True
+        )
+        async for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+
+    def count_tokens(self, text: str) -> int:
+        return self.model.count_tokens(text).total_tokens
+
+
+class OpenAICompatibleBackend(LlmBackend):
+    """
+    A chat-completions endpoint speaking the OpenAI HTTP API, such as a local
+    llama.cpp, vLLM, Ollama or LM Studio server.
+    """
+
+    name = "openai"
+    DEFAULT_BASE_URL = "http://localhost:8000/v1"
+    # Local servers rarely expose a tokenizer endpoint, so tokens are estimated.
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        model_name: str,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        timeout: float = 600,
+    ):
+        """
+        Initializes the OpenAICompatibleBackend.
+
+        Args:
+            model_name (str): Model name as known to the server.
+            base_url (str | None): API root, e.g. http://localhost:8000/v1.
+            api_key (str | None): Bearer token, if the server requires one.
+            timeout (float): Request timeout in seconds.
+        """
+        super().__init__(model_name)
+        self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _request(self, prompt: str, generation_config: dict | None, stream: bool):
+        config = generation_config or {}
+        body = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": stream,
+        }
+        for source, target in (
+            ("temperature", "temperature"),
+            ("top_p", "top_p"),
+            ("max_output_tokens", "max_tokens"),
+            ("stop_sequences", "stop"),
+        ):
+            if config.get(source) is not None:
+                body[target] = config[source]
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(
+            f"{self.base_url}/chat/completions",
+            data=json.dumps(body).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def generate(self, prompt: str, generation_config: dict | None = None) -> str:
+        with self._request(prompt, generation_config, stream=False) as response:
+            data = json.load(response)
+        return data["choices"][0]["message"]["content"] or ""
+
+    def iter_stream(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> Iterator[str]:
+        """
+        Blocking iterator over the server-sent events of a streamed completion.
+        """
+        with self._request(prompt, generation_config, stream=True) as response:
+            for raw_line in response:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:") :].strip()
+                if payload == "[DONE]":
+                    break
+                delta = json.loads(payload)["choices"][0].get("delta", {})
+                if delta.get("content"):
+                    yield delta["content"]
+
+    async def stream(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> AsyncIterator[str]:
+        # The HTTP stream is read in a worker thread and handed over chunk by chunk.
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        def pump():
+            try:
+                for text in self.iter_stream(prompt, generation_config):
+                    loop.call_soon_threadsafe(queue.put_nowait, text)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        threading.Thread(target=pump, daemon=True).start()
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def count_tokens(self, text: str) -> int:
+        return max(1, len(text) // self.CHARS_PER_TOKEN)
+
+
+class FakeBackend(LlmBackend):
+    """
+    A deterministic in-process stand-in for a model service, for load tests and
+    offline benchmarks. The response depends only on the prompt, and timing follows
+    a fixed time to first token, an optional prompt processing rate and a fixed
+    output throughput.
+    """
+
+    name = "fake"
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        model_name: str = "fake-model",
+        latency_seconds: float = 0.5,
+        tokens_per_second: float = 200.0,
+        response_tokens: int = 200,
+        prompt_tokens_per_second: float = 0.0,
+    ):
+        """
+        Initializes the FakeBackend.
+
+        Args:
+            model_name (str): Name reported to caches and logs.
+            latency_seconds (float): Delay before the first token.
+            tokens_per_second (float): Output throughput; 0 disables the delay.
+            response_tokens (int): Approximate length of each response.
+            prompt_tokens_per_second (float): Prompt processing rate, added to the
+                                              time to first token; 0 disables it.
+        """
+        super().__init__(model_name)
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _response(self, prompt: str) -> list[str]:
+        """
+        Builds a release-notes-shaped response from the prompt hash, as a list of
+        chunks of roughly one token each.
+        """
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        headings = ["#### New Features", "#### Bug Fixes", "#### Improvements & General Changes"]
+        bullets = [[] for _ in headings]
+        length = 0
+        index = 0
+        while length < self.response_tokens * self.CHARS_PER_TOKEN:
+            bullet = f"- Change {index + 1} ({digest[index % 56 : index % 56 + 8]}) in a prompt of {len(prompt)} characters."
+            bullets[index % len(headings)].append(bullet)
+            length += len(bullet) + 1
+            index += 1
+        lines = [f"### Release {digest[:7]}"]
+        for heading, section in zip(headings, bullets):
+            lines += ["", heading, *section]
+        text = "\n".join(lines) + "\n"
+        return [text[i : i + self.CHARS_PER_TOKEN] for i in range(0, len(text), self.CHARS_PER_TOKEN)]
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+
+    def _first_token_delay(self, prompt: str) -> float:
+        if self.prompt_tokens_per_second <= 0:
+            return self.latency_seconds
+        return self.latency_seconds + self.count_tokens(prompt) / self.prompt_tokens_per_second
+
+    def generate(self, prompt: str, generation_config: dict | None = None) -> str:
+        with self._lock:
+            self.calls += 1
+        chunks = self._response(prompt)
+        time.sleep(self._first_token_delay(prompt) + len(chunks) * self._token_delay())
+        return "".join(chunks)
+
+    async def generate_async(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> str:
+        with self._lock:
+            self.calls += 1
+        chunks = self._response(prompt)
+        await asyncio.sleep(self._first_token_delay(prompt) + len(chunks) * self._token_delay())
+        return "".join(chunks)
+
+    async def stream(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> AsyncIterator[str]:
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self._first_token_delay(prompt))
+        for chunk in self._response(prompt):
+            if self.tokens_per_second > 0:
+                await asyncio.sleep(self._token_delay())
+            yield chunk
+
+    def count_tokens(self, text: str) -> int:
+        return max(1, len(text) // self.CHARS_PER_TOKEN)
+
+
+BACKENDS = ("gemini", "openai", "fake")
+
+
+def create_backend(
+    name: str,
+    model_name: str | None = None,
+    base_url: str | None = None,
+    api_key: str | None = None,
+) -> LlmBackend:
+    """
+    Creates a backend by name, as selected on the command line.
+
+    Args:
+        name (str): One of BACKENDS.
+        model_name (str | None): Model to use; each backend has its own default.
+        base_url (str | None): API root for the "openai" backend.
+        api_key (str | None): API key; defaults to the backend's environment variable.
+
+    Returns:
+        LlmBackend: The backend.
+    """
+    if name == "gemini":
+        return GeminiBackend(model_name, api_key)
+    if name == "openai":
+        if not model_name:
+            raise ValueError("The openai backend needs a model name (--llm-model or LLM_MODEL).")
+        return OpenAICompatibleBackend(model_name, base_url, api_key or os.getenv("LLM_API_KEY"))
+    if name == "fake":
+        return FakeBackend(model_name or "fake-model")
+    raise ValueError(f"Unknown LLM backend '{name}'. Choose from: {', '.join(BACKENDS)}.")
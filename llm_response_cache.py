@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+
+from disk_cache import DiskCache
+
+
+class ResponseCache:
+    """
+    A content-addressed on-disk cache of LLM responses.
+    Responses are keyed on a hash of the model name, the final prompt and the
+    generation parameters, so rerunning the tool for the same commit returns the
+    stored notes instead of paying for another model round trip.
+    Storage, the size cap, LRU eviction and hit/miss counters come from DiskCache.
+    """
+
+    # "use" reads and writes, "refresh" skips reads but stores the new response,
+    # "bypass" neither reads nor writes.
+    CACHE_MODES = ("use", "refresh", "bypass")
+    MAX_RESPONSE_CACHE_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+    def __init__(self, cache_dir: str, mode: str = "use"):
+        """
+        Initializes the ResponseCache.
+
+        Args:
+            cache_dir (str): Directory where responses are stored.
+            mode (str): One of CACHE_MODES (default: 'use').
+        """
+        if mode not in self.CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode '{mode}'.")
+        self.mode = mode
+        self.cache = DiskCache(cache_dir, self.MAX_RESPONSE_CACHE_BYTES)
+
+    @staticmethod
+    def key(model_name: str, prompt, params: dict | None = None) -> str:
+        """
+        Returns the cache key for a model call.
+
+        Args:
+            model_name (str): The model the prompt is sent to.
+            prompt: The final prompt (any JSON-serializable value).
+            params (dict | None): Generation parameters that affect the response.
+
+        Returns:
+            str: A hex digest identifying the call.
+        """
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "params": params or {}},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Returns the cached response for a key, or None on a miss or when reads are disabled.
+        """
+        if self.mode != "use":
+            return None
+        data = self.cache.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def put(self, key: str, response: str):
+        """
+        Stores a response unless the cache is bypassed.
+        """
+        if self.mode == "bypass":
+            return
+        self.cache.put(key, response.encode("utf-8"))
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters and usage of the underlying DiskCache.
+        """
+        return self.cache.stats()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import random
+import threading
+import time
+import urllib.error
+from typing import AsyncIterator, Awaitable, Callable
+
+from llm_backends import LlmBackend
+
+
+class TokenBucket:
+    """
+    A bucket refilled continuously at `rate_per_minute` and holding at most one
+    minute's worth. reserve() debits immediately and returns how long the caller
+    has to wait, so one bucket serves threads and coroutines alike.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60
+        self.capacity = float(rate_per_minute)
+        self.level = float(rate_per_minute)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes `amount` from the bucket, going into debt if needed.
+
+        Returns:
+            float: Seconds until the debt is paid off (0 if there was enough).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            # A request larger than the bucket would otherwise never run.
+            self.level -= min(amount, self.capacity)
+            return max(0.0, -self.level / self.rate)
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase, multiplicative-decrease limit on calls in flight: the limit
+    grows by one after about `limit` successful calls and halves on throttling.
+    """
+
+    # Poll interval of coroutines waiting for a slot.
+    POLL_SECONDS = 0.05
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        while not self.try_acquire():
+            await asyncio.sleep(self.POLL_SECONDS)
+
+    def release(self, outcome: str | None):
+        """
+        Frees a slot and adapts the limit to the call's outcome: "success",
+        "throttled", or anything else to leave it unchanged.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if outcome == "throttled":
+                self.limit = max(self.minimum, self.limit / 2)
+            elif outcome == "success":
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class LlmScheduler:
+    """
+    Admits model calls under requests-per-minute and tokens-per-minute quotas and an
+    adaptive concurrency limit, and retries throttled or transient failures with
+    jittered exponential backoff. One scheduler is meant to be shared by every model
+    call in the process, so concurrent generations draw from the same quota.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 8
+    DEFAULT_MAX_RETRIES = 5
+    BASE_RETRY_DELAY_SECONDS = 1.0
+    MAX_RETRY_DELAY_SECONDS = 60.0
+    # Prompt tokens are estimated from characters before the call.
+    CHARS_PER_TOKEN = 4
+
+    THROTTLED_STATUS_CODES = {429}
+    TRANSIENT_STATUS_CODES = {408, 500, 502, 503, 504}
+    # Exception class names from the Google, LiteLLM and OpenAI client libraries,
+    # matched by name so none of them has to be importable.
+    THROTTLED_ERRORS = {"ResourceExhausted", "TooManyRequests", "RateLimitError"}
+    TRANSIENT_ERRORS = {
+        "ServiceUnavailable",
+        "InternalServerError",
+        "DeadlineExceeded",
+        "GatewayTimeout",
+        "APIConnectionError",
+        "APITimeoutError",
+        "Timeout",
+    }
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        """
+        Initializes the LlmScheduler.
+
+        Args:
+            requests_per_minute (float | None): Request quota; None for no limit.
+            tokens_per_minute (float | None): Prompt token quota; None for no limit.
+            max_concurrency (int): Upper bound of the adaptive concurrency limit.
+            max_retries (int): Retries of a throttled or transient failure before giving up.
+        """
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(max(1, max_concurrency))
+        self.max_retries = max_retries
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "failed": 0}
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LlmScheduler":
+        """
+        Creates a scheduler from LLM_RPM, LLM_TPM and LLM_MAX_CONCURRENCY.
+        """
+        return cls(
+            float(os.getenv("LLM_RPM", "0")) or None,
+            float(os.getenv("LLM_TPM", "0")) or None,
+            int(os.getenv("LLM_MAX_CONCURRENCY", str(cls.DEFAULT_MAX_CONCURRENCY))),
+        )
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        return len(text) // cls.CHARS_PER_TOKEN
+
+    @classmethod
+    def classify(cls, error: Exception) -> str | None:
+        """
+        Returns "throttled" for quota errors, "transient" for errors worth retrying,
+        or None for errors that a retry would not fix.
+        """
+        status = getattr(error, "code", None)
+        if not isinstance(status, int):
+            status = getattr(error, "status_code", None)
+        name = type(error).__name__
+        if status in cls.THROTTLED_STATUS_CODES or name in cls.THROTTLED_ERRORS:
+            return "throttled"
+        if (
+            status in cls.TRANSIENT_STATUS_CODES
+            or name in cls.TRANSIENT_ERRORS
+            or isinstance(error, (ConnectionError, TimeoutError))
+            or (isinstance(error, urllib.error.URLError) and not isinstance(error, urllib.error.HTTPError))
+        ):
+            return "transient"
+        return None
+
+    @staticmethod
+    def _retry_after(error: Exception) -> float | None:
+        headers = getattr(error, "headers", None)
+        try:
+            return float(headers.get("Retry-After")) if headers else None
+        except (TypeError, ValueError):
+            return None
+
+    def _admission_delay(self, tokens: int) -> float:
+        """
+        Reserves quota for one call and returns how long to wait before making it.
+        """
+        delay = max(0.0, self._cooldown_until - time.monotonic())
+        if self.request_bucket is not None:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket is not None and tokens:
+            delay = max(delay, self.token_bucket.reserve(tokens))
+        return delay
+
+    def _retry_delay(self, error: Exception, outcome: str | None, attempt: int) -> float:
+        """
+        Records a failed attempt and returns the backoff before the next one, or
+        re-raises the error if it is not retryable or the retries are used up.
+        """
+        with self._lock:
+            if outcome == "throttled":
+                self.stats["throttled"] += 1
+            if outcome is None or attempt >= self.max_retries:
+                self.stats["failed"] += 1
+                raise error
+            self.stats["retries"] += 1
+            # Full jitter keeps callers that failed together from retrying together.
+            delay = random.uniform(
+                0, min(self.MAX_RETRY_DELAY_SECONDS, self.BASE_RETRY_DELAY_SECONDS * 2**attempt)
+            )
+            retry_after = self._retry_after(error)
+            if retry_after is not None:
+                # The server named a time: hold back every caller until then.
+                delay = max(delay, retry_after)
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + retry_after)
+        print(
+            f"Warning: Model call {outcome} ({type(error).__name__}: {error}); "
+            f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})."
+        )
+        return delay
+
+    def _count_call(self):
+        with self._lock:
+            self.stats["calls"] += 1
+
+    def call(self, fn: Callable[[], object], tokens: int = 0):
+        """
+        Runs `fn()` under the quotas, retrying throttled and transient failures.
+
+        Args:
+            fn (Callable): The model call.
+            tokens (int): Estimated prompt tokens, charged to the token quota.
+
+        Returns:
+            The result of `fn()`.
+        """
+        self._count_call()
+        attempt = 0
+        while True:
+            time.sleep(self._admission_delay(tokens))
+            self.concurrency.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                outcome = self.classify(e)
+                self.concurrency.release(outcome)
+                time.sleep(self._retry_delay(e, outcome, attempt))
+                attempt += 1
+                continue
+            self.concurrency.release("success")
+            return result
+
+    async def call_async(self, fn: Callable[[], Awaitable], tokens: int = 0):
+        """
+        Async variant of call(); `fn()` returns the awaitable to run.
+        """
+        self._count_call()
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._admission_delay(tokens))
+            await self.concurrency.acquire_async()
+            try:
+                result = await fn()
+            except Exception as e:
+                outcome = self.classify(e)
+                self.concurrency.release(outcome)
+                await asyncio.sleep(self._retry_delay(e, outcome, attempt))
+                attempt += 1
+                continue
+            self.concurrency.release("success")
+            return result
+
+    async def stream(self, fn: Callable[[], AsyncIterator], tokens: int = 0) -> AsyncIterator:
+        """
+        Streaming variant of call(); `fn()` returns the async iterator to consume.
+        A failure is only retried before the first item, since items already
+        yielded cannot be taken back.
+        """
+        self._count_call()
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._admission_delay(tokens))
+            await self.concurrency.acquire_async()
+            outcome = None
+            started = False
+            try:
+                async for item in fn():
+                    started = True
+                    yield item
+                outcome = "success"
+            except Exception as e:
+                outcome = self.classify(e)
+                if started:
+                    with self._lock:
+                        self.stats["failed"] += 1
+                    raise
+                delay = self._retry_delay(e, outcome, attempt)
+            finally:
+                self.concurrency.release(outcome)
+            if outcome == "success":
+                return
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def format_stats(self) -> str:
+        return (
+            f"Model calls: {self.stats['calls']}, retries: {self.stats['retries']}, "
+            f"throttled: {self.stats['throttled']}, failed: {self.stats['failed']}, "
+            f"concurrency limit: {int(self.concurrency.limit)}."
+        )
+
+
+class ScheduledBackend(LlmBackend):
+    """
+    Routes every call of a backend through an LlmScheduler.
+    """
+
+    def __init__(self, backend: LlmBackend, scheduler: LlmScheduler):
+        super().__init__(backend.model_name)
+        self.backend = backend
+        self.scheduler = scheduler
+        self.name = backend.name
+
+    def generate(self, prompt: str, generation_config: dict | None = None) -> str:
+        return self.scheduler.call(
+            lambda: self.backend.generate(prompt, generation_config),
+            self.scheduler.estimate_tokens(prompt),
+        )
+
+    async def generate_async(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> str:
+        return await self.scheduler.call_async(
+            lambda: self.backend.generate_async(prompt, generation_config),
+            self.scheduler.estimate_tokens(prompt),
+        )
+
+    async def stream(
+        self, prompt: str, generation_config: dict | None = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self.scheduler.stream(
+            lambda: self.backend.stream(prompt, generation_config),
+            self.scheduler.estimate_tokens(prompt),
+        ):
+            yield chunk
+
+    def count_tokens(self, text: str) -> int:
+        return self.backend.count_tokens(text)
@@ -1,14 +1,385 @@
 import os
+import sys
+import asyncio
 import argparse
+import functools
+import subprocess
+from typing import Callable
 from dotenv import load_dotenv  # For loading environment variables from a .env file
 
+from commit_notes import CommitNotesCache
+from components import load_components
 from repo_manager import RepoManager
+from jira_key_index import JiraReferences
 from jira_integrator import JiraIntegrator
-from release_note_generator import ReleaseNoteGenerator
+from jira_cache import JiraIssueCache
+from release_note_generator import ReleaseNoteGenerator, iter_markdown_sections
+from llm_response_cache import ResponseCache
+from llm_backends import BACKENDS, create_backend
+from llm_scheduler import LlmScheduler
+from prompt_builder import PromptBuilder
+from context_cache import ContextCache, create_context_cache_backend
 from output_writer import OutputWriter
+from pipeline_timer import PipelineTimer
 from teams_integrator import TeamsIntegrator  # <-- IMPORT THE NEW CLASS
 
 
+async def stream_notes_to_outputs(chunks, notes_file) -> str:
+    """
+    Echoes streamed release notes to the terminal and the output file as they
+    arrive, and returns the complete notes once the stream ends.
+
+    Args:
+        chunks: Async iterator of text chunks from ReleaseNoteGenerator.stream_release_notes().
+        notes_file: Open file the notes are written to.
+
+    Returns:
+        str: The complete release notes.
+    """
+
+    parts = []
+
+    def write_chunk(chunk: str):
+        parts.append(chunk)
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+        notes_file.write(chunk)
+        notes_file.flush()
+
+    section_count = 0
+    async for _ in iter_markdown_sections(chunks, on_chunk=write_chunk):
+        section_count += 1
+    print(f"\n--- Streamed {section_count} sections ---")
+    return "".join(parts)
+
+
+async def run_pipeline(
+    args,
+    repo_manager: RepoManager,
+    create_jira_integrator: Callable[[], JiraIntegrator],
+    release_note_generator: ReleaseNoteGenerator,
+    output_writer: OutputWriter,
+    teams_webhook_url: str | None,
+    components: list | None = None,
+):
+    """
+    Runs the pipeline from repository extraction to delivery. Independent stages
+    overlap: the git extraction and the Jira fetch run concurrently, and so do
+    saving the file and posting to Teams. Blocking calls run in worker threads,
+    and the time of every stage is reported at the end.
+
+    Args:
+        args: Parsed command-line arguments.
+        repo_manager (RepoManager): Extracts diffs and codebase content.
+        create_jira_integrator (Callable): Returns the JiraIntegrator. Connecting to
+                                           Jira is part of the Jira stage.
+        release_note_generator (ReleaseNoteGenerator): Generates the notes.
+        output_writer (OutputWriter): Saves the notes.
+        teams_webhook_url (str | None): Teams webhook, used with --send-to-teams.
+        components (list | None): Monorepo components loaded from --components.
+    """
+    timer = PipelineTimer()
+    # Range extractions walk the range's history anyway and collect its Jira
+    # references on the way; other modes look them up separately.
+    to_ref = args.to_ref or args.branch
+    references = (
+        JiraReferences([args.jira_project_key], to_ref)
+        if args.from_ref and components is None
+        else None
+    )
+
+    def extract_repo() -> dict:
+        try:
+            return read_repo()
+        finally:
+            if references is not None:
+                # Never leave the Jira stage waiting, even if the walk failed.
+                references.finish("The git stage did not read the release range.")
+
+    def read_repo() -> dict:
+        result = {
+            "diff_text": "",
+            "commit_sha": "",
+            "all_codebase_content": {},
+            "commit_log": "",
+            "component_slices": None,
+            "range_commits": [],
+        }
+        if components is not None:
+            print(
+                f"Splitting changes on {args.branch} into {len(components)} components for local repo at {args.repo_path}..."
+            )
+            result["commit_sha"], result["component_slices"], repo_error = (
+                repo_manager.get_component_slices(
+                    args.repo_path,
+                    components,
+                    args.to_ref or args.branch,
+                    args.from_ref,
+                    args.context_mode,
+                    args.write_commit_graph,
+                )
+            )
+            result["diff_text"] = "".join(
+                component_slice["diff_text"] for component_slice in result["component_slices"]
+            )
+        elif args.generation_mode == "per-commit":
+            print(
+                f"Listing commits of release range {args.from_ref}..{to_ref} for local repo at {args.repo_path}..."
+            )
+            result["commit_sha"], result["range_commits"], result["commit_log"], repo_error = (
+                repo_manager.get_range_commits(
+                    args.repo_path, args.from_ref, to_ref, references
+                )
+            )
+            # Each commit's diff is read only if its notes are not cached yet.
+            result["diff_text"] = f"{len(result['range_commits'])} commits"
+        elif args.from_ref:
+            print(
+                f"Fetching release range {args.from_ref}..{to_ref} and codebase content for local repo at {args.repo_path}..."
+            )
+            (
+                result["diff_text"],
+                result["commit_sha"],
+                result["all_codebase_content"],
+                result["commit_log"],
+                repo_error,
+            ) = repo_manager.get_range_diff_and_full_codebase(
+                args.repo_path, args.from_ref, to_ref, args.context_mode, references
+            )
+        else:
+            print(
+                f"Fetching last diff and full codebase content for local repo at {args.repo_path} on branch {args.branch}..."
+            )
+            (
+                result["diff_text"],
+                result["commit_sha"],
+                result["all_codebase_content"],
+                repo_error,
+            ) = repo_manager.get_last_diff_and_full_codebase(
+                args.repo_path, args.branch, args.context_mode
+            )
+        result["repo_error"] = repo_error
+        return result
+
+    def fetch_jira() -> list[dict]:
+        # Only the issues the range refers to are fetched. In range modes their keys
+        # come from the git stage's walk; otherwise from the persistent key index.
+        if references is not None:
+            issue_keys, first_date, last_date, references_error = references.wait()
+        else:
+            issue_keys, first_date, last_date, references_error = (
+                repo_manager.get_jira_references(
+                    args.repo_path, to_ref, [args.jira_project_key], args.from_ref
+                )
+            )
+        if references_error:
+            # Without the range's keys or dates the lookup would fall back to the
+            # project's latest issues, which have nothing to do with this release.
+            print("Skipping Jira: the release range's issue references could not be read.")
+            return []
+        jira_integrator = create_jira_integrator()
+        print(f"Fetching Jira notes for project: {args.jira_project_key}...")
+        jira_data = jira_integrator.get_jira_notes_for_range(
+            args.jira_project_key, issue_keys, first_date, last_date
+        )
+        print(jira_integrator.format_search_stats())
+        if jira_integrator.issue_cache is not None:
+            print(jira_integrator.issue_cache.format_stats())
+        return jira_data
+
+    # 4./5. Get the diff and codebase content from the local repository and the
+    # Jira notes referenced by its commits, concurrently
+    repo, jira_data = await asyncio.gather(
+        timer.run("git", extract_repo), timer.run("jira", fetch_jira)
+    )
+    commit_sha = repo["commit_sha"]
+    diff_text = repo["diff_text"]
+    all_codebase_content = repo["all_codebase_content"]
+    commit_log = repo["commit_log"]
+    component_slices = repo["component_slices"]
+
+    if repo["repo_error"]:
+        print(f"Failed to get diff or codebase content: {repo['repo_error']}")
+        return
+
+    if component_slices is not None and not component_slices:
+        print("No component has changes in this range. Nothing to generate.")
+        return
+
+    if not diff_text:
+        print(
+            "No significant diff found. Generating notes based on full codebase and Jira if available."
+        )
+
+    if not jira_data:
+        print("No Jira issues found or accessible for this project.")
+
+    # 6. Generate release notes
+    print(
+        "Generating release notes using Google Generative AI (with full codebase context)..."
+    )
+    saved_filepath = ""
+    if component_slices:
+        generated_notes = await timer.run(
+            "generate",
+            release_note_generator.generate_component_release_notes,
+            component_slices,
+            jira_data,
+            commit_sha,
+            args.component_workers,
+            args.generation_mode,
+        )
+    elif args.generation_mode == "per-commit":
+        generated_notes = await timer.run(
+            "generate",
+            release_note_generator.generate_release_notes_per_commit,
+            repo["range_commits"],
+            lambda commit: repo_manager.get_commit_diff(args.repo_path, commit),
+            jira_data,
+            commit_sha,
+            commit_log,
+            args.map_concurrency,
+            [args.jira_project_key],
+        )
+    elif args.generation_mode == "map-reduce":
+        generated_notes = await timer.run(
+            "generate",
+            release_note_generator.generate_release_notes_map_reduce,
+            diff_text,
+            jira_data,
+            commit_sha,
+            all_codebase_content,
+            commit_log,
+            args.map_concurrency,
+        )
+    elif args.stream:
+        notes_file, saved_filepath = output_writer.open_release_notes_stream(
+            args.output_dir
+        )
+        if notes_file is None:
+            return
+        try:
+            with notes_file:
+                generated_notes = await timer.measure(
+                    "generate",
+                    stream_notes_to_outputs(
+                        release_note_generator.stream_release_notes(
+                            diff_text,
+                            jira_data,
+                            commit_sha,
+                            all_codebase_content,
+                            commit_log,
+                        ),
+                        notes_file,
+                    ),
+                )
+        except Exception as e:
+            print(f"Error generating content with {release_note_generator.model_name}: {e}")
+            os.remove(saved_filepath)
+            generated_notes = f"Error: Could not generate release notes. {e}"
+    else:
+        generated_notes = await timer.run(
+            "generate",
+            release_note_generator.generate_release_notes,
+            diff_text,
+            jira_data,
+            commit_sha,
+            all_codebase_content,
+            commit_log,
+        )
+
+    if "Error: Could not generate release notes" in generated_notes:
+        print(f"Failed to generate release notes:\n{generated_notes}")
+        return
+
+    # 7./8. Save release notes to file (streamed notes are already on disk) and
+    # send them to Teams if the flag is set, concurrently
+    deliveries = []
+    if saved_filepath:
+        print(f"Release notes streamed to: {saved_filepath}")
+    else:
+        print("Saving generated release notes...")
+        deliveries.append(
+            timer.run(
+                "write",
+                output_writer.save_release_notes_to_file,
+                generated_notes,
+                args.output_dir,
+            )
+        )
+    if args.send_to_teams:
+        teams_integrator = TeamsIntegrator(teams_webhook_url)
+        deliveries.append(
+            timer.run("teams", teams_integrator.send_release_notes, generated_notes, commit_sha)
+        )
+    results = await asyncio.gather(*deliveries)
+    if not saved_filepath:
+        saved_filepath = results[0]
+
+    cache_stats = release_note_generator.response_cache.stats()
+    print(
+        f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses."
+    )
+    print(release_note_generator.scheduler.format_stats())
+    print(timer.report())
+
+    if saved_filepath:
+        print(f"\nProcess completed. Release notes available at: {saved_filepath}")
+    else:
+        print("\nProcess completed with issues: Could not save release notes.")
+
+
+def _nearest_writable(path: str) -> bool:
+    """
+    Returns whether `path`, or the nearest existing directory above it, is writable.
+    """
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        path = os.path.dirname(path)
+    return os.path.isdir(path) and os.access(path, os.W_OK)
+
+
+def check_setup(args) -> list[str]:
+    """
+    Validates repository state and output locations without loading any SDK or
+    contacting the model service, Jira or Teams.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        list[str]: Problems found; empty if the run can start.
+    """
+    problems = []
+    if args.llm_backend == "openai" and not args.llm_model:
+        problems.append("The openai backend needs a model name (--llm-model or LLM_MODEL).")
+    git_dir = subprocess.run(
+        ["git", "-C", args.repo_path, "rev-parse", "--git-dir"],
+        capture_output=True,
+        text=True,
+    )
+    if git_dir.returncode != 0:
+        problems.append(f"'{args.repo_path}' is not a Git repository.")
+    else:
+        refs = [args.branch] + [ref for ref in (args.from_ref, args.to_ref) if ref]
+        for ref in refs:
+            resolved = subprocess.run(
+                ["git", "-C", args.repo_path, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+                capture_output=True,
+                text=True,
+            )
+            if resolved.returncode != 0:
+                problems.append(f"Ref '{ref}' does not resolve to a commit in '{args.repo_path}'.")
+            else:
+                print(f"Ref {ref}: {resolved.stdout.strip()[:7]}")
+
+    cache_dir = args.cache_dir or os.getenv("RELEASE_NOTES_CACHE_DIR") or RepoManager.DEFAULT_CACHE_DIR
+    for label, path in (("Output directory", args.output_dir), ("Cache directory", cache_dir)):
+        if not _nearest_writable(path):
+            problems.append(f"{label} '{path}' is not writable.")
+    return problems
+
+
 def main():
     """
     Main function to orchestrate the release note generation process.
@@ -43,6 +414,157 @@ def main():
         help="Send the generated release notes to a Microsoft Teams channel.",
     )
 
+    parser.add_argument(
+        "--from",
+        dest="from_ref",
+        default=None,
+        help="Start of a release range (ref or tag, exclusive). Generates notes for every commit in --from..--to instead of only the last commit.",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_ref",
+        default=None,
+        help="End of a release range (ref or tag, inclusive; default: --branch).",
+    )
+    parser.add_argument(
+        "--context-mode",
+        choices=RepoManager.CONTEXT_MODES,
+        default="full",
+        help="Codebase context to send: 'full' file bodies, or 'skeleton' outlines for files not touched by the diff (default: full).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for on-disk caches (default: $RELEASE_NOTES_CACHE_DIR or ~/.cache/release_notes_agent).",
+    )
+
+    parser.add_argument(
+        "--components",
+        default=None,
+        help="JSON file mapping monorepo path prefixes to Jira components. Generates one section per changed component, in parallel.",
+    )
+    parser.add_argument(
+        "--component-workers",
+        type=int,
+        default=4,
+        help="Maximum number of components generated concurrently (default: 4).",
+    )
+    parser.add_argument(
+        "--write-commit-graph",
+        action="store_true",
+        help="With --components, write a commit-graph with changed-path Bloom filters into the repository if it has none. The repository is never modified otherwise.",
+    )
+    parser.add_argument(
+        "--generation-mode",
+        choices=ReleaseNoteGenerator.GENERATION_MODES,
+        default="single",
+        help="'single' sends one prompt; 'map-reduce' summarizes diff chunks concurrently and merges them, for large releases; 'per-commit' reuses cached notes of each commit in a --from range and polishes their merge (default: single).",
+    )
+    parser.add_argument(
+        "--map-concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent chunk summaries in map-reduce mode, or commits in per-commit mode (default: 8).",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=ResponseCache.CACHE_MODES,
+        default="use",
+        help="Model response cache: 'use' stored responses, 'refresh' them with a new call, or 'bypass' the cache (default: use).",
+    )
+    parser.add_argument(
+        "--jira-cache",
+        choices=JiraIssueCache.CACHE_MODES,
+        default="use",
+        help="Local Jira issue cache: 'use' it while fresh and sync only updated issues when stale, 'refresh' to sync on every run, or 'bypass' it (default: use).",
+    )
+    parser.add_argument(
+        "--jira-cache-max-age",
+        type=float,
+        default=JiraIssueCache.DEFAULT_MAX_AGE_SECONDS / 60,
+        help=f"Minutes a synced Jira project is served from the cache without contacting Jira (default: {JiraIssueCache.DEFAULT_MAX_AGE_SECONDS // 60}).",
+    )
+    parser.add_argument(
+        "--context-cache",
+        action="store_true",
+        help="Keep the codebase part of the prompt in a context cache (Gemini's explicit cache, or a stable in-process prefix for other backends), so reruns over an unchanged codebase only pay for the diff and tickets.",
+    )
+    parser.add_argument(
+        "--context-cache-ttl",
+        type=int,
+        default=ContextCache.DEFAULT_TTL_SECONDS,
+        help=f"Lifetime in seconds of cached codebase contexts (default: {ContextCache.DEFAULT_TTL_SECONDS}).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the release notes to the terminal and the output file while they are generated (single generation mode only).",
+    )
+    parser.add_argument(
+        "--llm-backend",
+        choices=BACKENDS,
+        default=os.getenv("LLM_BACKEND", "gemini"),
+        help="Model service: 'gemini', a local OpenAI-compatible 'openai' server, or a deterministic 'fake' for offline runs (default: $LLM_BACKEND or gemini).",
+    )
+    parser.add_argument(
+        "--llm-model",
+        default=os.getenv("LLM_MODEL"),
+        help="Model name for the backend (default: $LLM_MODEL or the backend's default).",
+    )
+    parser.add_argument(
+        "--llm-base-url",
+        default=os.getenv("LLM_BASE_URL"),
+        help="API root of the OpenAI-compatible server (default: $LLM_BASE_URL or http://localhost:8000/v1).",
+    )
+    parser.add_argument(
+        "--diff-token-budget",
+        type=int,
+        default=PromptBuilder.DEFAULT_BUDGETS["diff"],
+        help=f"Token budget for the diff section of the prompt (default: {PromptBuilder.DEFAULT_BUDGETS['diff']}).",
+    )
+    parser.add_argument(
+        "--jira-token-budget",
+        type=int,
+        default=PromptBuilder.DEFAULT_BUDGETS["jira"],
+        help=f"Token budget for the Jira tickets section of the prompt (default: {PromptBuilder.DEFAULT_BUDGETS['jira']}).",
+    )
+    parser.add_argument(
+        "--codebase-token-budget",
+        type=int,
+        default=PromptBuilder.DEFAULT_BUDGETS["codebase"],
+        help=f"Token budget for the codebase section; larger codebases fall back to relevant files, outlines, then the diff alone (default: {PromptBuilder.DEFAULT_BUDGETS['codebase']}).",
+    )
+    parser.add_argument(
+        "--token-counter",
+        choices=["estimate", "backend"],
+        default="estimate",
+        help="Measure prompt sections with a 4-characters-per-token 'estimate', or with the backend's tokenizer (one extra API call per section for gemini) (default: estimate).",
+    )
+
+    parser.add_argument(
+        "--llm-rpm",
+        type=float,
+        default=float(os.getenv("LLM_RPM", "0")),
+        help="Model requests per minute allowed by the quota; 0 for no limit (default: $LLM_RPM or 0).",
+    )
+    parser.add_argument(
+        "--llm-tpm",
+        type=float,
+        default=float(os.getenv("LLM_TPM", "0")),
+        help="Model prompt tokens per minute allowed by the quota; 0 for no limit (default: $LLM_TPM or 0).",
+    )
+    parser.add_argument(
+        "--llm-max-concurrency",
+        type=int,
+        default=int(os.getenv("LLM_MAX_CONCURRENCY", str(LlmScheduler.DEFAULT_MAX_CONCURRENCY))),
+        help="Upper bound of concurrent model calls; lowered automatically while throttled (default: $LLM_MAX_CONCURRENCY or 8).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Validate credentials, repository refs, components and output locations, then exit without generating anything.",
+    )
+
     args = parser.parse_args()
 
     # 2. Get environment variables for credentials
@@ -52,7 +574,7 @@ def main():
     jira_api_token = os.getenv("JIRA_API_TOKEN")
     teams_webhook_url = os.getenv("TEAMS_WEBHOOK_URL")  # <-- GET TEAMS WEBHOOK
 
-    if not gemini_api_key:
+    if args.llm_backend == "gemini" and not gemini_api_key:
         print("Error: GEMINI_API_KEY environment variable not set.")
         return
     if not all([jira_server_url, jira_user_email, jira_api_token]):
@@ -68,66 +590,84 @@ def main():
         )
         return
 
-    print("Starting release note generation process...")
+    if args.components and args.generation_mode == "per-commit":
+        print("Error: --generation-mode per-commit cannot be combined with --components.")
+        return
+    if args.generation_mode == "per-commit" and not args.from_ref:
+        print("Error: --generation-mode per-commit needs a release range (--from).")
+        return
+    components = None
+    if args.components:
+        try:
+            components = load_components(args.components)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: Could not load components from '{args.components}': {e}")
+            return
 
-    # 3. Initialize modules
-    repo_manager = RepoManager()
-    jira_integrator = JiraIntegrator(jira_server_url, jira_api_token, jira_user_email)
-    release_note_generator = ReleaseNoteGenerator()
-    output_writer = OutputWriter()
+    if args.check:
+        problems = check_setup(args)
+        for problem in problems:
+            print(f"Error: {problem}")
+        if problems:
+            sys.exit(1)
+        print("Check passed: configuration and repository are ready for generation.")
+        return
 
-    # 4. Get last diff and full codebase content from local repository
-    print(
-        f"Fetching last diff and full codebase content for local repo at {args.repo_path} on branch {args.branch}..."
-    )
-    diff_text, commit_sha, all_codebase_content, repo_error = (
-        repo_manager.get_last_diff_and_full_codebase(args.repo_path, args.branch)
-    )
+    print("Starting release note generation process...")
 
-    if repo_error:
-        print(f"Failed to get diff or codebase content: {repo_error}")
+    # 3. Initialize modules
+    repo_manager = RepoManager(cache_dir=args.cache_dir)
+    try:
+        backend = create_backend(args.llm_backend, args.llm_model, args.llm_base_url)
+    except ValueError as e:
+        print(f"Error: {e}")
         return
-
-    if not diff_text:
-        print(
-            "No significant diff found. Generating notes based on full codebase and Jira if available."
+    context_cache = None
+    if args.context_cache:
+        context_cache = ContextCache(
+            create_context_cache_backend(backend),
+            os.path.join(repo_manager.cache_dir, "llm"),
+            args.context_cache_ttl,
         )
-
-    # 5. Get Jira notes for the project
-    print(f"Fetching Jira notes for project: {args.jira_project_key}...")
-    jira_data = jira_integrator.get_jira_notes_by_project(args.jira_project_key)
-
-    if not jira_data:
-        print("No Jira issues found or accessible for this project.")
-
-    # 6. Generate release notes
-    print(
-        "Generating release notes using Google Generative AI (with full codebase context)..."
-    )
-    generated_notes = release_note_generator.generate_release_notes(
-        diff_text, jira_data, commit_sha, all_codebase_content
+    release_note_generator = ReleaseNoteGenerator(
+        ResponseCache(os.path.join(repo_manager.cache_dir, "llm"), args.llm_cache),
+        context_cache,
+        backend,
+        PromptBuilder(
+            {
+                "diff": args.diff_token_budget,
+                "jira": args.jira_token_budget,
+                "codebase": args.codebase_token_budget,
+            },
+            backend.count_tokens if args.token_counter == "backend" else None,
+        ),
+        LlmScheduler(args.llm_rpm or None, args.llm_tpm or None, args.llm_max_concurrency),
+        CommitNotesCache(os.path.join(repo_manager.cache_dir, "commit_notes"), args.llm_cache),
     )
+    output_writer = OutputWriter()
 
-    if "Error: Could not generate release notes" in generated_notes:
-        print(f"Failed to generate release notes:\n{generated_notes}")
-        return
-
-    # 7. Save release notes to file
-    print("Saving generated release notes...")
-    saved_filepath = output_writer.save_release_notes_to_file(
-        generated_notes, args.output_dir
+    asyncio.run(
+        run_pipeline(
+            args,
+            repo_manager,
+            functools.partial(
+                JiraIntegrator,
+                jira_server_url,
+                jira_api_token,
+                jira_user_email,
+                JiraIssueCache(
+                    os.path.join(repo_manager.cache_dir, "jira"),
+                    args.jira_cache,
+                    args.jira_cache_max_age * 60,
+                ),
+            ),
+            release_note_generator,
+            output_writer,
+            teams_webhook_url,
+            components,
+        )
     )
 
-    # 8. Send release notes to Teams if the flag is set
-    if args.send_to_teams and saved_filepath:
-        teams_integrator = TeamsIntegrator(teams_webhook_url)
-        teams_integrator.send_release_notes(generated_notes, commit_sha)
-
-    if saved_filepath:
-        print(f"\nProcess completed. Release notes available at: {saved_filepath}")
-    else:
-        print("\nProcess completed with issues: Could not save release notes.")
-
 
 if __name__ == "__main__":
     main()
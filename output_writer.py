@@ -2,6 +2,7 @@
 
 import datetime
 import os
+from typing import TextIO
 
 
 class OutputWriter:
@@ -29,9 +30,7 @@ class OutputWriter:
         Returns:
             str: The full path to the saved file, or an empty string if saving failed.
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"release_notes_{timestamp}.md"
-        filepath = os.path.join(output_dir, filename)
+        filepath = self._timestamped_path(output_dir)
 
         try:
             # Ensure the output directory exists
@@ -45,6 +44,32 @@ class OutputWriter:
             print(f"Error saving release notes to file '{filepath}': {e}")
             return ""
 
+    def _timestamped_path(self, output_dir: str) -> str:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"release_notes_{timestamp}.md"
+        return os.path.join(output_dir, filename)
+
+    def open_release_notes_stream(
+        self, output_dir: str = "release_notes"
+    ) -> tuple[TextIO | None, str]:
+        """
+        Opens a timestamped Markdown file for release notes that are written
+        incrementally while they are generated. The caller writes to and closes the file.
+
+        Args:
+            output_dir (str): The directory where the file will be created.
+
+        Returns:
+            tuple[TextIO | None, str]: The open file and its path, or (None, "") on failure.
+        """
+        filepath = self._timestamped_path(output_dir)
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            return open(filepath, "w", encoding="utf-8"), filepath
+        except Exception as e:
+            print(f"Error creating release notes file '{filepath}': {e}")
+            return None, ""
+
 
 if __name__ == "__main__":
     # Example usage (for testing this module independently)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+
+class PipelineTimer:
+    """
+    Runs the stages of the release notes pipeline on an event loop, with blocking
+    stages (GitPython, Jira, file and webhook I/O) offloaded to worker threads so
+    that independent stages overlap, and records how long each stage took.
+    """
+
+    def __init__(self):
+        """
+        Initializes the PipelineTimer. The total time is measured from here.
+        """
+        self.timings = {}  # stage name -> seconds, in completion order
+        self._start = time.perf_counter()
+
+    async def run(self, stage: str, func: Callable, *args):
+        """
+        Runs a blocking call in a worker thread and times it.
+
+        Args:
+            stage (str): Name of the stage in the report.
+            func (Callable): The blocking function.
+            *args: Arguments for `func`.
+
+        Returns:
+            The result of `func(*args)`.
+        """
+        return await self.measure(stage, asyncio.to_thread(func, *args))
+
+    async def measure(self, stage: str, awaitable: Awaitable):
+        """
+        Awaits a coroutine that already runs on the event loop and times it.
+        """
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+
+    def report(self) -> str:
+        """
+        Formats the stage timings, the total time and the time saved by overlapping.
+        """
+        total = time.perf_counter() - self._start
+        lines = ["--- Stage timings ---"]
+        for stage, seconds in self.timings.items():
+            lines.append(f"{stage:<10} {seconds:8.2f}s")
+        staged = sum(self.timings.values())
+        lines.append(f"{'total':<10} {total:8.2f}s")
+        if staged - total >= 0.01:
+            lines.append(f"Overlapping stages saved {staged - total:.2f}s.")
+        return "\n".join(lines)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+
+import re
+from typing import Callable, NamedTuple
+
+from symbol_index import SymbolIndex
+
+
+class PromptSections(NamedTuple):
+    """
+    The budgeted sections of a release-notes prompt and their size report.
+    `stable` tells whether the codebase section is independent of the diff (every
+    file in full, none ranked, truncated or outlined for it, here or by RepoManager),
+    so it may be cached as a prefix.
+    """
+
+    diff: str
+    jira: str
+    codebase: str
+    level: str
+    report: dict
+    stable: bool
+
+
+class PromptBuilder:
+    """
+    Assembles the diff, Jira and codebase sections of a release-notes prompt, each
+    within its own token budget. Tickets are encoded as a compact table rather than
+    indented JSON, and a codebase that does not fit degrades step by step: the full
+    context, then the files most relevant to the diff, then outlines, then the diff
+    alone. Every build records how many tokens each section takes.
+    """
+
+    # Codebase context levels, from richest to leanest.
+    CONTEXT_LEVELS = ("full", "relevant", "outline", "diff-only")
+    # Token budgets per section.
+    DEFAULT_BUDGETS = {"diff": 200000, "jira": 20000, "codebase": 150000}
+    # Characters per token when no tokenizer is given.
+    CHARS_PER_TOKEN = 4
+    # Room kept for the note appended to a truncated section.
+    TRUNCATION_NOTE_CHARS = 100
+    # Description characters kept per ticket in the table.
+    MAX_TICKET_DESCRIPTION_CHARS = 200
+    TICKET_COLUMNS = (
+        ("key", "Key"),
+        ("issue_type", "Type"),
+        ("status", "Status"),
+        ("priority", "Priority"),
+        ("components", "Components"),
+        ("summary", "Summary"),
+    )
+
+    def __init__(
+        self,
+        budgets: dict | None = None,
+        count_tokens: Callable[[str], int] | None = None,
+    ):
+        """
+        Initializes the PromptBuilder.
+
+        Args:
+            budgets (dict | None): Token budgets by section ("diff", "jira", "codebase");
+                                   missing sections use DEFAULT_BUDGETS.
+            count_tokens (Callable | None): Tokenizer, e.g. LlmBackend.count_tokens.
+                                            Each section is measured once and the
+                                            resulting characters-per-token ratio is used
+                                            while trimming it. Defaults to an estimate.
+        """
+        self.budgets = {**self.DEFAULT_BUDGETS, **(budgets or {})}
+        self.count_tokens = count_tokens
+
+    def _measure(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.count_tokens is not None:
+            try:
+                return self.count_tokens(text)
+            except Exception as e:
+                print(f"Warning: Token counting failed, estimating token counts instead: {e}")
+                self.count_tokens = None
+        return -(-len(text) // self.CHARS_PER_TOKEN)
+
+    def _calibrate(self, text: str) -> tuple[int, float]:
+        """
+        Returns the token count of `text` and its characters-per-token ratio.
+        """
+        tokens = self._measure(text)
+        return tokens, (len(text) / tokens if tokens else float(self.CHARS_PER_TOKEN))
+
+    def _report(self, section: str, text: str, measured: str, tokens: int, ratio: float, detail: str) -> dict:
+        # Only the untrimmed text was measured; trimmed text is estimated from its ratio.
+        if text != measured:
+            tokens = round(len(text) / ratio)
+        return {
+            "tokens": tokens,
+            "budget": self.budgets[section],
+            "chars": len(text),
+            "detail": detail,
+        }
+
+    @staticmethod
+    def _split_files(diff_text: str) -> list[str]:
+        return [part for part in re.split(r"(?m)^(?=diff --git )", diff_text) if part]
+
+    @classmethod
+    def _diff_paths(cls, diff_text: str) -> set[str]:
+        return {
+            part.split("\n", 1)[0].split(" b/", 1)[-1]
+            for part in cls._split_files(diff_text)
+            if part.startswith("diff --git ")
+        }
+
+    def fit_diff(self, diff_text: str) -> tuple[str, dict]:
+        """
+        Keeps whole file diffs, in order, while they fit the diff budget.
+        """
+        tokens, ratio = self._calibrate(diff_text)
+        if tokens <= self.budgets["diff"]:
+            return diff_text, self._report("diff", diff_text, diff_text, tokens, ratio, "")
+
+        char_budget = int(self.budgets["diff"] * ratio) - self.TRUNCATION_NOTE_CHARS
+        files = self._split_files(diff_text)
+        kept = []
+        length = 0
+        for part in files:
+            if length + len(part) > char_budget:
+                break
+            kept.append(part)
+            length += len(part)
+        if not kept:
+            kept = [files[0][: max(0, char_budget)]]
+        omitted = len(files) - len(kept)
+        text = (
+            "".join(kept).rstrip("\n")
+            + f"\n... (diff truncated to fit the prompt: {omitted} of {len(files)} files omitted)\n"
+        )
+        detail = f"truncated, {len(files) - omitted} of {len(files)} files"
+        return text, self._report("diff", text, diff_text, tokens, ratio, detail)
+
+    @staticmethod
+    def _cell(value) -> str:
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(str(item) for item in value)
+        return " ".join(str(value or "").split()).replace("|", "/")
+
+    @classmethod
+    def format_tickets(cls, jira_data: list[dict], with_descriptions: bool = True) -> str:
+        """
+        Encodes tickets as a pipe-separated table with one row per ticket.
+
+        Args:
+            jira_data (list[dict]): Jira issue details (see JiraIntegrator).
+            with_descriptions (bool): Add the start of each description as a last column.
+
+        Returns:
+            str: The table, or "(none)" if there are no tickets.
+        """
+        if not jira_data:
+            return "(none)"
+        header = [title for _, title in cls.TICKET_COLUMNS]
+        if with_descriptions:
+            header.append("Description")
+        rows = [" | ".join(header)]
+        for issue in jira_data:
+            cells = [cls._cell(issue.get(field)) for field, _ in cls.TICKET_COLUMNS]
+            if with_descriptions:
+                cells.append(
+                    cls._cell(issue.get("description"))[: cls.MAX_TICKET_DESCRIPTION_CHARS]
+                )
+            rows.append(" | ".join(cells))
+        return "\n".join(rows)
+
+    def fit_tickets(self, jira_data: list[dict]) -> tuple[str, dict]:
+        """
+        Encodes tickets within the Jira budget: with descriptions if they fit, then
+        without, then with the last rows dropped.
+
+        Returns:
+            tuple[str, dict]: The ticket table and its size report.
+        """
+        text = self.format_tickets(jira_data)
+        tokens, ratio = self._calibrate(text)
+        if tokens <= self.budgets["jira"]:
+            return text, self._report("jira", text, text, tokens, ratio, f"{len(jira_data)} tickets")
+
+        char_budget = int(self.budgets["jira"] * ratio) - self.TRUNCATION_NOTE_CHARS
+        table = self.format_tickets(jira_data, with_descriptions=False)
+        rows = table.split("\n")
+        kept = []
+        length = 0
+        for row in rows:
+            if length + len(row) + 1 > char_budget:
+                break
+            kept.append(row)
+            length += len(row) + 1
+        omitted = len(jira_data) - max(0, len(kept) - 1)
+        if omitted:
+            kept.append(f"... ({omitted} more tickets omitted to fit the prompt)")
+        trimmed = "\n".join(kept)
+        detail = f"{len(jira_data) - omitted} of {len(jira_data)} tickets, descriptions dropped"
+        return trimmed, self._report("jira", trimmed, text, tokens, ratio, detail)
+
+    @staticmethod
+    def _file_block(file_path: str, content: str) -> str:
+        return f"### File: {file_path}\n```\n{content}\n```\n\n"
+
+    @classmethod
+    def _render_files(cls, files: dict) -> str:
+        if not files:
+            return ""
+        # Sorted by path, so an unchanged codebase always renders the same prefix.
+        return "".join(
+            [
+                "\n--- Entire Codebase Context ---\n",
+                *(cls._file_block(file_path, files[file_path]) for file_path in sorted(files)),
+                "----------------------------------\n",
+            ]
+        )
+
+    def _pack_files(self, files: dict, order: list[str], required: set[str], char_budget: int) -> dict | None:
+        """
+        Greedily fills the budget in `order`. Returns None if a required file does not
+        fit or nothing fits at all.
+        """
+        selected = {}
+        remaining = char_budget - len(self._render_files({"": ""}))
+        for file_path in order:
+            size = len(self._file_block(file_path, files[file_path]))
+            if size <= remaining:
+                selected[file_path] = files[file_path]
+                remaining -= size
+            elif file_path in required:
+                return None
+        return selected or None
+
+    def _fit_codebase(self, all_codebase_content: dict, changed_paths: set[str]) -> tuple[str, str, dict]:
+        """
+        Walks down CONTEXT_LEVELS until the codebase fits its budget.
+
+        Returns:
+            tuple[str, str, dict]: The rendered codebase, the level used and the size report.
+        """
+        full = self._render_files(all_codebase_content)
+        tokens, ratio = self._calibrate(full)
+        total = len(all_codebase_content)
+
+        def result(files: dict, level: str):
+            text = self._render_files(files)
+            detail = f"level {level}, {len(files)} of {total} files"
+            return text, level, self._report("codebase", text, full, tokens, ratio, detail)
+
+        if tokens <= self.budgets["codebase"]:
+            return result(all_codebase_content, "full")
+
+        char_budget = int(self.budgets["codebase"] * ratio)
+        # RepoManager hands the files over in relevance order; changed files go first.
+        changed_paths = changed_paths & all_codebase_content.keys()
+        order = sorted(all_codebase_content, key=lambda file_path: file_path not in changed_paths)
+
+        relevant = self._pack_files(all_codebase_content, order, changed_paths, char_budget)
+        if relevant:
+            return result(relevant, "relevant")
+
+        outlines = {
+            file_path: content
+            if content.startswith(SymbolIndex.OUTLINE_HEADER)
+            else SymbolIndex.outline_text(file_path, content)
+            for file_path, content in all_codebase_content.items()
+        }
+        # Prefer changed files in full next to outlines of the rest, then as many
+        # outlines as fit.
+        mixed = {
+            file_path: all_codebase_content[file_path]
+            if file_path in changed_paths
+            else outlines[file_path]
+            for file_path in all_codebase_content
+        }
+        outlined = self._pack_files(mixed, order, changed_paths, char_budget) or self._pack_files(
+            outlines, order, set(), char_budget
+        )
+        if outlined:
+            return result(outlined, "outline")
+
+        return result({}, "diff-only")
+
+    def build(self, diff_text: str, jira_data: list[dict], all_codebase_content: dict) -> PromptSections:
+        """
+        Builds the budgeted prompt sections.
+
+        Args:
+            diff_text (str): The raw code diff.
+            jira_data (list[dict]): Jira issue details.
+            all_codebase_content (dict): File paths mapped to their content, most
+                                         relevant first (as returned by RepoManager).
+                                         A PackedContext marked as ranked is never
+                                         reported as stable.
+
+        Returns:
+            PromptSections: The sections, the codebase level used and the size report.
+        """
+        diff, diff_report = self.fit_diff(diff_text)
+        jira, jira_report = self.fit_tickets(jira_data)
+        codebase, level, codebase_report = self._fit_codebase(
+            all_codebase_content or {}, self._diff_paths(diff_text)
+        )
+        # Below "full" the files were ranked by the diff; RepoManager may already
+        # have ranked them to fit its own budget, and skeleton mode outlines the
+        # files the diff does not touch.
+        stable = (
+            level == "full"
+            and not getattr(all_codebase_content, "ranked", False)
+            and not any(
+            content.startswith(SymbolIndex.OUTLINE_HEADER)
+                for content in (all_codebase_content or {}).values()
+            )
+        )
+        return PromptSections(
+            diff,
+            jira,
+            codebase,
+            level,
+            {"diff": diff_report, "jira": jira_report, "codebase": codebase_report},
+            stable,
+        )
+
+    def format_report(self, sections: PromptSections, prompt: str = "") -> str:
+        """
+        Formats the size report of a build, one line per section.
+
+        Args:
+            sections (PromptSections): The result of build().
+            prompt (str): The complete prompt, to also report the total (optional).
+
+        Returns:
+            str: The report.
+        """
+        lines = ["Prompt size by section:"]
+        for section, report in sections.report.items():
+            detail = f" ({report['detail']})" if report["detail"] else ""
+            lines.append(
+                f"  {section:<9} {report['tokens']:>9,} tokens of {report['budget']:,}{detail}"
+            )
+        if prompt:
+            lines.append(f"  {'total':<9} {-(-len(prompt) // self.CHARS_PER_TOKEN):>9,} tokens (estimated)")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Example usage (for testing this module independently)
+    builder = PromptBuilder({"diff": 200, "jira": 60, "codebase": 120})
+    mock_diff = "".join(
+        f"diff --git a/src/module{i}.py b/src/module{i}.py\n+def feature_{i}():\n+    return {i}\n"
+        for i in range(20)
+    )
+    mock_tickets = [
+        {"key": f"PROJ-{i}", "summary": f"Feature {i}", "status": "Done", "issue_type": "Story"}
+        for i in range(10)
+    ]
+    mock_codebase = {
+        f"src/module{i}.py": f'"""Module {i}."""\n\n\ndef feature_{i}():\n    return {i}\n' * 5
+        for i in range(5)
+    }
+    sections = builder.build(mock_diff, mock_tickets, mock_codebase)
+    print(sections.jira)
+    print(sections.codebase)
+    print(builder.format_report(sections))
@@ -1,7 +1,23 @@
 #!/usr/bin/env python3
-import google.generativeai as genai
+import asyncio
+import hashlib
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable
+
+from commit_notes import (
+    JIRA_KEY_RE,
+    CommitNotesCache,
+    merge_commit_notes,
+    parse_commit_notes,
+    render_merged_notes,
+)
+from context_cache import ContextCache
+from jira_key_index import compile_key_matcher
+from llm_backends import GeminiBackend, LlmBackend
+from llm_response_cache import ResponseCache
+from llm_scheduler import LlmScheduler, ScheduledBackend
+from prompt_builder import PromptBuilder
 
 
 class ReleaseNoteGenerator:
@@ -10,20 +26,227 @@ class ReleaseNoteGenerator:
     now with added context from the full content of the entire codebase.
     """
 
-    def __init__(self):
+    # "single" sends everything in one prompt; "map-reduce" summarizes diff chunks
+    # concurrently and merges the summaries in a final call; "per-commit" reuses
+    # cached notes of each commit in a release range and only polishes the merge.
+    GENERATION_MODES = ("single", "map-reduce", "per-commit")
+
+    # Diff characters per map chunk; whole files are never split across chunks.
+    MAX_MAP_CHUNK_CHARS = 60000
+    # Codebase characters sent alongside each map chunk.
+    MAX_MAP_CONTEXT_CHARS = 60000
+    # Part of every per-commit notes cache key; bump when _build_commit_prompt changes.
+    COMMIT_PROMPT_VERSION = "2"
+
+    # Output structure shared by the single-prompt and reduce prompts.
+    NOTES_STRUCTURE = """        Please generate the release notes following this structure:
+
+        ### [Release Version/Date - e.g., YMCA-MM-DD Update]
+
+        #### New Features
+        - [List new features, referencing Jira issues if applicable (e.g., `New Dashboard Widget (JIRA-123)`)]
+        - ...
+
+        #### Bug Fixes
+        - [List bug fixes, referencing Jira issues (e.g., `Fixed login issue (JIRA-456)`)]
+        - ...
+
+        #### Resolved Issues
+        - [JIRA-XXX: Summary of issue]
+        - [JIRA-YYY: Another issue summary]
+        - ...
+
+        #### Improvements & General Changes
+        - [List any other significant changes or performance improvements.]
+        - ...
+
+"""
+
+    def __init__(
+        self,
+        response_cache: ResponseCache | None = None,
+        context_cache: ContextCache | None = None,
+        backend: LlmBackend | None = None,
+        prompt_builder: PromptBuilder | None = None,
+        scheduler: LlmScheduler | None = None,
+        commit_notes_cache: CommitNotesCache | None = None,
+    ):
         """
         Initializes the ReleaseNoteGenerator.
-        Configures the google-generativeai library using GEMINI_API_KEY from environment.
+        Defaults to the Gemini backend, configured with GEMINI_API_KEY from environment.
+
+        Args:
+            response_cache (ResponseCache | None): Cache of model responses keyed on
+                                                   model, prompt and parameters.
+            context_cache (ContextCache | None): Holds the stable codebase prefix of
+                                                 the prompt on the model service.
+            backend (LlmBackend | None): The model service to generate with
+                                         (see llm_backends.create_backend).
+            prompt_builder (PromptBuilder | None): Fits the diff, tickets and codebase
+                                                   into their token budgets.
+            scheduler (LlmScheduler | None): Rate limits and retries every model call,
+                                             including context-cached ones. Share one
+                                             scheduler between generators.
+            commit_notes_cache (CommitNotesCache | None): Stores the notes of each
+                                                          commit in per-commit mode.
         """
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "GEMINI_API_KEY environment variable not set. Please provide your Google AI API key."
-            )
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(
-            "gemini-1.5-flash"
-        )  # Or 'gemini-1.5-pro' for more complex reasoning
+        # Or GeminiBackend("gemini-1.5-pro") for more complex reasoning
+        self.backend = backend or GeminiBackend()
+        self.scheduler = scheduler
+        if scheduler is not None:
+            self.backend = ScheduledBackend(self.backend, scheduler)
+        self.model_name = self.backend.model_name
+        self.generation_config = {}
+        self.response_cache = response_cache
+        self.context_cache = context_cache
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.commit_notes_cache = commit_notes_cache
+
+    def _cache_key(self, prompt: str) -> str:
+        # The generation config is part of the key, so changing the temperature
+        # or output limits never serves a stale response.
+        return ResponseCache.key(self.model_name, prompt, self.generation_config)
+
+    def _generate(self, prompt: str, prefix: str = "") -> str:
+        """
+        Sends `prefix + prompt` to the model, serving it from the response cache
+        when possible. A large stable prefix is sent through the context cache, so
+        only `prompt` is processed at full price.
+        """
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(prefix + prompt)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                print("Response cache hit: reusing stored model response.")
+                return cached
+
+        text = None
+        handle = None
+        if prefix and self.context_cache is not None:
+            handle = self.context_cache.get_or_create(self.model_name, prefix)
+        if handle:
+            try:
+                text = self._schedule(
+                    lambda: self.context_cache.backend.generate(
+                        handle, self.model_name, prompt, self.generation_config
+                    ),
+                    prefix + prompt,
+                )
+            except Exception as e:
+                if LlmScheduler.classify(e):
+                    # Throttling or an outage, not a problem with the handle.
+                    raise
+                # The handle may have been deleted or expired on the service side.
+                print(f"Warning: Cached content {handle} unusable, sending the prompt inline: {e}")
+                self.context_cache.invalidate(handle)
+        if text is None:
+            text = self.backend.generate(prefix + prompt, self.generation_config)
+
+        if key is not None:
+            self.response_cache.put(key, text)
+        return text
+
+    def _schedule(self, fn, prompt: str):
+        if self.scheduler is None:
+            return fn()
+        return self.scheduler.call(fn, LlmScheduler.estimate_tokens(prompt))
+
+    def _schedule_stream(self, fn, prompt: str) -> AsyncIterator[str]:
+        if self.scheduler is None:
+            return fn()
+        return self.scheduler.stream(fn, LlmScheduler.estimate_tokens(prompt))
+
+    async def _generate_async(self, prompt: str) -> str:
+        """
+        Async variant of _generate().
+        """
+        if self.response_cache is None:
+            return await self.backend.generate_async(prompt, self.generation_config)
+        key = self._cache_key(prompt)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+        text = await self.backend.generate_async(prompt, self.generation_config)
+        self.response_cache.put(key, text)
+        return text
+
+    def _build_prompt(
+        self,
+        diff_text: str,
+        jira_data: list[dict],
+        commit_sha: str,
+        all_codebase_content: dict,
+        commit_log: str,
+    ) -> tuple[str, str]:
+        """
+        Builds the single-prompt layout.
+
+        Returns:
+            tuple[str, str]: The stable codebase prefix and the variable suffix. The
+                             prefix is empty when the codebase context depends on
+                             the diff.
+        """
+        sections = self.prompt_builder.build(diff_text, jira_data, all_codebase_content)
+
+        commit_log_str = ""
+        if commit_log:
+            commit_log_str = f"""
+        ---
+        **COMMIT_LOG** (commits in this release, merged branches indented under their merge):
+        ```
+{commit_log}
+        ```
+"""
+
+        # The codebase context comes first, so runs over an unchanged codebase
+        # share a byte-identical prefix that can be served from the model's context
+        # cache. Everything that changes from run to run (diff, tickets, commit log,
+        # SHA) goes in the suffix. This only holds while the context is the whole
+        # codebase: once it is ranked or outlined by the diff's changed paths, each
+        # diff yields a new prefix, and the prompt is sent without one.
+        prefix = f"""
+        You are an expert release note generator. Your task is to create clear, concise, and informative release notes based on a code diff, associated Jira tickets, and the full context of the entire codebase provided.
+
+        **Instructions:**
+        - Analyze the `CODE_DIFF`, `JIRA_TICKETS`, and the `ENTIRE_CODEBASE_CONTEXT` carefully.
+        - If a `COMMIT_LOG` is provided, the notes cover every commit in that release range, not just the last one.
+        - Use the `ENTIRE_CODEBASE_CONTEXT` to understand the broader architecture, dependencies, and implications of the changes described in the `CODE_DIFF` and linked to `JIRA_TICKETS`.
+        - Files in the context marked as outlines only list signatures and docstrings; their bodies were omitted because they are not touched by the diff.
+        - Infer new features, bug fixes, and general improvements by examining the actual code changes within the provided files, leveraging the full codebase context for deeper understanding.
+        - List resolved Jira tickets by their key and summary.
+        - Focus on user-facing changes where possible.
+        - Avoid overly technical jargon, but feel free to reference specific code changes or architectural impacts if it clarifies a feature/fix.
+        - Generate notes in Markdown format.
+        - If no significant features or bug fixes are apparent, mention general changes or maintenance updates.
+
+        ---
+        **ENTIRE_CODEBASE_CONTEXT:**
+        {sections.codebase or "(omitted to fit the prompt; rely on the diff)"}
+"""
+        suffix = f"""
+        ---
+        **CODE_DIFF:**
+        ```diff
+        {sections.diff}
+        ```
+
+        ---
+        **JIRA_TICKETS** (one ticket per row, columns separated by `|`):
+        ```
+{sections.jira}
+        ```
+        {commit_log_str}
+
+        ---
+        **Release Notes for Commit: `{commit_sha}`**
+
+{self.NOTES_STRUCTURE}        ---
+        """
+        print(self.prompt_builder.format_report(sections, prefix + suffix))
+        if not sections.stable:
+            return "", prefix + suffix
+        return prefix, suffix
 
     def generate_release_notes(
         self,
@@ -31,6 +254,7 @@ class ReleaseNoteGenerator:
         jira_data: list[dict],
         commit_sha: str,
         all_codebase_content: dict,
+        commit_log: str = "",
     ) -> str:
         """
         Generates release notes based on the provided diff text, Jira issue data,
@@ -42,91 +266,594 @@ class ReleaseNoteGenerator:
             commit_sha (str): The SHA of the last commit for context.
             all_codebase_content (dict): A dictionary where keys are relative file paths
                                          and values are their full content.
+            commit_log (str): Summarized commit log when generating notes for a release
+                              range spanning several commits (optional).
 
         Returns:
             str: The generated release notes in Markdown format.
         """
-        jira_data_str = json.dumps(jira_data, indent=2)
-
-        # Format full codebase content for the prompt
-        full_codebase_context_str = ""
-        if all_codebase_content:
-            full_codebase_context_str = "\n--- Entire Codebase Context ---\n"
-            # Sort files by path for consistent ordering
-            sorted_file_paths = sorted(all_codebase_content.keys())
-
-            for file_path in sorted_file_paths:
-                content = all_codebase_content[file_path]
-                full_codebase_context_str += f"### File: {file_path}\n"
-                full_codebase_context_str += "```\n"
-                full_codebase_context_str += (
-                    content  # Content is already potentially truncated by RepoManager
-                )
-                full_codebase_context_str += "\n```\n\n"
-            full_codebase_context_str += "----------------------------------\n"
+        prefix, suffix = self._build_prompt(
+            diff_text, jira_data, commit_sha, all_codebase_content, commit_log
+        )
+        print(f"Sending prompt to {self.model_name} ({self.backend.name} backend)...")
+        try:
+            return self._generate(suffix, prefix)
+        except Exception as e:
+            print(f"Error generating content with {self.model_name}: {e}")
+            return f"Error: Could not generate release notes. {e}"
 
-        prompt = f"""
-        You are an expert release note generator. Your task is to create clear, concise, and informative release notes based on a code diff, associated Jira tickets, and the full context of the entire codebase provided.
+    async def _stream_async(self, prompt: str, prefix: str = "") -> AsyncIterator[str]:
+        """
+        Streaming variant of _generate(): yields text chunks as the model produces
+        them. A response cache hit is yielded as a single chunk, and the complete
+        response is stored once the stream ends.
+        """
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(prefix + prompt)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                print("Response cache hit: reusing stored model response.")
+                yield cached
+                return
+
+        handle = None
+        if prefix and self.context_cache is not None:
+            handle = self.context_cache.get_or_create(self.model_name, prefix)
+        parts = []
+        if handle:
+            try:
+                async for text in self._schedule_stream(
+                    lambda: self.context_cache.backend.stream(
+                        handle, self.model_name, prompt, self.generation_config
+                    ),
+                    prefix + prompt,
+                ):
+                    parts.append(text)
+                    yield text
+            except Exception as e:
+                if parts or LlmScheduler.classify(e):
+                    raise
+                # The handle may have been deleted or expired on the service side.
+                print(f"Warning: Cached content {handle} unusable, sending the prompt inline: {e}")
+                self.context_cache.invalidate(handle)
+                handle = None
+        if not handle:
+            async for text in self.backend.stream(prefix + prompt, self.generation_config):
+                parts.append(text)
+                yield text
+        if key is not None:
+            self.response_cache.put(key, "".join(parts))
+
+    async def stream_release_notes(
+        self,
+        diff_text: str,
+        jira_data: list[dict],
+        commit_sha: str,
+        all_codebase_content: dict,
+        commit_log: str = "",
+    ) -> AsyncIterator[str]:
+        """
+        Streams the release notes as the model generates them, using the same prompt
+        as generate_release_notes(). Pass the result to iter_markdown_sections() to
+        consume it section by section.
+
+        Args:
+            diff_text (str): The raw code diff.
+            jira_data (list[dict]): A list of dictionaries containing Jira issue details.
+            commit_sha (str): The SHA of the last commit for context.
+            all_codebase_content (dict): Relevant file paths mapped to their content.
+            commit_log (str): Summarized commit log of a release range (optional).
+
+        Yields:
+            str: Text chunks of the Markdown release notes, in order.
+        """
+        prefix, suffix = self._build_prompt(
+            diff_text, jira_data, commit_sha, all_codebase_content, commit_log
+        )
+        print(f"Streaming prompt to {self.model_name} ({self.backend.name} backend)...")
+        async for text in self._stream_async(suffix, prefix):
+            yield text
+
+    def _split_diff(self, diff_text: str) -> list[tuple[str, list[str]]]:
+        """
+        Splits a diff into chunks of whole files of at most MAX_MAP_CHUNK_CHARS
+        characters (a single larger file gets a chunk of its own).
+
+        Returns:
+            list[tuple[str, list[str]]]: Each chunk's diff text and file paths.
+        """
+        files = []
+        for part in diff_text.split("\ndiff --git "):
+            if not part.strip():
+                continue
+            if not part.startswith("diff --git "):
+                part = "diff --git " + part
+            header = part.split("\n", 1)[0]
+            files.append((part.rstrip("\n") + "\n", header.split(" b/", 1)[-1]))
+
+        chunks = []
+        chunk_parts, chunk_paths, chunk_length = [], [], 0
+        for part, path in files:
+            if chunk_parts and chunk_length + len(part) > self.MAX_MAP_CHUNK_CHARS:
+                chunks.append(("".join(chunk_parts), chunk_paths))
+                chunk_parts, chunk_paths, chunk_length = [], [], 0
+            chunk_parts.append(part)
+            chunk_paths.append(path)
+            chunk_length += len(part)
+        if chunk_parts:
+            chunks.append(("".join(chunk_parts), chunk_paths))
+        return chunks
+
+    def _build_map_prompt(
+        self,
+        chunk_diff: str,
+        chunk_paths: list[str],
+        jira_data: list[dict],
+        all_codebase_content: dict,
+        index: int,
+        total: int,
+    ) -> str:
+        """
+        Builds the prompt summarizing one diff chunk. Only the codebase files touched
+        by the chunk are included, and Jira tickets are reduced to key and summary.
+        """
+        tickets = "\n".join(
+            f"- {issue.get('key')}: {issue.get('summary', '')}" for issue in jira_data
+        )
+        context_str = ""
+        context_length = 0
+        for file_path in chunk_paths:
+            content = all_codebase_content.get(file_path)
+            if content is None or context_length + len(content) > self.MAX_MAP_CONTEXT_CHARS:
+                continue
+            context_str += f"### File: {file_path}\n```\n{content}\n```\n\n"
+            context_length += len(content)
+
+        return f"""
+        You are summarizing part {index} of {total} of a code change for release notes.
 
         **Instructions:**
-        - Analyze the `CODE_DIFF`, `JIRA_TICKETS`, and the `ENTIRE_CODEBASE_CONTEXT` carefully.
-        - Use the `ENTIRE_CODEBASE_CONTEXT` to understand the broader architecture, dependencies, and implications of the changes described in the `CODE_DIFF` and linked to `JIRA_TICKETS`.
-        - Infer new features, bug fixes, and general improvements by examining the actual code changes within the provided files, leveraging the full codebase context for deeper understanding.
-        - List resolved Jira tickets by their key and summary.
-        - Focus on user-facing changes where possible.
-        - Avoid overly technical jargon, but feel free to reference specific code changes or architectural impacts if it clarifies a feature/fix.
-        - Generate notes in Markdown format.
-        - If no significant features or bug fixes are apparent, mention general changes or maintenance updates.
+        - Summarize the changes in `CODE_DIFF_PART` as short bullet points, grouped under
+          "New Features", "Bug Fixes" and "Improvements & General Changes" (omit empty groups).
+        - Reference a Jira ticket key from `JIRA_TICKETS` when a change clearly implements it.
+        - Use `CHANGED_FILES_CONTEXT` only to understand the changes; do not describe unchanged code.
+        - Be factual and concise; these bullets will be merged with the other parts.
 
         ---
-        **CODE_DIFF:**
+        **CODE_DIFF_PART:**
         ```diff
-        {diff_text}
+{chunk_diff}
         ```
 
         ---
         **JIRA_TICKETS:**
-        ```json
-        {jira_data_str}
+{tickets or "        (none)"}
+
+        ---
+        **CHANGED_FILES_CONTEXT:**
+{context_str or "        (not available)"}
+        """
+
+    def _build_reduce_prompt(
+        self,
+        partial_summaries: list[str],
+        jira_data: list[dict],
+        commit_sha: str,
+        commit_log: str,
+    ) -> str:
+        """
+        Builds the prompt merging the chunk summaries into the final release notes.
+        """
+        summaries_str = "\n\n".join(
+            f"#### Part {index}\n{summary.strip()}"
+            for index, summary in enumerate(partial_summaries, start=1)
+        )
+        commit_log_str = ""
+        if commit_log:
+            commit_log_str = f"""
+        ---
+        **COMMIT_LOG** (commits in this release, merged branches indented under their merge):
         ```
+{commit_log}
+        ```
+"""
+        return f"""
+        You are an expert release note generator. A large code change was split into parts and each part was summarized separately. Merge the `PARTIAL_SUMMARIES` into one set of clear, concise, and informative release notes.
 
-        {full_codebase_context_str}
+        **Instructions:**
+        - Combine related bullets from different parts and remove duplicates.
+        - List resolved Jira tickets from `JIRA_TICKETS` by their key and summary.
+        - Focus on user-facing changes where possible.
+        - Generate notes in Markdown format.
+        - If no significant features or bug fixes are apparent, mention general changes or maintenance updates.
+
+        ---
+        **PARTIAL_SUMMARIES:**
+{summaries_str}
+
+        ---
+        **JIRA_TICKETS** (one ticket per row, columns separated by `|`):
+        ```
+{self.prompt_builder.fit_tickets(jira_data)[0]}
+        ```
+        {commit_log_str}
 
         ---
         **Release Notes for Commit: `{commit_sha}`**
 
-        Please generate the release notes following this structure:
+{self.NOTES_STRUCTURE}        ---
+        """
 
-        ### [Release Version/Date - e.g., YMCA-MM-DD Update]
+    async def _generate_map_reduce_async(
+        self,
+        diff_text: str,
+        jira_data: list[dict],
+        commit_sha: str,
+        all_codebase_content: dict,
+        commit_log: str,
+        max_concurrency: int,
+    ) -> str:
+        chunks = self._split_diff(diff_text)
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        #### New Features
-        - [List new features, referencing Jira issues if applicable (e.g., `New Dashboard Widget (JIRA-123)`)]
-        - ...
+        async def summarize(index: int, chunk_diff: str, chunk_paths: list[str]) -> str:
+            prompt = self._build_map_prompt(
+                chunk_diff, chunk_paths, jira_data, all_codebase_content, index, len(chunks)
+            )
+            async with semaphore:
+                print(f"Summarizing diff part {index}/{len(chunks)} ({len(chunk_paths)} files)...")
+                return await self._generate_async(prompt)
+
+        partial_summaries = await asyncio.gather(
+            *(
+                summarize(index, chunk_diff, chunk_paths)
+                for index, (chunk_diff, chunk_paths) in enumerate(chunks, start=1)
+            )
+        )
+        print(f"Merging {len(partial_summaries)} partial summaries...")
+        return await self._generate_async(
+            self._build_reduce_prompt(partial_summaries, jira_data, commit_sha, commit_log)
+        )
 
-        #### Bug Fixes
-        - [List bug fixes, referencing Jira issues (e.g., `Fixed login issue (JIRA-456)`)]
-        - ...
+    def generate_release_notes_map_reduce(
+        self,
+        diff_text: str,
+        jira_data: list[dict],
+        commit_sha: str,
+        all_codebase_content: dict,
+        commit_log: str = "",
+        max_concurrency: int = 8,
+    ) -> str:
+        """
+        Generates release notes for a large diff in map-reduce fashion: the diff is
+        split into chunks of whole files, each chunk is summarized concurrently (at
+        most `max_concurrency` calls in flight) with only the context of its own
+        files, and a final call merges the summaries into the usual structure.
+        Latency follows the largest chunk rather than the total diff size.
+        Diffs that fit in a single chunk fall back to generate_release_notes().
 
-        #### Resolved Issues
-        - [JIRA-XXX: Summary of issue]
-        - [JIRA-YYY: Another issue summary]
-        - ...
+        Args:
+            diff_text (str): The raw code diff.
+            jira_data (list[dict]): A list of dictionaries containing Jira issue details.
+            commit_sha (str): The SHA of the last commit for context.
+            all_codebase_content (dict): Relevant file paths mapped to their content.
+            commit_log (str): Summarized commit log of a release range (optional).
+            max_concurrency (int): Maximum number of concurrent map calls.
 
-        #### Improvements & General Changes
-        - [List any other significant changes or performance improvements.]
-        - ...
+        Returns:
+            str: The generated release notes in Markdown format.
+        """
+        if len(self._split_diff(diff_text)) <= 1:
+            return self.generate_release_notes(
+                diff_text, jira_data, commit_sha, all_codebase_content, commit_log
+            )
+        try:
+            return asyncio.run(
+                self._generate_map_reduce_async(
+                    diff_text,
+                    jira_data,
+                    commit_sha,
+                    all_codebase_content,
+                    commit_log,
+                    max_concurrency,
+                )
+            )
+        except Exception as e:
+            print(f"Error generating content with {self.model_name}: {e}")
+            return f"Error: Could not generate release notes. {e}"
+
+    def _commit_tickets(self, commit, jira_data: list[dict], key_matcher) -> str:
+        """
+        Renders the ticket rows of a commit's prompt: only the tickets named in its
+        message, so they are known (and part of the cache key) before its diff is read.
+        """
+        message = f"{commit.subject}\n\n{commit.body}"
+        keys = {match.group().upper() for match in key_matcher.finditer(message)}
+        return self.prompt_builder.format_tickets(
+            [issue for issue in jira_data if issue.get("key") in keys]
+        )
+
+    def _build_commit_prompt(self, commit, diff_text: str, tickets: str) -> str:
+        """
+        Builds the prompt extracting structured notes from a single commit, with its
+        ticket rows as rendered by _commit_tickets().
+        """
+        message = f"{commit.subject}\n\n{commit.body}".strip()
+        diff, _ = self.prompt_builder.fit_diff(diff_text)
+        return f"""
+        You are extracting release note items from a single commit.
+
+        **Instructions:**
+        - Read `COMMIT_MESSAGE` and `CODE_DIFF` and list the user-visible changes they make.
+        - Reply with JSON only, in this form:
+          {{"features": [{{"text": "...", "tickets": ["KEY-1"]}}], "fixes": [...], "improvements": [...]}}
+        - Each item is one short sentence. Use empty lists for categories without changes.
+        - Only reference ticket keys that appear in `COMMIT_MESSAGE` or `JIRA_TICKETS`.
+        - Internal refactoring, tests and formatting go under "improvements" only if notable.
+
+        ---
+        **COMMIT_MESSAGE** (`{commit.sha[:7]}` by {commit.author}):
+        ```
+{message}
+        ```
+
+        ---
+        **JIRA_TICKETS** (one ticket per row, columns separated by `|`):
+        ```
+{tickets}
+        ```
+
+        ---
+        **CODE_DIFF:**
+        ```diff
+{diff}
+        ```
+        """
+
+    def _build_polish_prompt(
+        self, merged: dict, jira_data: list[dict], commit_sha: str, commit_log: str
+    ) -> str:
+        """
+        Builds the prompt turning merged per-commit items into the final release notes.
+        """
+        keys = {key for items in merged.values() for item in items for key in item["tickets"]}
+        tickets = [issue for issue in jira_data if issue.get("key") in keys]
+        tickets_str, _ = self.prompt_builder.fit_tickets(tickets)
+        return f"""
+        You are an expert release note generator. The changes of a release were already
+        summarized commit by commit and merged; items for the same Jira ticket are combined.
+        Turn the `MERGED_ITEMS` into clear, concise, and informative release notes.
+
+        **Instructions:**
+        - Each item line lists its ticket keys and commits in parentheses, and further
+          related changes after "also:". Combine these into one bullet per item.
+        - Keep items in the category they are listed under unless clearly wrong.
+        - List the tickets in `JIRA_TICKETS` under "Resolved Issues" by key and summary.
+        - Focus on user-facing changes where possible. Generate notes in Markdown format.
+
+        ---
+        **MERGED_ITEMS:**
+{render_merged_notes(merged) or "(no changes)"}
+
+        ---
+        **JIRA_TICKETS** (one ticket per row, columns separated by `|`):
+        ```
+{tickets_str}
+        ```
+
+        ---
+        **COMMIT_LOG:**
+        ```
+{commit_log}
+        ```
 
         ---
+        **Release Notes for Commit: `{commit_sha}`**
+
+{self.NOTES_STRUCTURE}        ---
+        """
+
+    async def _generate_per_commit_async(
+        self,
+        commits: list,
+        load_diff: Callable,
+        jira_data: list[dict],
+        commit_sha: str,
+        commit_log: str,
+        max_concurrency: int,
+        project_keys: list[str] | None,
+    ) -> str:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        cache = self.commit_notes_cache
+        key_matcher = compile_key_matcher(project_keys) if project_keys else JIRA_KEY_RE
+        allowlist = ",".join(sorted(key.upper() for key in project_keys or []))
+
+        async def notes_for(commit) -> dict:
+            tickets = self._commit_tickets(commit, jira_data, key_matcher)
+            # The notes depend on the ticket rows too: a commit first seen while
+            # Jira was unreachable is regenerated once its tickets are known.
+            context = f"{self.COMMIT_PROMPT_VERSION}:{allowlist}:" + hashlib.sha256(
+                tickets.encode("utf-8")
+            ).hexdigest()
+            if cache is not None:
+                cached = cache.get(self.model_name, commit.sha, context)
+                if cached is not None:
+                    return cached
+            async with semaphore:
+                diff_text = await asyncio.to_thread(load_diff, commit)
+                print(f"Extracting notes from commit {commit.sha[:7]} {commit.subject}...")
+                notes = parse_commit_notes(
+                    await self._generate_async(
+                        self._build_commit_prompt(commit, diff_text, tickets)
+                    ),
+                    key_matcher,
+                )
+            if cache is not None:
+                cache.put(self.model_name, commit.sha, notes, context)
+            return notes
+
+        all_notes = await asyncio.gather(*(notes_for(commit) for commit in commits))
+        merged = merge_commit_notes(
+            [(commit.sha, notes) for commit, notes in zip(commits, all_notes)]
+        )
+        print(
+            f"Merged {sum(len(items) for items in merged.values())} items from {len(commits)} commits; polishing..."
+        )
+        return await self._generate_async(
+            self._build_polish_prompt(merged, jira_data, commit_sha, commit_log)
+        )
+
+    def generate_release_notes_per_commit(
+        self,
+        commits: list,
+        load_diff: Callable,
+        jira_data: list[dict],
+        commit_sha: str,
+        commit_log: str = "",
+        max_concurrency: int = 8,
+        project_keys: list[str] | None = None,
+    ) -> str:
         """
+        Generates release notes for a release range from per-commit notes. Each
+        commit's notes (features, fixes and ticket keys) come from the commit notes
+        cache, or are extracted from its own diff and stored, so re-cutting a release
+        or cutting the next one only pays for commits not seen before. The items are
+        merged locally, deduplicated by Jira key, and one small call polishes them.
 
-        print("Sending prompt to Google Generative AI model...")
+        Args:
+            commits (list[CommitRecord]): Non-merge commits of the range, oldest first
+                                          (see RepoManager.get_range_commits).
+            load_diff (Callable): Returns the diff text of a commit; only called for
+                                  commits without cached notes.
+            jira_data (list[dict]): A list of dictionaries containing Jira issue details.
+            commit_sha (str): The SHA of the last commit of the range.
+            commit_log (str): Summarized commit log of the range.
+            max_concurrency (int): Maximum number of concurrent per-commit calls.
+            project_keys (list[str] | None): Jira projects whose keys are recognized in
+                                             commit messages and notes; any key-like
+                                             text is accepted without them.
+
+        Returns:
+            str: The generated release notes in Markdown format.
+        """
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return asyncio.run(
+                self._generate_per_commit_async(
+                    commits,
+                    load_diff,
+                    jira_data,
+                    commit_sha,
+                    commit_log,
+                    max_concurrency,
+                    project_keys,
+                )
+            )
         except Exception as e:
-            print(f"Error generating content with Gemini: {e}")
+            print(f"Error generating content with {self.model_name}: {e}")
             return f"Error: Could not generate release notes. {e}"
 
+    def generate_component_release_notes(
+        self,
+        slices: list[dict],
+        jira_data: list[dict],
+        commit_sha: str,
+        max_workers: int = 4,
+        generation_mode: str = "single",
+    ) -> str:
+        """
+        Generates release notes for a monorepo change split into component slices
+        (see RepoManager.get_component_slices). Each slice gets its own, smaller
+        prompt with only the Jira tickets of its component, and the prompts run
+        concurrently; the results are joined under one heading per component.
+
+        Args:
+            slices (list[dict]): Component slices with their diff, context and commit log.
+            jira_data (list[dict]): Jira issue details for the whole project.
+            commit_sha (str): The SHA of the last commit for context.
+            max_workers (int): Maximum number of components generated concurrently.
+            generation_mode (str): One of GENERATION_MODES, applied to each component.
+
+        Returns:
+            str: The combined release notes in Markdown format.
+        """
+
+        def tickets_for(jira_component: str) -> list[dict]:
+            tickets = [
+                issue for issue in jira_data if jira_component in issue.get("components", [])
+            ]
+            # Fall back to tickets without a component rather than sending none.
+            return tickets or [issue for issue in jira_data if not issue.get("components")]
+
+        def generate(component_slice: dict) -> str:
+            print(f"Generating release notes for component {component_slice['component']}...")
+            generate_notes = (
+                self.generate_release_notes_map_reduce
+                if generation_mode == "map-reduce"
+                else self.generate_release_notes
+            )
+            return generate_notes(
+                component_slice["diff_text"],
+                tickets_for(component_slice["jira_component"]),
+                commit_sha,
+                component_slice["all_codebase_content"],
+                component_slice["commit_log"],
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(slices)))) as executor:
+            results = list(executor.map(generate, slices))
+
+        failed = [
+            component_slice["component"]
+            for component_slice, notes in zip(slices, results)
+            if notes.startswith("Error: Could not generate release notes")
+        ]
+        if slices and len(failed) == len(slices):
+            return results[0]
+        if failed:
+            print(f"Warning: Could not generate release notes for components: {', '.join(failed)}")
+
+        sections = [f"# Release Notes for Commit `{commit_sha}`\n"]
+        for component_slice, notes in zip(slices, results):
+            sections.append(f"## {component_slice['component']}\n\n{notes.strip()}\n")
+        return "\n".join(sections)
+
+
+async def iter_markdown_sections(
+    chunks: AsyncIterator[str], on_chunk=None
+) -> AsyncIterator[str]:
+    """
+    Regroups a stream of text chunks into Markdown sections, yielding each section
+    (a heading and the lines up to the next heading) as soon as it is complete.
+
+    Args:
+        chunks (AsyncIterator[str]): Text chunks, e.g. from stream_release_notes().
+        on_chunk (Callable[[str], None] | None): Called with every raw chunk as it
+                                                 arrives, e.g. to echo it to a terminal.
+
+    Yields:
+        str: Complete Markdown sections, in order.
+    """
+    section = []
+    pending = ""
+    done = False
+    while not done:
+        try:
+            chunk = await anext(chunks)
+        except StopAsyncIteration:
+            # Flush the last, unterminated line.
+            lines, pending, done = [pending] if pending else [], "", True
+        else:
+            if on_chunk is not None:
+                on_chunk(chunk)
+            *lines, pending = (pending + chunk).split("\n")
+        for line in lines:
+            if line.lstrip().startswith("#") and any(part.strip() for part in section):
+                yield "\n".join(section).strip("\n") + "\n"
+                section = []
+            section.append(line)
+    if any(part.strip() for part in section):
+        yield "\n".join(section).strip("\n") + "\n"
 
 if __name__ == "__main__":
     # Example usage (for testing this module independently)
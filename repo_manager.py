@@ -1,14 +1,25 @@
+import datetime
 import git
 import os
-import io  # To handle potential encoding errors gracefully
+import subprocess
+
+from commit_log import iter_commits, summarize_commits
+from components import Component, changed_components, check_commit_graph
+from context_packer import ContextPacker, DependencyGraph, PackedContext
+from diff_parser import EMPTY_TREE_SHA, DiffRules, render_filtered_diff
+from disk_cache import DiskCache
+from file_enumerator import FileEnumerator
+from jira_key_index import JiraKeyIndex, JiraReferences, iter_jira_keys
+from symbol_index import SymbolIndex
 
 
 class RepoManager:
     """
     Manages Git repository operations on a local repository.
-    This version does NOT perform a 'git pull' operation.
-    It works with the current local state of the repository.
-    It now also extracts the full content of ALL text files in the codebase.
+    This version does NOT perform a 'git pull' operation, and never checks out
+    branches: it reads commits, diffs and trees straight from refs.
+    It now also extracts the full content of ALL text files in the codebase,
+    reusing a persistent blob snapshot cache between runs.
     """
 
     # Define a maximum total length for the codebase context to prevent
@@ -17,134 +28,305 @@ class RepoManager:
     # Adjust as needed based on your LLM's context window and budget.
     MAX_TOTAL_CODE_CONTEXT_LENGTH = 500000
 
-    def __init__(self):
+    # Individual files larger than this are skipped without being read; they are
+    # almost always generated artifacts or data dumps rather than source code.
+    MAX_FILE_SIZE_BYTES = 1024 * 1024  # 1 MiB
+
+    # Blob contents are cached on disk keyed by their git blob SHA, so a run
+    # only has to read the blobs that changed since the previous snapshot.
+    DEFAULT_CACHE_DIR = os.path.join(
+        os.path.expanduser("~"), ".cache", "release_notes_agent"
+    )
+    MAX_SNAPSHOT_CACHE_BYTES = 512 * 1024 * 1024  # 512 MiB
+
+    # Commits listed individually in a release range's commit log; the rest are counted.
+    MAX_LISTED_COMMITS = 300
+
+    # "full" sends full file bodies; "skeleton" sends outlines of untouched files.
+    CONTEXT_MODES = ("full", "skeleton")
+
+    # Codebase context budget of each component slice in monorepo component mode.
+    MAX_COMPONENT_CODE_CONTEXT_LENGTH = 150000
+
+    def __init__(
+        self, cache_dir: str | None = None, diff_rules: DiffRules | None = None
+    ):
         """
         Initializes the RepoManager.
+
+        Args:
+            cache_dir (str | None): Root directory for on-disk caches. Defaults to the
+                                    RELEASE_NOTES_CACHE_DIR environment variable, or
+                                    ~/.cache/release_notes_agent.
+            diff_rules (DiffRules | None): Rules for summarizing noisy files (lockfiles,
+                                           generated code, huge diffs) in the diff.
         """
-        pass
+        self.diff_rules = diff_rules or DiffRules()
+        self.cache_dir = (
+            cache_dir or os.getenv("RELEASE_NOTES_CACHE_DIR") or self.DEFAULT_CACHE_DIR
+        )
+        self.snapshot_cache = DiskCache(
+            os.path.join(self.cache_dir, "blobs"), self.MAX_SNAPSHOT_CACHE_BYTES
+        )
 
-    def _get_all_text_file_contents(self, repo_path: str) -> dict:
+    def _read_blobs(self, enumerator: FileEnumerator, shas: list[str]) -> dict:
+        """
+        Returns blob contents by SHA, serving them from the snapshot cache where
+        possible and reading only the missing ones from the repository.
         """
-        Recursively reads the content of all text files in the repository.
+        blobs = self.snapshot_cache.get_many(shas)
+        missing = [sha for sha in dict.fromkeys(shas) if sha not in blobs]
+        read = enumerator.read_blobs(missing)
+        self.snapshot_cache.put_many(read.items())
+        blobs.update(read)
+        return blobs
+
+    def _get_all_text_file_contents(
+        self,
+        repo_path: str,
+        commit_sha: str,
+        changed_files: list[str] | None = None,
+        context_mode: str = "full",
+    ) -> dict:
+        """
+        Reads the content of the text files in the given commit's tree that are most
+        relevant to the change, straight from the git object database.
+        Files are ranked by import-graph distance from the files touched by the diff
+        and packed greedily into MAX_TOTAL_CODE_CONTEXT_LENGTH, so the changed files
+        and their neighbours are never crowded out by unrelated code.
+        Blob sizes are checked up front so oversize files are never read, and blobs
+        are looked up in the snapshot cache by SHA first, so only blobs that changed
+        since the last snapshot are read (in parallel) from the repository.
 
         Args:
             repo_path (str): The local file system path to the Git repository.
+            commit_sha (str): The SHA of the commit whose tree should be collected.
+            changed_files (list[str] | None): Paths touched by the diff.
+            context_mode (str): "full" for full file bodies, or "skeleton" to send
+                                signature-only outlines of files not touched by the diff.
 
         Returns:
             dict: A dictionary where keys are file paths (relative to repo root)
-                  and values are their full content. Binary files are skipped.
-                  Content will be truncated if MAX_TOTAL_CODE_CONTEXT_LENGTH is exceeded.
+                  and values are their full content, most relevant first.
+                  Binary files are skipped. Content will be truncated if
+                  MAX_TOTAL_CODE_CONTEXT_LENGTH is exceeded.
+        """
+        print(
+            f"Collecting full codebase content (text files only) for commit {commit_sha[:7]} in {repo_path}..."
+        )
+        snapshot = self._list_snapshot(repo_path, commit_sha)
+        with snapshot["enumerator"]:
+            return self._pack_codebase_content(
+                snapshot,
+                changed_files,
+                context_mode,
+                self.MAX_TOTAL_CODE_CONTEXT_LENGTH,
+            )
+
+    def _list_snapshot(self, repo_path: str, commit_sha: str) -> dict:
+        """
+        Lists the candidate files of a commit's tree with their blob sizes, skipping
+        oversize files, and sets up the dependency graph used to rank them (which
+        only parses files once a packing needs them).
+        The result can be packed several times, e.g. once per component; the caller
+        closes its enumerator afterwards.
+
+        Returns:
+            dict: The enumerator, candidate entries, blob sizes and dependency graph.
+        """
+        enumerator = FileEnumerator(repo_path)
+        with enumerator.borrow_reader() as reader:
+            entries = enumerator.list_files(reader, commit_sha)
+
+        candidates = []
+        sizes = {}
+        for entry in entries:
+            if entry.size > self.MAX_FILE_SIZE_BYTES:
+                print(f"Skipping oversize file {entry.path} ({entry.size} bytes).")
+                continue
+            candidates.append(entry)
+            sizes[entry.sha] = entry.size
+
+        graph = DependencyGraph(os.path.join(self.cache_dir, "depgraph"))
+        graph.load_tree(candidates, lambda shas: self._read_blobs(enumerator, shas))
+        return {
+            "enumerator": enumerator,
+            "candidates": candidates,
+            "sizes": sizes,
+            "graph": graph,
+        }
+
+    def _pack_codebase_content(
+        self,
+        snapshot: dict,
+        changed_files: list[str] | None,
+        context_mode: str,
+        budget: int,
+        component: Component | None = None,
+    ) -> dict:
         """
+        Selects, reads and truncates the files of a snapshot into `budget` characters.
+        When a component is given, only its own files and the files its changed
+        files import (directly or transitively) are considered.
+
+        Returns:
+            PackedContext: File paths mapped to their (possibly outlined or truncated)
+                           content, marked as ranked when the selection depends on
+                           the diff.
+        """
+        enumerator = snapshot["enumerator"]
+        candidates = snapshot["candidates"]
+        sizes = snapshot["sizes"]
+        graph = snapshot["graph"]
         all_files_content = {}
         current_total_length = 0
+        truncated = False
+
+        # Select files using their byte sizes before reading anything, so blobs
+        # that do not make it into the budget are never fetched.
+        changed_paths = set(changed_files or [])
+        if component is not None:
+            reachable = graph.distances(changed_paths)
+            candidates = [
+                entry
+                for entry in candidates
+                if component.owns(entry.path) or entry.path in reachable
+            ]
+
+        # In skeleton mode, files not touched by the diff are rendered as outlines
+        # from the symbol index and only the changed files are sent in full.
+        outlines = {}
+        if context_mode == "skeleton":
+            symbol_index = SymbolIndex(os.path.join(self.cache_dir, "symbols"))
+            outlined = [entry for entry in candidates if entry.path not in changed_paths]
+            symbol_index.update(
+                outlined, lambda shas: self._read_blobs(enumerator, shas)
+            )
+            for entry in outlined:
+                outlines[entry.path] = symbol_index.outline(entry)
+            candidates = [
+                entry
+                for entry in candidates
+                if entry.path not in outlines or outlines[entry.path] is not None
+            ]
+        lengths = {
+            entry.path: len(outlines[entry.path])
+            if entry.path in outlines
+            else sizes[entry.sha]
+            for entry in candidates
+        }
+
+        selected = ContextPacker(graph).pack(candidates, lengths, changed_paths, budget)
+        blobs = self._read_blobs(
+            enumerator, [entry.sha for entry in selected if entry.path not in outlines]
+        )
 
-        print("Collecting full codebase content (text files only)...")
-        for root, _, files in os.walk(repo_path):
-            # Skip the .git directory
-            if ".git" in root:
+        for entry in selected:
+            relative_file_path = entry.path
+            if relative_file_path in outlines:
+                content = outlines[relative_file_path]
+            elif entry.sha not in blobs:
+                print(f"Error reading file {relative_file_path}: blob {entry.sha} missing")
                 continue
-
-            for file in files:
-                full_file_path = os.path.join(root, file)
-                relative_file_path = os.path.relpath(full_file_path, repo_path)
-
-                # Skip common binary or unwanted files/directories
-                if (
-                    any(
-                        ext in file.lower()
-                        for ext in [
-                            ".exe",
-                            ".dll",
-                            ".zip",
-                            ".tar.gz",
-                            ".bin",
-                            ".jpg",
-                            ".jpeg",
-                            ".png",
-                            ".gif",
-                            ".bmp",
-                            ".pdf",
-                            ".docx",
-                            ".xlsx",
-                            ".pptx",
-                            ".sqlite",
-                            ".db",
-                            ".pyc",
-                            ".class",
-                        ]
+            elif FileEnumerator.is_binary(blobs[entry.sha]):
+                continue
+            else:
+                content = blobs[entry.sha].decode("utf-8", errors="ignore")
+
+            # Check if adding this file's content exceeds the limit
+            if current_total_length + len(content) > budget:
+                remaining_capacity = budget - current_total_length
+                if remaining_capacity > 0:
+                    print(
+                        f"Warning: Truncating content for {relative_file_path} to fit within total limit."
+                    )
+                    all_files_content[relative_file_path] = (
+                        content[:remaining_capacity] + "\n... (content truncated)"
+                    )
+                else:
+                    print(
+                        f"Warning: Skipping {relative_file_path} as total context limit reached."
                     )
-                    or "node_modules" in relative_file_path
-                    or "venv" in relative_file_path
-                    or "__pycache__" in relative_file_path
-                ):
-                    continue
-
-                try:
-                    with open(
-                        full_file_path, "r", encoding="utf-8", errors="ignore"
-                    ) as f:
-                        content = f.read()
-
-                        # Check if adding this file's content exceeds the limit
-                        if (
-                            current_total_length + len(content)
-                            > self.MAX_TOTAL_CODE_CONTEXT_LENGTH
-                        ):
-                            remaining_capacity = (
-                                self.MAX_TOTAL_CODE_CONTEXT_LENGTH
-                                - current_total_length
-                            )
-                            if remaining_capacity > 0:
-                                print(
-                                    f"Warning: Truncating content for {relative_file_path} to fit within total limit."
-                                )
-                                all_files_content[relative_file_path] = (
-                                    content[:remaining_capacity]
-                                    + "\n... (content truncated)"
-                                )
-                            else:
-                                print(
-                                    f"Warning: Skipping {relative_file_path} as total context limit reached."
-                                )
-                            # Once limit is reached, stop adding more files
-                            current_total_length = (
-                                self.MAX_TOTAL_CODE_CONTEXT_LENGTH
-                            )  # Mark as full
-                            break  # Break from inner file loop, will exit outer loops too
-                        else:
-                            all_files_content[relative_file_path] = content
-                            current_total_length += len(content)
-
-                except UnicodeDecodeError:
-                    print(f"Skipping binary or undecodable file: {relative_file_path}")
-                except Exception as e:
-                    print(f"Error reading file {relative_file_path}: {e}")
-            if current_total_length >= self.MAX_TOTAL_CODE_CONTEXT_LENGTH:
-                break  # Break from outer directory loop too
-
-        if current_total_length >= self.MAX_TOTAL_CODE_CONTEXT_LENGTH:
+                # Once limit is reached, stop adding more files
+                current_total_length = budget
+                truncated = True
+                break
+
+            all_files_content[relative_file_path] = content
+            current_total_length += len(content)
+
+        if len(selected) < len(candidates):
             print(
-                f"--- Full codebase context CONTEXT TRUNCATED at {self.MAX_TOTAL_CODE_CONTEXT_LENGTH} characters. ---"
+                f"--- Full codebase context packed to {len(selected)} of {len(candidates)} files "
+                f"({budget} character budget, ranked by distance from the diff). ---"
             )
         else:
             print(
                 f"Collected {len(all_files_content)} files, total content length: {current_total_length} characters."
             )
+        cache_stats = self.snapshot_cache.stats()
+        print(
+            f"Snapshot cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses."
+        )
+
+        # A component slice is always cut by what the diff reaches, and outlines
+        # are chosen by the diff too.
+        ranked = (
+            component is not None
+            or bool(outlines)
+            or truncated
+            or len(selected) < len(candidates)
+        )
+        return PackedContext(all_files_content, ranked=ranked)
+
+    def _resolve_branch_commit(self, repo: git.Repo, branch_name: str):
+        """
+        Resolves a branch (or any ref) to a commit without checking it out,
+        falling back to the remote-tracking branch on origin.
+
+        Returns:
+            git.Commit | None: The resolved commit, or None if the ref does not exist.
+        """
+        for ref in (branch_name, f"origin/{branch_name}"):
+            try:
+                return repo.commit(ref)
+            except (git.BadName, ValueError):
+                continue
+        return None
 
-        return all_files_content
+    def _resolve_range(self, repo: git.Repo, from_ref: str | None, to_ref: str) -> tuple:
+        """
+        Resolves both ends of a range with _resolve_branch_commit, so a branch that
+        only exists on origin names the same commits in every stage.
+
+        Returns:
+            tuple: The start commit (None without `from_ref`), the end commit, and an
+                   error message (empty if both resolved).
+        """
+        to_commit = self._resolve_branch_commit(repo, to_ref)
+        from_commit = self._resolve_branch_commit(repo, from_ref) if from_ref else None
+        if to_commit is None or (from_ref and from_commit is None):
+            missing = to_ref if to_commit is None else from_ref
+            error_message = f"Error: Could not resolve '{missing}' locally or on origin."
+            print(error_message)
+            return None, None, error_message
+        return from_commit, to_commit, ""
 
     def get_last_diff_and_full_codebase(
-        self, repo_path: str, branch_name: str = "main"
+        self, repo_path: str, branch_name: str = "main", context_mode: str = "full"
     ) -> tuple[str, str, dict, str]:
         """
-        Opens a local Git repository, ensures the correct branch is checked out,
+        Opens a local Git repository, resolves the branch to its latest commit,
         gets the last diff based on local commits, and extracts the full content
         of all relevant text files in the codebase.
+        Everything is read straight from refs and the object database: the branch
+        is never checked out and the worktree and index are left untouched.
         This function does NOT pull latest changes from a remote.
 
         Args:
             repo_path (str): The local file system path to the Git repository.
             branch_name (str): The name of the branch to get the diff from (default: 'main').
+            context_mode (str): One of CONTEXT_MODES (default: 'full').
 
         Returns:
             tuple[str, str, dict, str]: A tuple containing:
@@ -163,30 +345,32 @@ class RepoManager:
             repo = git.Repo(repo_path)
             print("Repository opened successfully.")
 
-            # Ensure we are on the correct branch
-            if repo.head.is_valid() and repo.head.ref.name != branch_name:
-                print(f"Switching to branch: {branch_name}")
-                repo.git.checkout(branch_name)
-            elif not repo.head.is_valid():
-                error_message = f"Error: Repository head is invalid. Cannot checkout branch {branch_name}."
+            # Resolve the branch straight to a commit. Nothing is checked out, so
+            # HEAD, the index and the worktree are never touched and concurrent
+            # runs against the same clone cannot race each other.
+            last_commit = self._resolve_branch_commit(repo, branch_name)
+            if last_commit is None:
+                error_message = f"Error: Could not resolve branch '{branch_name}' locally or on origin."
                 print(error_message)
                 return "", "", {}, error_message
+            print(f"Resolved branch {branch_name} to commit {last_commit.hexsha[:7]}.")
 
             print("Operating on local repository state only (no 'git pull' performed).")
 
-            last_commit = repo.head.commit
             second_to_last_commit = None
 
-            # Attempt to get the commit before the HEAD.
+            # Attempt to get the commit before the branch tip.
             # If this fails, it means there's only 0 or 1 commit in the repo.
             try:
                 second_to_last_commit = repo.commit(f"{last_commit.hexsha}~1")
-            except git.BadObject:
+            except (git.BadObject, git.BadName):
                 print(
                     "Not enough commits to generate a diff (needs at least two local commits)."
                 )
                 # For single commit repos, we can still provide codebase context
-                all_codebase_content = self._get_all_text_file_contents(repo_path)
+                all_codebase_content = self._get_all_text_file_contents(
+                    repo_path, last_commit.hexsha, context_mode=context_mode
+                )
                 return (
                     "",
                     last_commit.hexsha,
@@ -198,10 +382,17 @@ class RepoManager:
                 print(error_message)
                 return "", last_commit.hexsha, {}, error_message
 
-            diff_text = repo.git.diff(second_to_last_commit, last_commit)
+            diff_text, changed_files = render_filtered_diff(
+                repo_path,
+                second_to_last_commit.hexsha,
+                last_commit.hexsha,
+                self.diff_rules,
+            )
 
-            # Get all text files in the entire codebase
-            all_codebase_content = self._get_all_text_file_contents(repo_path)
+            # Get the text files of the codebase, most relevant to the diff first
+            all_codebase_content = self._get_all_text_file_contents(
+                repo_path, last_commit.hexsha, changed_files, context_mode
+            )
 
             return (
                 diff_text,
@@ -227,6 +418,398 @@ class RepoManager:
             print(error_message)
             return "", "", {}, error_message
 
+    def get_range_diff_and_full_codebase(
+        self,
+        repo_path: str,
+        from_ref: str,
+        to_ref: str,
+        context_mode: str = "full",
+        references: JiraReferences | None = None,
+    ) -> tuple[str, str, dict, str, str]:
+        """
+        Gets the diff and commit log for a release range (e.g. tag to tag) and
+        extracts the codebase content at the end of the range.
+        The commit log is streamed from a single `git log` process and summarized
+        with merged-branch commits grouped under their merge, so memory stays
+        bounded however many commits the range spans.
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+            from_ref (str): The exclusive start of the range (ref, tag or SHA).
+            to_ref (str): The inclusive end of the range (ref, tag or SHA).
+            context_mode (str): One of CONTEXT_MODES (default: 'full').
+            references (JiraReferences | None): Collects the range's Jira references
+                                                from the commit walk; finished as soon
+                                                as the walk is done.
+
+        Returns:
+            tuple[str, str, dict, str, str]: A tuple containing:
+                - The diff text between the two ends of the range.
+                - The SHA of the commit at the end of the range.
+                - A dictionary mapping relevant text file paths to their content.
+                - The summarized commit log of the range.
+                - An error message string (empty if no error).
+        """
+        if not os.path.isdir(os.path.join(repo_path, ".git")):
+            error_message = f"Error: '{repo_path}' is not a valid Git repository directory (missing .git folder)."
+            print(error_message)
+            return "", "", {}, "", error_message
+
+        try:
+            print(f"Opening local repository at {repo_path}...")
+            repo = git.Repo(repo_path)
+            from_commit, to_commit, error_message = self._resolve_range(repo, from_ref, to_ref)
+            if error_message:
+                return "", "", {}, "", error_message
+            print(
+                f"Collecting release range {from_ref} ({from_commit.hexsha[:7]}) .. {to_ref} ({to_commit.hexsha[:7]})..."
+            )
+
+            commits = iter_commits(repo_path, from_commit.hexsha, to_commit.hexsha)
+            if references is not None:
+                commits = references.observe(commits)
+            commit_log, commit_count = summarize_commits(commits, self.MAX_LISTED_COMMITS)
+            if references is not None:
+                references.finish()
+            print(f"Found {commit_count} commits in range.")
+            if not commit_count:
+                error_message = f"Error: No commits found in range {from_ref}..{to_ref}."
+                print(error_message)
+                return "", to_commit.hexsha, {}, "", error_message
+
+            diff_text, changed_files = render_filtered_diff(
+                repo_path, from_commit.hexsha, to_commit.hexsha, self.diff_rules
+            )
+
+            all_codebase_content = self._get_all_text_file_contents(
+                repo_path, to_commit.hexsha, changed_files, context_mode
+            )
+
+            return diff_text, to_commit.hexsha, all_codebase_content, commit_log, ""
+
+        except (git.BadName, ValueError) as e:
+            error_message = f"Error: Could not resolve release range {from_ref}..{to_ref}: {e}"
+            print(error_message)
+            return "", "", {}, "", error_message
+        except git.InvalidGitRepositoryError:
+            error_message = f"Error: '{repo_path}' is not a valid Git repository."
+            print(error_message)
+            return "", "", {}, "", error_message
+        except git.NoSuchPathError:
+            error_message = f"Error: Repository path '{repo_path}' does not exist."
+            print(error_message)
+            return "", "", {}, "", error_message
+        except (git.CommandError, subprocess.CalledProcessError) as e:
+            error_message = f"Git command error: {e}"
+            print(error_message)
+            return "", "", {}, "", error_message
+        except Exception as e:
+            error_message = f"An unexpected error occurred during Git operation: {e}"
+            print(error_message)
+            return "", "", {}, "", error_message
+
+    def get_range_commits(
+        self,
+        repo_path: str,
+        from_ref: str,
+        to_ref: str,
+        references: JiraReferences | None = None,
+    ) -> tuple[str, list, str, str]:
+        """
+        Lists the commits of a release range for per-commit note generation. Merge
+        commits are left out: the commits they bring in are listed themselves.
+        Diffs are not read here; see get_commit_diff().
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+            from_ref (str): The exclusive start of the range (ref, tag or SHA).
+            to_ref (str): The inclusive end of the range (ref, tag or SHA).
+            references (JiraReferences | None): Collects the range's Jira references
+                                                from the commit walk.
+
+        Returns:
+            tuple[str, list, str, str]: A tuple containing:
+                - The SHA of the commit at the end of the range.
+                - The non-merge CommitRecords of the range, oldest first.
+                - The summarized commit log of the range.
+                - An error message string (empty if no error).
+        """
+        if not os.path.isdir(os.path.join(repo_path, ".git")):
+            error_message = f"Error: '{repo_path}' is not a valid Git repository directory (missing .git folder)."
+            print(error_message)
+            return "", [], "", error_message
+
+        try:
+            repo = git.Repo(repo_path)
+            from_commit, to_commit, error_message = self._resolve_range(repo, from_ref, to_ref)
+            if error_message:
+                return "", [], "", error_message
+            commits = iter_commits(repo_path, from_commit.hexsha, to_commit.hexsha)
+            if references is not None:
+                commits = references.observe(commits)
+            commits = list(commits)
+            if references is not None:
+                references.finish()
+            commit_log, commit_count = summarize_commits(iter(commits), self.MAX_LISTED_COMMITS)
+            print(f"Found {commit_count} commits in range {from_ref}..{to_ref}.")
+            if not commit_count:
+                error_message = f"Error: No commits found in range {from_ref}..{to_ref}."
+                print(error_message)
+                return to_commit.hexsha, [], "", error_message
+            commits = [commit for commit in reversed(commits) if not commit.is_merge]
+            return to_commit.hexsha, commits, commit_log, ""
+        except (git.BadName, ValueError) as e:
+            error_message = f"Error: Could not resolve release range {from_ref}..{to_ref}: {e}"
+            print(error_message)
+            return "", [], "", error_message
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError) as e:
+            error_message = f"Error: Could not open repository '{repo_path}': {e}"
+            print(error_message)
+            return "", [], "", error_message
+        except (git.CommandError, subprocess.CalledProcessError) as e:
+            error_message = f"Git command error: {e}"
+            print(error_message)
+            return "", [], "", error_message
+        except Exception as e:
+            error_message = f"An unexpected error occurred during Git operation: {e}"
+            print(error_message)
+            return "", [], "", error_message
+
+    def get_jira_references(
+        self,
+        repo_path: str,
+        to_ref: str,
+        project_keys: list[str],
+        from_ref: str | None = None,
+    ) -> tuple[set[str], str, str, str]:
+        """
+        Collects the Jira issue keys a release refers to: those in the subjects and
+        bodies of the commits in `from_ref..to_ref` (merge subjects carry the names
+        of merged branches), in the ref names decorating them, and in `to_ref`
+        itself. Without `from_ref` only the last commit of `to_ref` is read.
+        Extractions that walk the range anyway collect the same references through
+        a JiraReferences instead of calling this.
+
+        Commit messages are looked up in the repository's persistent JiraKeyIndex,
+        which only scans commits it has not seen before; the range itself is
+        streamed from a `git log` over commit metadata, so neither step holds the
+        range's messages in memory.
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+            to_ref (str): The inclusive end of the range (ref, tag or SHA).
+            project_keys (list[str]): The Jira projects whose keys are recognized.
+            from_ref (str | None): The exclusive start of the range, if any.
+
+        Returns:
+            tuple[set[str], str, str, str]: A tuple containing:
+                - The referenced issue keys (uppercase).
+                - The committer date of the oldest commit (ISO 8601).
+                - The committer date of the newest commit (ISO 8601).
+                - An error message string (empty if no error).
+        """
+        try:
+            repo = git.Repo(repo_path)
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError) as e:
+            error_message = f"Error: '{repo_path}' is not a valid Git repository: {e}"
+            print(error_message)
+            return set(), "", "", error_message
+        from_commit, to_commit, error_message = self._resolve_range(repo, from_ref, to_ref)
+        if error_message:
+            return set(), "", "", error_message
+
+        key_index = JiraKeyIndex(os.path.join(self.cache_dir, "jira_keys"), repo_path, project_keys)
+        indexed = key_index.update(to_commit.hexsha)
+
+        revisions = (
+            [f"{from_commit.hexsha}..{to_commit.hexsha}"] if from_commit else ["-1", to_commit.hexsha]
+        )
+        # Decorations change as branches move, so they are matched live, not indexed.
+        keys = set(iter_jira_keys([to_ref], key_index.matcher))
+        first = last = None
+        unindexed = []
+        try:
+            proc = subprocess.Popen(
+                ["git", "-C", repo_path, "log", "--format=%H%x1f%cI%x1f%D", *revisions, "--"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+
+            def commit_shas():
+                nonlocal first, last
+                for line in proc.stdout:
+                    sha, date, decoration = line.rstrip("\n").split("\x1f")
+                    parsed = datetime.datetime.fromisoformat(date)
+                    if first is None or parsed < first[0]:
+                        first = (parsed, date)
+                    if last is None or parsed > last[0]:
+                        last = (parsed, date)
+                    keys.update(iter_jira_keys([decoration], key_index.matcher))
+                    if not indexed:
+                        unindexed.append(sha)
+                    yield sha
+
+            keys |= key_index.keys_for_commits(commit_shas())
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, "git log", stderr=stderr)
+        except (OSError, ValueError, subprocess.CalledProcessError) as e:
+            error_message = f"Error: Could not read commit messages of {revisions[-1]}: {e}"
+            print(error_message)
+            return set(), "", "", error_message
+
+        if unindexed:
+            # No usable index (e.g. an unwritable cache): read the messages directly.
+            messages = subprocess.run(
+                ["git", "-C", repo_path, "log", "--no-walk", "--stdin", "--format=%B"],
+                input="\n".join(unindexed) + "\n",
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+            if messages.returncode != 0:
+                error_message = (
+                    f"Error: Could not read commit messages of {revisions[-1]}: {messages.stderr.strip()}"
+                )
+                print(error_message)
+                return set(), "", "", error_message
+            keys.update(iter_jira_keys(messages.stdout.splitlines(), key_index.matcher))
+        print(key_index.format_stats())
+        if first is None:
+            return keys, "", "", ""
+        return keys, first[1], last[1], ""
+
+    def get_commit_diff(self, repo_path: str, commit) -> str:
+        """
+        Renders the filtered diff of a single commit against its first parent.
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+            commit (CommitRecord): The commit, as listed by get_range_commits().
+
+        Returns:
+            str: The rendered diff text.
+        """
+        parent = commit.parents[0] if commit.parents else EMPTY_TREE_SHA
+        diff_text, _ = render_filtered_diff(repo_path, parent, commit.sha, self.diff_rules)
+        return diff_text
+
+    def get_component_slices(
+        self,
+        repo_path: str,
+        components: list[Component],
+        to_ref: str = "main",
+        from_ref: str | None = None,
+        context_mode: str = "full",
+        write_commit_graph: bool = False,
+    ) -> tuple[str, list[dict], str]:
+        """
+        Splits a change into one slice per monorepo component, each with its own
+        path-scoped diff, commit log and codebase context, so that every component
+        can be summarized by a separate, smaller prompt.
+        Components without commits in the range are skipped; these checks and the
+        per-component commit logs are path-scoped `git log` calls, which use the
+        commit-graph's changed-path Bloom filters when the repository has them.
+
+        Args:
+            repo_path (str): The local file system path to the Git repository.
+            components (list[Component]): The component definitions.
+            to_ref (str): The branch, tag or commit at the end of the change (default: 'main').
+            from_ref (str | None): The exclusive start of a release range. If None,
+                                   only the last commit of `to_ref` is covered.
+            context_mode (str): One of CONTEXT_MODES (default: 'full').
+            write_commit_graph (bool): Write the commit-graph with Bloom filters if
+                                       missing. Otherwise the repository is only read.
+
+        Returns:
+            tuple[str, list[dict], str]: A tuple containing:
+                - The SHA of the commit at the end of the change.
+                - One slice per changed component, with the keys "component",
+                  "jira_component", "diff_text", "all_codebase_content" and "commit_log".
+                - An error message string (empty if no error).
+        """
+        if not os.path.isdir(os.path.join(repo_path, ".git")):
+            error_message = f"Error: '{repo_path}' is not a valid Git repository directory (missing .git folder)."
+            print(error_message)
+            return "", [], error_message
+
+        try:
+            repo = git.Repo(repo_path)
+            from_commit, to_commit, error_message = self._resolve_range(repo, from_ref, to_ref)
+            if error_message:
+                return "", [], error_message
+            if from_commit is not None:
+                from_sha = from_commit.hexsha
+            else:
+                from_sha = to_commit.parents[0].hexsha if to_commit.parents else None
+
+            check_commit_graph(repo_path, write_commit_graph)
+            changed = changed_components(repo_path, from_sha, to_commit.hexsha, components)
+            print(
+                f"{len(changed)} of {len(components)} components changed: "
+                f"{', '.join(component.name for component in changed) or 'none'}."
+            )
+            if not changed:
+                return to_commit.hexsha, [], ""
+
+            snapshot = self._list_snapshot(repo_path, to_commit.hexsha)
+            with snapshot["enumerator"]:
+                slices = []
+                for component in changed:
+                    print(f"Collecting slice for component {component.name}...")
+                    diff_text, changed_files = render_filtered_diff(
+                        repo_path,
+                        from_sha or EMPTY_TREE_SHA,
+                        to_commit.hexsha,
+                        self.diff_rules,
+                        list(component.paths),
+                    )
+                    commit_log = ""
+                    if from_ref:
+                        commit_log, _ = summarize_commits(
+                            iter_commits(
+                                repo_path, from_sha, to_commit.hexsha, list(component.paths)
+                            ),
+                            self.MAX_LISTED_COMMITS,
+                        )
+                    slices.append(
+                        {
+                            "component": component.name,
+                            "jira_component": component.jira_component,
+                            "diff_text": diff_text,
+                            "all_codebase_content": self._pack_codebase_content(
+                                snapshot,
+                                changed_files,
+                                context_mode,
+                                self.MAX_COMPONENT_CODE_CONTEXT_LENGTH,
+                                component,
+                            ),
+                            "commit_log": commit_log,
+                        }
+                    )
+            return to_commit.hexsha, slices, ""
+
+        except (git.BadName, ValueError) as e:
+            error_message = f"Error: Could not resolve {from_ref or to_ref}: {e}"
+            print(error_message)
+            return "", [], error_message
+        except git.InvalidGitRepositoryError:
+            error_message = f"Error: '{repo_path}' is not a valid Git repository."
+            print(error_message)
+            return "", [], error_message
+        except (git.CommandError, subprocess.CalledProcessError) as e:
+            error_message = f"Git command error: {e}"
+            print(error_message)
+            return "", [], error_message
+        except Exception as e:
+            error_message = f"An unexpected error occurred during Git operation: {e}"
+            print(error_message)
+            return "", [], error_message
+
 
 if __name__ == "__main__":
     # Example usage (for testing this module independently)
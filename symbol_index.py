@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+import ast
+import hashlib
+import json
+import os
+import re
+from typing import Callable
+
+from disk_cache import DiskCache
+from file_enumerator import FileEnumerator
+from git_object_reader import TreeEntry
+
+
+class SymbolIndex:
+    """
+    A persisted index of the classes, functions, signatures and docstrings in each
+    file, used to render signature-only outlines of files that are not touched by
+    the diff. Python files are parsed with `ast`; other languages fall back to
+    ctags-style regular expressions over declaration lines.
+    Symbols are cached per blob SHA, so the index updates incrementally: a new
+    commit only parses the blobs whose content changed.
+    """
+
+    # Bump when the extracted format changes so stale entries are not reused.
+    INDEX_VERSION = "1"
+    MAX_INDEX_CACHE_BYTES = 128 * 1024 * 1024  # 128 MiB
+    # First line of every rendered outline.
+    OUTLINE_HEADER = "[Outline only: signatures and docstrings, bodies omitted]"
+
+    # Declaration lines for common non-Python languages.
+    DECLARATION_RE = re.compile(
+        r"^[ \t]*(?:"
+        r"(?:export\s+)?(?:default\s+)?(?:async\s+)?function\*?\s+\w+\s*\([^)]*\)"
+        r"|(?:export\s+)?(?:public\s+|private\s+|protected\s+|internal\s+)?(?:abstract\s+|final\s+|static\s+|sealed\s+)*"
+        r"(?:class|interface|struct|enum|trait|record)\s+\w+[^{\n]*"
+        r"|func\s+(?:\([^)]*\)\s*)?\w+\s*\([^)]*\)[^{\n]*"
+        r"|(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?fn\s+\w+[^{;\n]*"
+        r"|(?:public|private|protected|internal)\s+(?:static\s+|final\s+|async\s+|override\s+|virtual\s+)*"
+        r"[\w<>\[\],.?]+\s+\w+\s*\([^)]*\)"
+        r"|def\s+[\w.?!]+[^\n]*"
+        r")",
+        re.MULTILINE,
+    )
+
+    def __init__(self, cache_dir: str):
+        """
+        Initializes the SymbolIndex.
+
+        Args:
+            cache_dir (str): Directory where per-blob symbol entries are persisted.
+        """
+        self.cache = DiskCache(cache_dir, self.MAX_INDEX_CACHE_BYTES)
+        self._symbols = {}
+
+    def _key(self, sha: str, is_python: bool) -> str:
+        return hashlib.sha256(
+            f"symbols:{self.INDEX_VERSION}:{is_python}:{sha}".encode()
+        ).hexdigest()
+
+    def update(
+        self,
+        entries: list[TreeEntry],
+        read_blobs: Callable[[list[str]], dict[str, bytes]],
+    ):
+        """
+        Makes sure every entry has symbols loaded, parsing only blobs that are not
+        already in the persisted index.
+
+        Args:
+            entries (list[TreeEntry]): Files whose outlines will be needed.
+            read_blobs (Callable): Returns blob contents for a list of SHAs.
+        """
+        to_parse = []
+        for entry in entries:
+            key = (entry.sha, self._is_python(entry.path))
+            if key in self._symbols:
+                continue
+            cached = self.cache.get(self._key(*key))
+            if cached is None:
+                to_parse.append(entry)
+            else:
+                self._symbols[key] = json.loads(cached)
+
+        if not to_parse:
+            return
+        blobs = read_blobs(list(dict.fromkeys(entry.sha for entry in to_parse)))
+        for entry in to_parse:
+            key = (entry.sha, self._is_python(entry.path))
+            if key in self._symbols or entry.sha not in blobs:
+                continue
+            if FileEnumerator.is_binary(blobs[entry.sha]):
+                symbols = None
+            else:
+                content = blobs[entry.sha].decode("utf-8", errors="ignore")
+                symbols = (
+                    self._extract_python(content)
+                    if key[1]
+                    else self._extract_declarations(content)
+                )
+            self._symbols[key] = symbols
+            self.cache.put(self._key(*key), json.dumps(symbols).encode())
+        print(f"Symbol index: parsed {len(to_parse)} files, reused {len(entries) - len(to_parse)}.")
+
+    @staticmethod
+    def _is_python(path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in (".py", ".pyi")
+
+    @staticmethod
+    def _first_line(docstring: str | None) -> str:
+        if not docstring:
+            return ""
+        return docstring.strip().splitlines()[0]
+
+    @classmethod
+    def _extract_python(cls, content: str) -> list[dict]:
+        """
+        Extracts module, class and function symbols with `ast`, falling back to the
+        regex extractor if the file does not parse.
+        """
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return cls._extract_declarations(content)
+
+        symbols = []
+        module_doc = cls._first_line(ast.get_docstring(tree))
+        if module_doc:
+            symbols.append({"depth": 0, "signature": "", "doc": module_doc})
+
+        def visit(nodes, depth):
+            for node in nodes:
+                if isinstance(node, ast.ClassDef):
+                    bases = ", ".join(ast.unparse(base) for base in node.bases)
+                    signature = f"class {node.name}({bases}):" if bases else f"class {node.name}:"
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+                    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+                    signature = f"{prefix} {node.name}({ast.unparse(node.args)}){returns}:"
+                else:
+                    continue
+                decorators = [f"@{ast.unparse(d)}" for d in node.decorator_list]
+                symbols.append(
+                    {
+                        "depth": depth,
+                        "signature": "\n".join(decorators + [signature]),
+                        "doc": cls._first_line(ast.get_docstring(node)),
+                    }
+                )
+                if isinstance(node, ast.ClassDef):
+                    visit(node.body, depth + 1)
+
+        visit(tree.body, 0)
+        return symbols
+
+    @classmethod
+    def _extract_declarations(cls, content: str) -> list[dict]:
+        """
+        Extracts declaration lines with a ctags-style regular expression.
+        Nesting depth is approximated from indentation.
+        """
+        symbols = []
+        for match in cls.DECLARATION_RE.finditer(content):
+            line = match.group(0).rstrip().expandtabs(2)
+            depth = (len(line) - len(line.lstrip())) // 2
+            symbols.append({"depth": depth, "signature": line.strip(), "doc": ""})
+        return symbols
+
+    def outline(self, entry: TreeEntry) -> str | None:
+        """
+        Renders the outline of a file whose symbols have been loaded with update().
+
+        Args:
+            entry (TreeEntry): The file to render.
+
+        Returns:
+            str | None: Signature-only outline of the file, or None for binary files.
+        """
+        symbols = self._symbols.get((entry.sha, self._is_python(entry.path)), [])
+        if symbols is None:
+            return None
+        return self._render(entry.path, symbols)
+
+    @classmethod
+    def outline_text(cls, path: str, content: str) -> str:
+        """
+        Renders the outline of a file from its text, without the persisted index.
+
+        Args:
+            path (str): Path of the file, which selects the extractor.
+            content (str): The file's text.
+
+        Returns:
+            str: Signature-only outline of the file.
+        """
+        symbols = (
+            cls._extract_python(content)
+            if cls._is_python(path)
+            else cls._extract_declarations(content)
+        )
+        return cls._render(path, symbols)
+
+    @classmethod
+    def _render(cls, path: str, symbols: list[dict]) -> str:
+        lines = [cls.OUTLINE_HEADER]
+        for symbol in symbols:
+            indent = "    " * symbol["depth"]
+            if symbol["signature"]:
+                for signature_line in symbol["signature"].splitlines():
+                    lines.append(f"{indent}{signature_line}")
+                if symbol["doc"]:
+                    lines.append(f'{indent}    """{symbol["doc"]}"""')
+                if cls._is_python(path) and "def " in symbol["signature"]:
+                    lines.append(f"{indent}    ...")
+            elif symbol["doc"]:
+                lines.append(f'"""{symbol["doc"]}"""')
+        return "\n".join(lines)
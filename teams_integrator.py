@@ -1,8 +1,6 @@
 # smit-shah-gg/release_notes_agent/release_notes_agent-0523db1cd64bf44c8e903fcc57f6d9a0a577e74e/teams_integrator.py
 #!/usr/bin/env python3
 
-import pymsteams
-
 
 class TeamsIntegrator:
     """
@@ -31,6 +29,8 @@ class TeamsIntegrator:
         Returns:
             bool: True if the message was sent successfully, False otherwise.
         """
+        import pymsteams
+
         try:
             # Create a new connector card
             teams_message = pymsteams.connectorcard(self.webhook_url)
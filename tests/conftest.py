@@ -0,0 +1,55 @@
+import os
+import subprocess
+
+import pytest
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+class GitRepo:
+    """
+    A throwaway repository for tests, driven through the git CLI.
+    """
+
+    def __init__(self, path: str, init: bool = True):
+        self.path = path
+        if init:
+            self.git("init", "-q", "-b", "main")
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", self.path, *args],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, **GIT_IDENTITY},
+        ).stdout.strip()
+
+    def write(self, files: dict[str, str | bytes]):
+        for relative_path, content in files.items():
+            full_path = os.path.join(self.path, relative_path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            mode = "wb" if isinstance(content, bytes) else "w"
+            with open(full_path, mode) as f:
+                f.write(content)
+
+    def commit(self, message: str, files: dict[str, str | bytes] | None = None) -> str:
+        """
+        Writes the given files, commits everything and returns the new commit SHA.
+        """
+        self.write(files or {})
+        self.git("add", "-A")
+        self.git("commit", "-q", "--allow-empty", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path) -> GitRepo:
+    path = tmp_path / "repo"
+    path.mkdir()
+    return GitRepo(str(path))
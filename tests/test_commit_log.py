@@ -0,0 +1,39 @@
+from commit_log import iter_commits, summarize_commits
+
+
+def test_merged_commits_are_grouped_under_their_merge(git_repo):
+    base = git_repo.commit("Base", {"a.txt": "a\n"})
+    git_repo.git("checkout", "-q", "-b", "feature")
+    side = git_repo.commit("Side work\n\nWith a body\nover two lines.", {"b.txt": "b\n"})
+    git_repo.git("checkout", "-q", "main")
+    main_work = git_repo.commit("Main work", {"c.txt": "c\n"})
+    git_repo.git("merge", "-q", "--no-ff", "-m", "Merge branch 'feature'", "feature")
+    merge = git_repo.git("rev-parse", "HEAD")
+    git_repo.git("tag", "v2")
+
+    commits = list(iter_commits(git_repo.path, base, "main"))
+    # Topological order lists the merged branch right after its merge.
+    assert [commit.sha for commit in commits] == [merge, side, main_work]
+    by_sha = {commit.sha: commit for commit in commits}
+    assert by_sha[merge].is_merge and by_sha[merge].is_mainline
+    assert by_sha[side].group == merge and not by_sha[side].is_mainline
+    assert by_sha[main_work].group == main_work
+    assert by_sha[side].body == "With a body\nover two lines."
+    assert by_sha[side].numstat == [(1, 0, "b.txt")]
+    assert "tag: v2" in by_sha[merge].refs
+    assert by_sha[merge].committed.startswith(by_sha[merge].date[:4])
+
+
+def test_path_filter_and_summary_cap(git_repo):
+    base = git_repo.commit("Base", {"a/x.txt": "1\n"})
+    for i in range(3):
+        git_repo.commit(f"Touch a {i}", {"a/x.txt": f"{i}\n"})
+    git_repo.commit("Touch b", {"b/y.txt": "y\n"})
+
+    assert [commit.subject for commit in iter_commits(git_repo.path, base, "main", ["b"])] == [
+        "Touch b"
+    ]
+    log, total = summarize_commits(iter_commits(git_repo.path, base, "main"), max_listed=2)
+    assert total == 4
+    assert log.splitlines()[0].endswith("Touch b (1 files, +1/-0, Test)")
+    assert log.splitlines()[-1] == "- ... and 2 more commits touching 2 more files"
@@ -0,0 +1,65 @@
+from commit_notes import CommitNotesCache, merge_commit_notes, parse_commit_notes, render_merged_notes
+from jira_key_index import compile_key_matcher
+
+
+def test_parse_accepts_fenced_json_and_filters_tickets():
+    notes = parse_commit_notes(
+        '```json\n{"features": [{"text": " Add export ", "tickets": ["proj-1", "UTF-8", "OPS-2"]}], '
+        '"fixes": ["Fix login", {"text": ""}]}\n```',
+        compile_key_matcher(["PROJ"]),
+    )
+    assert notes == {
+        "features": [{"text": "Add export", "tickets": ["PROJ-1"]}],
+        "fixes": [{"text": "Fix login", "tickets": []}],
+        "improvements": [],
+    }
+
+
+def test_parse_keeps_plain_text_as_improvements():
+    notes = parse_commit_notes("### Notes\n- Speed up PROJ-3 search\n* Tidy up\n")
+    assert notes["improvements"] == [
+        {"text": "Speed up PROJ-3 search", "tickets": ["PROJ-3"]},
+        {"text": "Tidy up", "tickets": []},
+    ]
+
+
+def test_merge_joins_items_by_ticket_and_text():
+    first = {
+        "features": [{"text": "Add export", "tickets": ["PROJ-1"]}],
+        "improvements": [{"text": "Update dependencies", "tickets": []}],
+    }
+    second = {
+        "fixes": [{"text": "Fix export encoding", "tickets": ["PROJ-1"]}],
+        "improvements": [{"text": "Update dependencies", "tickets": []}],
+    }
+    merged = merge_commit_notes([("a" * 40, first), ("b" * 40, second)])
+
+    assert merged["fixes"] == []
+    (feature,) = merged["features"]
+    assert feature == {
+        "text": "Add export",
+        "details": ["Fix export encoding"],
+        "tickets": ["PROJ-1"],
+        "commits": ["aaaaaaa", "bbbbbbb"],
+    }
+    assert [item["commits"] for item in merged["improvements"]] == [["aaaaaaa", "bbbbbbb"]]
+    assert render_merged_notes(merged).splitlines() == [
+        "[features]",
+        "- Add export (PROJ-1, aaaaaaa, bbbbbbb) | also: Fix export encoding",
+        "[improvements]",
+        "- Update dependencies (aaaaaaa, bbbbbbb)",
+    ]
+
+
+def test_cache_is_keyed_on_model_commit_and_context(tmp_path):
+    notes = {"features": [{"text": "Add export", "tickets": []}], "fixes": [], "improvements": []}
+    cache = CommitNotesCache(str(tmp_path))
+    cache.put("model", "a" * 40, notes, "PROJ-1 | Story")
+    assert cache.get("model", "a" * 40, "PROJ-1 | Story") == notes
+    assert cache.get("model", "a" * 40) is None
+    assert cache.get("other-model", "a" * 40, "PROJ-1 | Story") is None
+
+    assert CommitNotesCache(str(tmp_path), "refresh").get("model", "a" * 40, "PROJ-1 | Story") is None
+    bypass = CommitNotesCache(str(tmp_path / "bypass"), "bypass")
+    bypass.put("model", "b" * 40, notes)
+    assert CommitNotesCache(str(tmp_path / "bypass")).get("model", "b" * 40) is None
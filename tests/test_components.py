@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+from components import Component, changed_components, check_commit_graph, load_components
+
+
+def test_load_components(tmp_path):
+    path = tmp_path / "components.json"
+    path.write_text(
+        json.dumps(
+            {
+                "components": [
+                    {"name": "billing", "paths": ["./services/billing/"], "jira_component": "Billing"},
+                    {"name": "web", "paths": ["web"]},
+                ]
+            }
+        )
+    )
+    billing, web = load_components(str(path))
+    assert billing == Component("billing", ("services/billing/",), "Billing")
+    assert web.jira_component == "web"
+    assert billing.owns("services/billing/api.py")
+    assert not billing.owns("services/billing-legacy/api.py")
+    assert web.owns("web")
+
+    path.write_text(json.dumps([{"name": "a", "paths": ["a"]}, {"name": "a", "paths": ["b"]}]))
+    with pytest.raises(ValueError):
+        load_components(str(path))
+
+
+def test_changed_components(git_repo):
+    base = git_repo.commit("Base", {"api/a.py": "1\n", "web/b.js": "1\n"})
+    git_repo.commit("Touch api", {"api/a.py": "2\n"})
+    components = [Component("web", ("web/",), "Web"), Component("api", ("api/",), "API")]
+    assert changed_components(git_repo.path, base, "main", components) == [components[1]]
+    assert changed_components(git_repo.path, None, base, components) == components
+
+
+def test_commit_graph_is_only_written_on_request(git_repo):
+    git_repo.commit("Base", {"a.txt": "a\n"})
+    info_dir = os.path.join(git_repo.path, ".git", "objects", "info")
+    before = sorted(os.listdir(info_dir)) if os.path.isdir(info_dir) else []
+
+    assert not check_commit_graph(git_repo.path)
+    after = sorted(os.listdir(info_dir)) if os.path.isdir(info_dir) else []
+    assert after == before
+
+    assert check_commit_graph(git_repo.path, write=True)
+    assert check_commit_graph(git_repo.path)
+
+
+def test_graph_without_bloom_filters_is_not_enough(git_repo):
+    git_repo.commit("Base", {"a.txt": "a\n"})
+    git_repo.git("commit-graph", "write", "--reachable")
+    assert os.path.isfile(os.path.join(git_repo.path, ".git", "objects", "info", "commit-graph"))
+    assert not check_commit_graph(git_repo.path)
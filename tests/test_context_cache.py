@@ -0,0 +1,46 @@
+import asyncio
+import os
+
+from context_cache import ContextCache, LocalContextCacheBackend, create_context_cache_backend
+from llm_backends import FakeBackend
+from release_note_generator import ReleaseNoteGenerator
+
+PREFIX = "codebase\n" * (ContextCache.MIN_PREFIX_CHARS // 9 + 1)
+
+
+def generator_with_cache(tmp_path) -> ReleaseNoteGenerator:
+    backend = FakeBackend(latency_seconds=0, tokens_per_second=0)
+    context_cache = ContextCache(create_context_cache_backend(backend), str(tmp_path))
+    return ReleaseNoteGenerator(context_cache=context_cache, backend=backend)
+
+
+def test_any_backend_gets_a_context_cache_wrapping_it(tmp_path):
+    generator = generator_with_cache(tmp_path)
+    context_cache = generator.context_cache
+    assert isinstance(context_cache.backend, LocalContextCacheBackend)
+    assert context_cache.backend.backend is generator.backend
+
+    inline = generator.backend.generate(PREFIX + "diff")
+    # Sent inline when first seen, through a handle from then on; the model
+    # always sees the same bytes.
+    assert [generator._generate("diff", PREFIX) for _ in range(3)] == [inline] * 3
+    assert (context_cache.misses, context_cache.hits) == (1, 1)
+    assert list(context_cache.backend.contents.values()) == [PREFIX]
+
+    async def stream():
+        return "".join([text async for text in generator._stream_async("diff", PREFIX)])
+
+    assert asyncio.run(stream()) == inline
+    assert context_cache.hits == 2
+
+
+def test_in_process_handles_are_not_indexed_on_disk(tmp_path):
+    first = generator_with_cache(tmp_path)
+    for _ in range(2):
+        first._generate("diff", PREFIX)
+    assert first.context_cache.misses == 1
+    assert not os.path.exists(first.context_cache.index_path)
+
+    # A new process never finds a handle it cannot serve.
+    second = generator_with_cache(tmp_path)
+    assert second.context_cache.get_or_create(second.model_name, PREFIX) is None
@@ -0,0 +1,106 @@
+from context_packer import (
+    ContextPacker,
+    DependencyGraph,
+    PythonImportResolver,
+    RelativeImportResolver,
+)
+from git_object_reader import TreeEntry
+
+
+def make_tree(files: dict[str, str]):
+    """
+    Returns tree entries for `files` and a read_blobs callable that records the
+    SHAs it was asked for.
+    """
+    entries = [TreeEntry("100644", f"sha-{path}", path) for path in files]
+    blobs = {f"sha-{path}": content.encode() for path, content in files.items()}
+    requested = []
+
+    def read_blobs(shas):
+        requested.extend(shas)
+        return {sha: blobs[sha] for sha in shas if sha in blobs}
+
+    return entries, read_blobs, requested
+
+
+def test_python_resolver_handles_absolute_relative_and_src_layouts():
+    resolver = PythonImportResolver()
+    all_paths = {"src/app/__init__.py", "src/app/models.py", "src/app/views.py", "src/util.py"}
+    specs = resolver.extract_imports("import util\nfrom . import models\nfrom .views import *\n")
+    assert resolver.resolve("src/app/main.py", specs, all_paths) == {
+        "src/util.py",
+        "src/app/__init__.py",
+        "src/app/models.py",
+        "src/app/views.py",
+    }
+    assert resolver.extract_imports("def broken(:\n") == []
+
+
+def test_relative_resolver_ignores_packages():
+    resolver = RelativeImportResolver()
+    specs = resolver.extract_imports("import x from './lib';\nconst y = require('../util');\nimport 'react';\n")
+    assert specs == ["../util", "./lib"]
+    assert resolver.resolve("web/app.js", specs, {"web/lib/index.ts", "util.js"}) == {
+        "web/lib/index.ts",
+        "util.js",
+    }
+
+
+def test_distances_follow_imports_outward_by_level(tmp_path):
+    entries, read_blobs, _ = make_tree(
+        {
+            "a.py": "import b\n",
+            "b.py": "import c\n",
+            "c.py": "",
+            "importer.py": "import a\n",
+        }
+    )
+    graph = DependencyGraph(str(tmp_path))
+    graph.load_tree(entries, read_blobs)
+    assert graph.distances({"a.py"}) == {"a.py": 0, "b.py": 1, "c.py": 2}
+
+
+def test_exploration_stops_once_the_budget_is_filled(tmp_path):
+    files = {"a.py": "import b\n", "b.py": "import c\n", "c.py": "import d\n", "d.py": ""}
+    entries, read_blobs, requested = make_tree(files)
+    graph = DependencyGraph(str(tmp_path))
+    graph.load_tree(entries, read_blobs)
+    lengths = {path: 10 for path in files}
+    assert graph.distances({"a.py"}, lengths, budget=20) == {"a.py": 0, "b.py": 1}
+    assert requested == ["sha-a.py"]
+
+
+def test_imports_are_cached_per_blob(tmp_path):
+    entries, read_blobs, requested = make_tree({"a.py": "import b\n", "b.py": ""})
+    first = DependencyGraph(str(tmp_path))
+    first.load_tree(entries, read_blobs)
+    first.distances({"a.py"})
+    requested.clear()
+
+    second = DependencyGraph(str(tmp_path))
+    second.load_tree(entries, read_blobs)
+    assert second.distances({"a.py"}) == {"a.py": 0, "b.py": 1}
+    assert requested == []
+
+
+def test_pack_skips_the_graph_when_everything_fits(tmp_path):
+    entries, read_blobs, requested = make_tree({"a.py": "import b\n", "b.py": "", "c.py": ""})
+    graph = DependencyGraph(str(tmp_path))
+    graph.load_tree(entries, read_blobs)
+    lengths = {entry.path: 10 for entry in entries}
+    assert ContextPacker(graph).pack(entries, lengths, {"c.py"}, budget=30) == entries
+    assert requested == []
+
+
+def test_pack_prefers_neighbours_and_keeps_oversize_changed_files(tmp_path):
+    entries, read_blobs, _ = make_tree(
+        {"big.py": "import near\n", "far.py": "", "near.py": "", "small.py": ""}
+    )
+    graph = DependencyGraph(str(tmp_path))
+    graph.load_tree(entries, read_blobs)
+    lengths = {"big.py": 50, "far.py": 20, "near.py": 20, "small.py": 5}
+    selected = ContextPacker(graph).pack(entries, lengths, {"big.py"}, budget=70)
+    assert [entry.path for entry in selected] == ["big.py", "near.py"]
+
+    selected = ContextPacker(graph).pack(entries, lengths, {"big.py"}, budget=40)
+    assert [entry.path for entry in selected] == ["big.py"]
@@ -0,0 +1,77 @@
+from diff_parser import EMPTY_TREE_SHA, DiffRules, iter_file_diffs, render_filtered_diff
+
+
+def test_noise_is_summarized_with_line_counts(git_repo):
+    base = git_repo.commit("Base", {"src/app.py": "a = 1\n"})
+    git_repo.commit(
+        "Change",
+        {
+            "src/app.py": "a = 2\n",
+            "package-lock.json": "{}\n" * 3,
+            "api_pb2.py": "x = 1\n",
+            "gen/client.py": "# Code generated by protoc. DO NOT EDIT.\nx = 1\n",
+            "logo.png": b"\x89PNG\0\x01",
+        },
+    )
+    diffs = {file_diff.path: file_diff for file_diff in iter_file_diffs(git_repo.path, base, "main")}
+
+    assert not diffs["src/app.py"].summarized
+    assert (diffs["src/app.py"].added, diffs["src/app.py"].deleted) == (1, 1)
+    assert diffs["package-lock.json"].summary_reason == "excluded by rule"
+    assert diffs["package-lock.json"].added == 3
+    assert diffs["api_pb2.py"].summary_reason == "excluded by rule"
+    assert diffs["gen/client.py"].summary_reason == "generated file"
+    assert diffs["logo.png"].is_binary
+    assert diffs["package-lock.json"].render().endswith(
+        "# 3\t0\tpackage-lock.json (excluded by rule; hunks omitted)\n"
+    )
+    assert diffs["logo.png"].render().endswith("# -\t-\tlogo.png (binary file; hunks omitted)\n")
+
+
+def test_file_and_total_caps(git_repo):
+    git_repo.commit(
+        "Base",
+        {
+            "big.py": "".join(f"line {i}\n" for i in range(500)),
+            "a.py": "a = 1\n",
+            "b.py": "b = 1\n",
+        },
+    )
+    rules = DiffRules(max_file_chars=1000, max_total_chars=600)
+    text, changed = render_filtered_diff(git_repo.path, EMPTY_TREE_SHA, "main", rules)
+
+    assert changed == ["a.py", "b.py", "big.py"]
+    diffs = {
+        file_diff.path: file_diff
+        for file_diff in iter_file_diffs(git_repo.path, EMPTY_TREE_SHA, "main", rules)
+    }
+    assert diffs["big.py"].summary_reason == "diff larger than 1000 characters"
+    assert diffs["big.py"].added == 500
+    assert not diffs["a.py"].summarized
+    assert "+a = 1" in text
+
+
+def test_total_budget_summarizes_the_remaining_files(git_repo):
+    git_repo.commit("Base", {f"{name}.py": f"{name} = 1\n" * 20 for name in "abc"})
+    rules = DiffRules(max_total_chars=300)
+    diffs = list(iter_file_diffs(git_repo.path, EMPTY_TREE_SHA, "main", rules))
+    assert [file_diff.summary_reason for file_diff in diffs] == [
+        "",
+        "total diff budget reached",
+        "total diff budget reached",
+    ]
+
+
+def test_renames_paths_and_custom_rules(git_repo):
+    base = git_repo.commit("Base", {"old name.py": "x = 1\n" * 10, "docs/readme.md": "hi\n"})
+    git_repo.git("mv", "old name.py", "new name.py")
+    git_repo.commit("Rename", {"docs/readme.md": "hello\n"})
+
+    rules = DiffRules(exclude_patterns=["docs/"])
+    diffs = {file_diff.path: file_diff for file_diff in iter_file_diffs(git_repo.path, base, "main", rules)}
+    assert set(diffs) == {"new name.py", "docs/readme.md"}
+    assert diffs["docs/readme.md"].summarized
+    assert not diffs["new name.py"].summarized
+
+    only_docs = [file_diff.path for file_diff in iter_file_diffs(git_repo.path, base, "main", paths=["docs"])]
+    assert only_docs == ["docs/readme.md"]
@@ -0,0 +1,103 @@
+import os
+import threading
+
+from disk_cache import DiskCache
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    assert cache.get("a") is None
+    cache.put("a", b"alpha")
+    assert cache.get("a") == b"alpha"
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "entries": 1,
+        "total_bytes": 5,
+        "max_bytes": 1024,
+    }
+
+
+def test_get_many_and_put_many(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    cache.put_many([("a", b"1"), ("b", b"22")])
+    assert cache.get_many(["a", "b", "c", "a"]) == {"a": b"1", "b": b"22"}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    cache.TOUCH_RESOLUTION_SECONDS = 0
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")  # "b" is now the least recently used entry.
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.stats()["total_bytes"] == 8
+
+
+def test_recent_reads_are_not_rewritten(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")  # Read within TOUCH_RESOLUTION_SECONDS of being stored.
+    assert cache._touched == {}
+    cache.put("c", b"cccc")
+    assert cache.get("a") is None
+
+
+def test_skips_entries_larger_than_the_cap(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=4)
+    cache.put("big", b"12345")
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_persists_across_instances(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    cache.put("a", b"alpha")
+    reopened = DiskCache(str(tmp_path), max_bytes=1024)
+    assert reopened.get("a") == b"alpha"
+    assert reopened.stats()["total_bytes"] == 5
+
+
+def test_access_order_survives_reopening(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    cache.TOUCH_RESOLUTION_SECONDS = 0
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.stats()  # Writes the buffered access back.
+    reopened = DiskCache(str(tmp_path), max_bytes=10)
+    reopened.put("c", b"cccc")
+    assert reopened.get("b") is None
+    assert reopened.get("a") == b"aaaa"
+
+
+def test_removes_legacy_shard_directories(tmp_path):
+    legacy = tmp_path / "ab"
+    legacy.mkdir()
+    (legacy / "abcdef").write_bytes(b"old")
+    DiskCache(str(tmp_path), max_bytes=1024)
+    assert not legacy.exists()
+    assert os.path.exists(tmp_path / DiskCache.FILE_NAME)
+
+
+def test_concurrent_access(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=64 * 1024)
+
+    def worker(n):
+        for i in range(200):
+            key = f"{n}-{i}"
+            cache.put(key, key.encode())
+            assert cache.get(key) == key.encode()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()["entries"] == 1600
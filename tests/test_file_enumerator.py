@@ -0,0 +1,84 @@
+from file_enumerator import FileEnumerator
+from git_object_reader import GitObjectReader
+
+
+def test_lists_tracked_files_in_path_order_minus_ignored(git_repo):
+    sha = git_repo.commit(
+        "init",
+        {
+            ".gitignore": "build/\n",
+            "b.py": "b = 1\n",
+            "a/z.py": "z = 1\n",
+            "a/logo.PNG": b"\x89PNG",
+            "a/__pycache__/z.pyc": b"\0",
+            "vendor/venv/lib.py": "x = 1\n",
+        },
+    )
+    git_repo.write({"build/out.py": "generated\n", "untracked.py": "u\n"})
+
+    with FileEnumerator(git_repo.path) as enumerator, enumerator.borrow_reader() as reader:
+        paths = [entry.path for entry in enumerator.list_files(reader, sha)]
+    assert paths == [".gitignore", "a/z.py", "b.py"]
+
+
+def test_custom_patterns_replace_the_defaults():
+    enumerator = FileEnumerator(".", ignore_patterns=["docs/", "*.md"])
+    assert enumerator.is_ignored("docs/index.py")
+    assert enumerator.is_ignored("README.MD")
+    assert not enumerator.is_ignored("logo.png")
+    assert not FileEnumerator(".", ignore_patterns=[]).is_ignored("logo.png")
+
+
+def test_patterns_match_at_any_depth():
+    enumerator = FileEnumerator(".")
+    assert enumerator.is_ignored("web/node_modules/dep/index.js")
+    assert enumerator.is_ignored("node_modules/dep/index.js")
+    assert enumerator.is_ignored("dist/app.exe")
+    assert not enumerator.is_ignored("web/node_modules_docs/index.js")
+    assert not enumerator.is_ignored("src/exe/main.py")
+    nested = FileEnumerator(".", ignore_patterns=["docs/*.md", "build/out/", "test_*.py", "tmp*/"])
+    assert nested.is_ignored("pkg/test_app.py")
+    assert nested.is_ignored("tmp1/a.py")
+    assert not nested.is_ignored("pkg/app_test.py")
+    assert nested.is_ignored("pkg/docs/index.md")
+    assert nested.is_ignored("build/out/a.py")
+    assert not nested.is_ignored("pkg/docs/sub/index.md")
+    assert not nested.is_ignored("build/a.py")
+
+
+def test_is_binary_sniffs_for_nul_bytes():
+    assert FileEnumerator.is_binary(b"abc\0def")
+    assert not FileEnumerator.is_binary(b"plain text")
+    assert not FileEnumerator.is_binary(b"x" * FileEnumerator.BINARY_SNIFF_BYTES + b"\0")
+
+
+def test_read_blobs_keeps_request_order_and_reuses_readers(git_repo):
+    files = {f"f{i:04}.txt": f"content {i}\n" for i in range(600)}
+    sha = git_repo.commit("init", files)
+    with GitObjectReader(git_repo.path) as reader:
+        shas = [entry.sha for entry in reader.list_tree(sha)]
+
+    with FileEnumerator(git_repo.path, max_workers=2) as enumerator:
+        first = enumerator.read_blobs(shas)
+        readers = list(enumerator._readers)
+        second = enumerator.read_blobs(shas[::-1])
+        assert enumerator._readers == readers
+    assert list(first) == shas
+    assert list(second) == shas[::-1]
+    assert first[shas[0]] == b"content 0\n"
+    assert len(readers) == 2
+    assert enumerator._readers == []
+
+
+def test_failed_reader_is_not_returned_to_the_pool(git_repo):
+    git_repo.commit("init", {"a.txt": "a\n"})
+    enumerator = FileEnumerator(git_repo.path)
+    try:
+        with enumerator.borrow_reader():
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert enumerator._readers == []
+    with enumerator.borrow_reader() as reader:
+        assert reader in enumerator._readers
+    enumerator.close()
@@ -0,0 +1,47 @@
+import os
+
+from git_object_reader import GitObjectReader
+
+
+def test_list_tree_skips_symlinks_and_reports_blobs(git_repo):
+    git_repo.write({"dir/a.txt": "a\n"})
+    os.symlink("dir/a.txt", os.path.join(git_repo.path, "link"))
+    sha = git_repo.commit("init")
+    with GitObjectReader(git_repo.path) as reader:
+        entries = reader.list_tree(sha)
+    assert [entry.path for entry in entries] == ["dir/a.txt"]
+    assert entries[0].mode == "100644"
+    assert entries[0].size == 2
+
+
+def test_reads_large_and_binary_blobs_intact(git_repo):
+    large = os.urandom(3 * 1024 * 1024)
+    binary = b"\0\x01\x02\n\n\xff" * 10
+    sha = git_repo.commit("init", {"large.bin": large, "binary.dat": binary, "text.txt": "hi\n"})
+    with GitObjectReader(git_repo.path) as reader:
+        shas = {entry.path: entry.sha for entry in reader.list_tree(sha)}
+        sizes = reader.get_sizes(list(shas.values()))
+        blobs = dict(reader.iter_blobs(list(shas.values())))
+    assert sizes[shas["large.bin"]] == len(large)
+    assert blobs[shas["large.bin"]] == large
+    assert blobs[shas["binary.dat"]] == binary
+    assert blobs[shas["text.txt"]] == b"hi\n"
+
+
+def test_missing_objects_are_omitted(git_repo):
+    sha = git_repo.commit("init", {"a.txt": "a\n"})
+    missing = "0" * 40
+    with GitObjectReader(git_repo.path) as reader:
+        (entry,) = reader.list_tree(sha)
+        assert reader.get_sizes([missing, entry.sha]) == {entry.sha: 2}
+        assert dict(reader.iter_blobs([missing, entry.sha])) == {entry.sha: b"a\n"}
+        assert reader.read_blob(missing) is None
+
+
+def test_stopping_early_leaves_the_stream_usable(git_repo):
+    sha = git_repo.commit("init", {f"{i}.txt": f"{i}\n" for i in range(5)})
+    with GitObjectReader(git_repo.path) as reader:
+        shas = [entry.sha for entry in reader.list_tree(sha)]
+        for _ in reader.iter_blobs(shas):
+            break
+        assert reader.read_blob(shas[-1]) == b"4\n"
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from jira_cache import JiraIssueCache
+
+
+def issue(number: int, **fields) -> dict:
+    return {
+        "key": f"PROJ-{number}",
+        "summary": f"Issue {number}",
+        "status": "Done",
+        "created": "2024-04-01T10:00:00.000+0000",
+        "updated": "2024-05-01T10:00:00.000+0000",
+        **fields,
+    }
+
+
+class Search:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def __call__(self, jql: str) -> list[dict]:
+        self.queries.append(jql)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_incremental_sync_overlaps_the_last_one(tmp_path):
+    cache = JiraIssueCache(str(tmp_path), max_age_seconds=0)
+    search = Search([issue(1), issue(2)], [issue(2, status="Reopened")])
+
+    assert cache.sync("PROJ", search)
+    assert search.queries[0] == 'project = "PROJ" AND updated >= "-365d" ORDER BY updated ASC'
+
+    # Pretend the first sync ran nine and a half minutes ago.
+    with cache._db:
+        cache._db.execute("UPDATE sync_state SET synced_at = ?", (time.time() - 570,))
+    reopened = JiraIssueCache(str(tmp_path), max_age_seconds=0)
+    assert reopened.sync("PROJ", search)
+    minutes = 10 + JiraIssueCache.SYNC_OVERLAP_MINUTES
+    assert search.queries[1] == f'project = "PROJ" AND updated >= "-{minutes}m" ORDER BY updated ASC'
+    assert reopened.get({"PROJ-1", "PROJ-2", "PROJ-3"}) == {
+        "PROJ-1": issue(1),
+        "PROJ-2": issue(2, status="Reopened"),
+    }
+
+
+def test_fresh_copies_are_served_without_a_query(tmp_path):
+    search = Search([issue(1)], [issue(1)])
+    cache = JiraIssueCache(str(tmp_path))
+    assert cache.sync("PROJ", search)
+    assert JiraIssueCache(str(tmp_path)).sync("PROJ", search)
+    assert len(search.queries) == 1
+
+    refreshing = JiraIssueCache(str(tmp_path), mode="refresh")
+    assert refreshing.sync("PROJ", search)
+    assert refreshing.sync("PROJ", search)  # Once per run.
+    assert len(search.queries) == 2
+
+
+def test_failed_sync_serves_the_stale_copy(tmp_path):
+    search = Search(ConnectionError("down"), [issue(1)], ConnectionError("down"))
+    cache = JiraIssueCache(str(tmp_path), max_age_seconds=0)
+    assert not cache.sync("PROJ", search)  # Never synced: nothing to serve.
+    assert cache.sync("PROJ", search)
+
+    next_run = JiraIssueCache(str(tmp_path), max_age_seconds=0)
+    assert next_run.sync("PROJ", search)
+    assert next_run.stats["sync_failures"] == 1
+    assert set(next_run.get({"PROJ-1"})) == {"PROJ-1"}
+
+
+def test_find_compares_resolution_dates_in_utc(tmp_path):
+    cache = JiraIssueCache(str(tmp_path))
+    cache.put(
+        [
+            # 01:00 at +02:00 is still the previous day in UTC.
+            issue(1, resolved="2024-05-02T01:00:00.000+0200"),
+            issue(2, resolved="2024-05-03T12:00:00.000+0000"),
+            issue(3, status="In Progress"),
+        ]
+    )
+    assert [found["key"] for found in cache.find("PROJ", resolved_from="2024-05-02")] == ["PROJ-2"]
+    assert [found["key"] for found in cache.find("PROJ", resolved_before="2024-05-02")] == ["PROJ-1"]
+    assert [found["key"] for found in cache.find("PROJ", status="In Progress")] == ["PROJ-3"]
+
+
+def test_bypass_never_touches_disk(tmp_path):
+    cache = JiraIssueCache(str(tmp_path / "jira"), mode="bypass")
+    assert not cache.sync("PROJ", Search())
+    assert not (tmp_path / "jira").exists()
+    with pytest.raises(ValueError):
+        JiraIssueCache(str(tmp_path), mode="sometimes")
@@ -0,0 +1,62 @@
+import pytest
+
+from commit_log import iter_commits
+from jira_key_index import JiraKeyIndex, JiraReferences, compile_key_matcher, iter_jira_keys
+
+
+def test_matcher_only_accepts_listed_projects():
+    matcher = compile_key_matcher(["proj", "OPS", "PROJX"])
+    lines = ["Fix PROJ-1 and ops-22 (UTF-8, SHA-256)", "Merge feature/projx-3-export, XPROJ-4"]
+    assert list(iter_jira_keys(lines, matcher)) == ["PROJ-1", "OPS-22", "PROJX-3"]
+    with pytest.raises(ValueError):
+        compile_key_matcher([" "])
+
+
+def test_index_only_scans_new_commits_across_tips(git_repo, tmp_path):
+    first = git_repo.commit("PROJ-1 First")
+    index = JiraKeyIndex(str(tmp_path), git_repo.path, ["PROJ"])
+    assert index.update("main")
+    assert index.stats["commits_scanned"] == 1
+
+    git_repo.git("checkout", "-q", "-b", "feature")
+    feature = git_repo.commit("PROJ-2 Feature work")
+    git_repo.git("checkout", "-q", "main")
+    main = git_repo.commit("PROJ-3 Main work\n\nAlso touches PROJ-1.")
+
+    assert index.update("feature")
+    assert index.update("main")
+    assert index.update("main")  # Already covered: nothing to scan.
+    assert index.stats["commits_scanned"] == 3
+    assert index.keys_for_commits([first, feature, main]) == {"PROJ-1", "PROJ-2", "PROJ-3"}
+    assert sorted(index.commits_for("proj-1")) == sorted([first, main])
+
+    reopened = JiraKeyIndex(str(tmp_path), git_repo.path, ["PROJ"])
+    assert reopened.update("main")
+    assert reopened.stats["commits_scanned"] == 0
+
+
+def test_references_collect_keys_and_dates_from_the_walk(git_repo):
+    base = git_repo.commit("Base PROJ-9")
+    git_repo.commit("PROJ-1 Add thing")
+    git_repo.commit("Tidy up\n\nFollow-up for proj-2.")
+    git_repo.git("tag", "PROJ-3-hotfix")
+
+    references = JiraReferences(["PROJ"], "release/proj-4")
+    commits = list(references.observe(iter_commits(git_repo.path, base, "main")))
+    references.finish()
+    keys, first_date, last_date, error = references.wait()
+
+    assert len(commits) == 2
+    assert keys == {"PROJ-1", "PROJ-2", "PROJ-3", "PROJ-4"}
+    assert (first_date, last_date) == (
+        min(commit.committed for commit in commits),
+        max(commit.committed for commit in commits),
+    )
+    assert error == ""
+
+
+def test_references_report_the_first_error_only():
+    references = JiraReferences(["PROJ"], "main")
+    references.finish("boom")
+    references.finish()
+    assert references.wait() == (set(), "", "", "boom")
@@ -0,0 +1,43 @@
+import pytest
+
+from llm_backends import FakeBackend
+from llm_response_cache import ResponseCache
+from release_note_generator import ReleaseNoteGenerator
+
+
+def test_key_covers_model_prompt_and_params():
+    key = ResponseCache.key("model", "prompt", {"temperature": 0.2, "top_p": 1})
+    assert key == ResponseCache.key("model", "prompt", {"top_p": 1, "temperature": 0.2})
+    assert key != ResponseCache.key("other-model", "prompt", {"temperature": 0.2, "top_p": 1})
+    assert key != ResponseCache.key("model", "prompt", {"temperature": 0.3, "top_p": 1})
+    assert key != ResponseCache.key("model", "prompt!", {"temperature": 0.2, "top_p": 1})
+
+
+def test_modes(tmp_path):
+    ResponseCache(str(tmp_path)).put("k", "stored")
+    assert ResponseCache(str(tmp_path)).get("k") == "stored"
+
+    refresh = ResponseCache(str(tmp_path), "refresh")
+    assert refresh.get("k") is None
+    refresh.put("k", "replaced")
+    assert ResponseCache(str(tmp_path)).get("k") == "replaced"
+
+    bypass = ResponseCache(str(tmp_path), "bypass")
+    bypass.put("k", "ignored")
+    assert bypass.get("k") is None
+    assert ResponseCache(str(tmp_path)).get("k") == "replaced"
+
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), "sometimes")
+
+
+def test_generator_reuses_responses_until_the_config_changes(tmp_path):
+    backend = FakeBackend(latency_seconds=0, tokens_per_second=0)
+    generator = ReleaseNoteGenerator(ResponseCache(str(tmp_path)), backend=backend)
+    first = generator._generate("prompt")
+    assert generator._generate("prompt") == first
+    assert backend.calls == 1
+
+    generator.generation_config = {"temperature": 0.1}
+    generator._generate("prompt")
+    assert backend.calls == 2
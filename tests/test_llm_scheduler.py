@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from llm_scheduler import AdaptiveConcurrency, LlmScheduler, TokenBucket
+
+
+class ApiError(Exception):
+    def __init__(self, code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.headers = headers
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def test_token_bucket_goes_into_debt():
+    bucket = TokenBucket(60)  # One per second, a minute's worth up front.
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(1) == pytest.approx(1, abs=0.05)
+    # A request larger than the bucket is charged at most one bucket.
+    assert bucket.reserve(600) == pytest.approx(61, abs=0.05)
+
+
+def test_concurrency_limit_is_aimd():
+    concurrency = AdaptiveConcurrency(8)
+    for _ in range(8):
+        assert concurrency.try_acquire()
+    assert not concurrency.try_acquire()
+
+    concurrency.release("throttled")
+    assert concurrency.limit == 4
+    for _ in range(7):
+        concurrency.release("throttled")
+    assert concurrency.limit == 1
+    assert concurrency.try_acquire()
+    assert not concurrency.try_acquire()
+
+    concurrency.release("success")
+    assert concurrency.try_acquire()
+    concurrency.release(None)  # Non-retryable failures leave the limit alone.
+    assert concurrency.limit == 2
+    while concurrency.limit < 8:
+        concurrency.in_flight = 1
+        concurrency.release("success")
+    assert concurrency.limit == 8
+
+
+def test_errors_are_classified_by_status_and_name():
+    assert LlmScheduler.classify(ApiError(429)) == "throttled"
+    assert LlmScheduler.classify(RateLimitError()) == "throttled"
+    assert LlmScheduler.classify(ApiError(503)) == "transient"
+    assert LlmScheduler.classify(ConnectionResetError()) == "transient"
+    assert LlmScheduler.classify(ApiError(400)) is None
+    assert LlmScheduler.classify(ValueError()) is None
+
+
+@pytest.fixture
+def scheduler() -> LlmScheduler:
+    scheduler = LlmScheduler(max_concurrency=4, max_retries=2)
+    scheduler.BASE_RETRY_DELAY_SECONDS = 0
+    return scheduler
+
+
+def test_throttled_calls_are_retried(scheduler):
+    errors = [ApiError(429), ApiError(503)]
+
+    def flaky():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert scheduler.call(flaky, tokens=10) == "ok"
+    assert scheduler.stats == {"calls": 1, "retries": 2, "throttled": 1, "failed": 0}
+    assert scheduler.concurrency.limit < 4
+    assert scheduler.concurrency.in_flight == 0
+
+
+def test_retries_are_bounded_and_only_for_retryable_errors(scheduler):
+    def bad_request():
+        raise ApiError(400)
+
+    with pytest.raises(ApiError):
+        scheduler.call(bad_request)
+    assert scheduler.stats["retries"] == 0
+
+    def throttled():
+        raise ApiError(429)
+
+    with pytest.raises(ApiError):
+        scheduler.call(throttled)
+    assert scheduler.stats["retries"] == 2
+    assert scheduler.stats["failed"] == 2
+    assert scheduler.concurrency.in_flight == 0
+
+
+def test_streams_are_only_retried_before_the_first_item(scheduler):
+    attempts = []
+
+    async def chunks(fail_after: int | None):
+        attempts.append(fail_after)
+        for index in range(3):
+            if index == fail_after:
+                raise ApiError(503)
+            yield str(index)
+
+    async def consume(fail_after_per_attempt: list):
+        return [
+            item
+            async for item in scheduler.stream(lambda: chunks(fail_after_per_attempt.pop(0)))
+        ]
+
+    assert asyncio.run(consume([0, None])) == ["0", "1", "2"]
+    assert attempts == [0, None]
+    with pytest.raises(ApiError):
+        asyncio.run(consume([1]))
+    assert scheduler.stats["failed"] == 1
+    assert scheduler.concurrency.in_flight == 0
@@ -0,0 +1,74 @@
+from context_packer import PackedContext
+from prompt_builder import PromptBuilder
+
+
+def file_diff(path: str, lines: int = 10) -> str:
+    return f"diff --git a/{path} b/{path}\n" + "".join(f"+line {i}\n" for i in range(lines))
+
+
+def module(name: str) -> str:
+    return f'"""Module {name}."""\n\n\ndef {name}():\n' + "    x = 1\n" * 50 + "    return x\n"
+
+
+def test_diff_keeps_whole_files_within_budget():
+    builder = PromptBuilder({"diff": 60})
+    diff_text = "".join(file_diff(f"f{i}.py") for i in range(5))
+    text, report = builder.fit_diff(diff_text)
+
+    assert text.startswith(file_diff("f0.py"))
+    assert "diff --git a/f1.py" not in text
+    assert text.endswith("(diff truncated to fit the prompt: 4 of 5 files omitted)\n")
+    assert report["detail"] == "truncated, 1 of 5 files"
+    assert builder.fit_diff(file_diff("a.py"))[0] == file_diff("a.py")
+
+
+def test_tickets_drop_descriptions_then_rows():
+    tickets = [
+        {"key": f"PROJ-{i}", "summary": f"Fix | thing {i}", "components": ["api", "web"], "description": "d" * 500}
+        for i in range(10)
+    ]
+    table = PromptBuilder.format_tickets(tickets)
+    assert table.splitlines()[0] == "Key | Type | Status | Priority | Components | Summary | Description"
+    assert table.splitlines()[1].startswith("PROJ-0 |  |  |  | api, web | Fix / thing 0 | ddd")
+    assert PromptBuilder.format_tickets([]) == "(none)"
+
+    text, report = PromptBuilder({"jira": 60}).fit_tickets(tickets)
+    assert "Description" not in text
+    assert text.endswith("more tickets omitted to fit the prompt)")
+    assert "descriptions dropped" in report["detail"]
+
+
+def test_codebase_degrades_level_by_level():
+    codebase = {f"m{i}.py": module(f"m{i}") for i in range(6)}
+    diff_text = file_diff("m3.py")
+
+    full = PromptBuilder().build(diff_text, [], codebase)
+    assert (full.level, full.stable) == ("full", True)
+    assert full.codebase.index("### File: m0.py") < full.codebase.index("### File: m5.py")
+
+    relevant = PromptBuilder({"codebase": 300}).build(diff_text, [], codebase)
+    assert (relevant.level, relevant.stable) == ("relevant", False)
+    assert "### File: m3.py" in relevant.codebase
+
+    outline = PromptBuilder({"codebase": 150}).build(diff_text, [], codebase)
+    assert outline.level == "outline"
+    assert "def m0():" in outline.codebase and "x = 1" not in outline.codebase.split("m3.py")[0]
+
+    assert PromptBuilder({"codebase": 5}).build(diff_text, [], codebase).level == "diff-only"
+
+
+def test_ranked_context_is_never_stable():
+    codebase = PackedContext({"a.py": module("a")}, ranked=True)
+    sections = PromptBuilder().build(file_diff("a.py"), [], codebase)
+    assert sections.level == "full"
+    assert not sections.stable
+    assert PromptBuilder().build(file_diff("a.py"), [], dict(codebase)).stable
+
+
+def test_report_lists_every_section():
+    builder = PromptBuilder(count_tokens=lambda text: len(text) // 2)
+    sections = builder.build(file_diff("a.py"), [{"key": "PROJ-1"}], {"a.py": "x = 1\n"})
+    lines = builder.format_report(sections, "p" * 400).splitlines()
+    assert lines[0] == "Prompt size by section:"
+    assert [line.split()[0] for line in lines[1:]] == ["diff", "jira", "codebase", "total"]
+    assert lines[-1].split()[1] == "100"
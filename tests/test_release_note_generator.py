@@ -0,0 +1,48 @@
+import pytest
+
+from llm_backends import FakeBackend
+from release_note_generator import ReleaseNoteGenerator
+from repo_manager import RepoManager
+
+
+@pytest.fixture
+def tree(git_repo):
+    """
+    A repository whose tip is reached from two bases with different diffs: `one`
+    touches a.py only, `two` touches j.py only.
+    """
+    modules = {f"{name}.py": f"# {name}\n" + "x = 1\n" * 150 for name in "abcdefghij"}
+    git_repo.commit("Base", modules)
+    git_repo.git("tag", "one")
+    git_repo.commit("Change j", {"j.py": modules["j.py"] + "y = 2\n"})
+    git_repo.git("tag", "two")
+    git_repo.commit("Change a", {"a.py": modules["a.py"] + "y = 2\n"})
+    return git_repo
+
+
+def prefixes(repo_path, cache_dir, budget):
+    repo_manager = RepoManager(cache_dir=cache_dir)
+    repo_manager.MAX_TOTAL_CODE_CONTEXT_LENGTH = budget
+    generator = ReleaseNoteGenerator(backend=FakeBackend(latency_seconds=0, tokens_per_second=0))
+    result = []
+    for base in ("one", "two"):
+        diff_text, sha, codebase, commit_log, error = repo_manager.get_range_diff_and_full_codebase(
+            repo_path, base, "main"
+        )
+        assert error == ""
+        prefix, suffix = generator._build_prompt(diff_text, [], sha, codebase, commit_log)
+        assert "CODE_DIFF" in suffix
+        result.append(prefix)
+    return result
+
+
+def test_oversized_tree_is_never_cached_as_a_prefix(tree, tmp_path):
+    # RepoManager ranks a different subset for each diff; neither may be cached.
+    first, second = prefixes(tree.path, str(tmp_path / "cache"), 3000)
+    assert first == second == ""
+
+
+def test_whole_tree_gives_the_same_prefix_for_every_diff(tree, tmp_path):
+    first, second = prefixes(tree.path, str(tmp_path / "cache"), 1000000)
+    assert first == second
+    assert "### File: a.py" in first and "### File: j.py" in first
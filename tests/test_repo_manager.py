@@ -0,0 +1,59 @@
+import subprocess
+
+import pytest
+
+from conftest import GitRepo
+from jira_key_index import JiraReferences
+from repo_manager import RepoManager
+
+
+@pytest.fixture
+def clone(git_repo, tmp_path) -> GitRepo:
+    """
+    A clone of a repository whose `feat` branch only exists as origin/feat.
+    """
+    git_repo.commit("Initial commit", {"app.py": "print('v1')\n"})
+    git_repo.git("tag", "v1")
+    git_repo.git("checkout", "-q", "-b", "feat")
+    git_repo.commit("PROJ-7 Add greeting", {"app.py": "print('v2')\n", "greet.py": "x = 1\n"})
+    git_repo.git("checkout", "-q", "main")
+    path = tmp_path / "clone"
+    subprocess.run(["git", "clone", "-q", git_repo.path, str(path)], check=True)
+    return GitRepo(str(path), init=False)
+
+
+def test_range_entry_points_fall_back_to_origin(clone, tmp_path):
+    repo_manager = RepoManager(cache_dir=str(tmp_path / "cache"))
+
+    to_sha, commits, _, error = repo_manager.get_range_commits(clone.path, "v1", "feat")
+    assert error == ""
+    assert to_sha == clone.git("rev-parse", "origin/feat")
+    assert [commit.subject for commit in commits] == ["PROJ-7 Add greeting"]
+
+    diff_text, to_sha, codebase, _, error = repo_manager.get_range_diff_and_full_codebase(
+        clone.path, "v1", "feat"
+    )
+    assert error == ""
+    assert "greet.py" in diff_text
+    assert set(codebase) == {"app.py", "greet.py"}
+
+
+def test_unknown_refs_are_reported(clone, tmp_path):
+    repo_manager = RepoManager(cache_dir=str(tmp_path / "cache"))
+    _, commits, _, error = repo_manager.get_range_commits(clone.path, "v1", "nope")
+    assert commits == []
+    assert "Could not resolve 'nope'" in error
+    *_, error = repo_manager.get_range_diff_and_full_codebase(clone.path, "nope", "feat")
+    assert "Could not resolve 'nope'" in error
+
+
+def test_range_walk_collects_the_same_references_as_the_lookup(clone, tmp_path):
+    repo_manager = RepoManager(cache_dir=str(tmp_path / "cache"))
+    references = JiraReferences(["PROJ"], "feat")
+    *_, error = repo_manager.get_range_diff_and_full_codebase(
+        clone.path, "v1", "feat", references=references
+    )
+    assert error == ""
+    walked = references.wait()
+    assert walked[0] == {"PROJ-7"}
+    assert walked == repo_manager.get_jira_references(clone.path, "feat", ["PROJ"], "v1")